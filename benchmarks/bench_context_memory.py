@@ -0,0 +1,95 @@
+# benchmarks/bench_context_memory.py
+# ContextMemory per-message cost: rewrite-the-file + list.count summaries vs tiered memory
+#
+# Usage:
+#   python benchmarks/bench_context_memory.py
+#   python benchmarks/bench_context_memory.py --messages 5000 --users 20
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from mindfulai_backend.core.serialization import read_json, write_json
+
+THEMES = ('work', 'family', 'relationship', 'health', 'school', 'sleep', 'general')
+INTENTS = ('vent', 'advice', 'conversation', 'reassurance')
+EMOTIONS = ('sad', 'anxious', 'stressed', 'neutral', 'happy')
+
+
+def legacy_store(memory_dir: Path, user_id, theme, intent, keywords, emotion):
+    """What store_context did before: load, append, slice to 100, rewrite the whole file"""
+    memory_file = memory_dir / f"{user_id}_context.json"
+    entry = {"timestamp": datetime.now().isoformat(), "theme": theme, "intent": intent,
+             "keywords": keywords, "emotion": emotion}
+    if memory_file.exists():
+        data = read_json(memory_file)
+    else:
+        data = {"user_id": user_id, "created_at": datetime.now().isoformat(), "contexts": [],
+                "theme_history": defaultdict(int), "intent_history": defaultdict(int)}
+    data['contexts'].append(entry)
+    data['contexts'] = data['contexts'][-100:]
+    data['theme_history'][theme] = data['theme_history'].get(theme, 0) + 1
+    data['intent_history'][intent] = data['intent_history'].get(intent, 0) + 1
+    write_json(memory_file, data)
+
+
+def legacy_summary(memory_dir: Path, user_id):
+    """What get_conversation_summary did before: reload the file, recount with list.count"""
+    context = read_json(memory_dir / f"{user_id}_context.json")
+    recent = context['contexts'][-10:]
+    emotions = [c['emotion'] for c in recent]
+    themes = [c['theme'] for c in recent]
+    intents = [c['intent'] for c in recent]
+    return {"total_interactions": len(context['contexts']),
+            "primary_theme": max(set(themes), key=themes.count),
+            "primary_intent": max(set(intents), key=intents.count),
+            "emotion_distribution": {e: emotions.count(e) for e in set(emotions)}}
+
+
+def run(store, summary, users, messages):
+    started = time.perf_counter()
+    for i in range(messages):
+        user = f'user{i % users}'
+        store(user, THEMES[i % 7], INTENTS[i % 4], ['job', 'sleep', 'tired'], EMOTIONS[i % 5])
+        summary(user)
+    return (time.perf_counter() - started) / messages * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--messages', type=int, default=3000)
+    parser.add_argument('--users', type=int, default=10)
+    args = parser.parse_args()
+
+    legacy_dir = Path(tempfile.mkdtemp())
+    legacy_us = run(lambda *a: legacy_store(legacy_dir, *a), lambda u: legacy_summary(legacy_dir, u),
+                    args.users, args.messages)
+
+    # ContextMemory uses relative data/ paths; run it inside a scratch directory
+    os.chdir(tempfile.mkdtemp())
+    Path('data').mkdir()
+    from mindfulai_backend.analytics.context_memory import ContextMemory
+    tiered_us = run(ContextMemory.store_context, ContextMemory.get_conversation_summary, args.users, args.messages)
+
+    started = time.perf_counter()
+    for _ in range(10000):
+        ContextMemory.get_conversation_summary('user0')
+    summary_us = (time.perf_counter() - started) / 10000 * 1e6
+
+    print("=" * 80)
+    print(f"CONTEXT MEMORY - {args.messages:,} messages across {args.users} users (store + summary each)")
+    print("=" * 80)
+    print(f"{'rewrite file + list.count':>34} {legacy_us:>9.0f} us/message")
+    print(f"{'tiered (ring buffer + log)':>34} {tiered_us:>9.0f} us/message  ({legacy_us / tiered_us:.1f}x)")
+    print(f"{'summary from hot counters':>34} {summary_us:>9.1f} us")
+    print("=" * 80)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+# benchmarks/bench_conversation_archive.py
+# Cross-user analytics: loading every data/conversations file vs scanning the columnar archive
+#
+# Usage:
+#   python benchmarks/bench_conversation_archive.py
+#   python benchmarks/bench_conversation_archive.py --users 5000 --messages 200
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from mindfulai_backend.analytics.conversation_archive import ConversationArchive, archive_cold_conversations
+from mindfulai_backend.core.records import ROW_ID, MESSAGE_FIELDS, message_row
+from mindfulai_backend.core.serialization import read_json, write_json
+
+EMOTIONS = ('neutral', 'happy', 'sad', 'anxious', 'stressed', 'angry')
+EMOTION = MESSAGE_FIELDS.index('emotion')
+IS_CRISIS = MESSAGE_FIELDS.index('is_crisis')
+
+
+def make_conversations(path: Path, users: int, messages: int, now: float):
+    rng = random.Random(0)
+    for u in range(users):
+        rows = [[now - rng.uniform(31, 120) * 86400,
+                 "I have been feeling anxious about work and I can't sleep at night",
+                 "That sounds exhausting. What's been weighing on you the most lately?",
+                 rng.choice(EMOTIONS), rng.uniform(0.5, 3.0), rng.random() < 0.02]
+                for _ in range(messages)]
+        write_json(path / f'user{u}.json', {'user_id': f'user{u}', 'messages': rows, 'metadata': {}})
+
+
+def scan_json_files(path: Path):
+    """What analytics had to do before: json-load every file, walk every message"""
+    emotions = defaultdict(lambda: defaultdict(int))
+    crises = defaultdict(lambda: [0, 0])
+    for conv_file in path.glob('*.json'):
+        for item in read_json(conv_file)['messages']:
+            row = message_row(item)
+            day = datetime.fromtimestamp(row[ROW_ID], tz=timezone.utc).date().isoformat()
+            emotions[day][row[EMOTION]] += 1
+            crises[day][0] += 1
+            crises[day][1] += bool(row[IS_CRISIS])
+    return emotions, crises
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--users', type=int, default=2000)
+    parser.add_argument('--messages', type=int, default=100, help='messages per user')
+    args = parser.parse_args()
+
+    tmp = Path(tempfile.mkdtemp())
+    conversations, archive_dir = tmp / 'conversations', tmp / 'archive'
+    conversations.mkdir()
+    now = time.time()
+    make_conversations(conversations, args.users, args.messages, now)
+
+    started = time.perf_counter()
+    result = archive_cold_conversations(conversations, archive_dir, cold_days=30, now=now)
+    archive_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    scan_json_files(conversations)
+    json_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    archive = ConversationArchive(archive_dir)
+    archive.emotion_counts_per_day()
+    archive.crisis_rate_per_day()
+    columnar_s = time.perf_counter() - started
+
+    print("=" * 80)
+    print(f"CONVERSATION ARCHIVE - {args.users:,} users x {args.messages} messages ({result['rows']:,} rows)")
+    print("=" * 80)
+    print(f"{'archival job (one-off)':>40} {archive_s * 1000:>10.1f} ms")
+    print(f"{'json.load every file + aggregate':>40} {json_s * 1000:>10.1f} ms")
+    print(f"{'mmap columnar scan (both aggregates)':>40} {columnar_s * 1000:>10.1f} ms  ({json_s / columnar_s:.0f}x)")
+    print("=" * 80)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+# benchmarks/bench_conversation_search.py
+# Searching one user's history: scanning the JSON file vs the FTS5 index
+#
+# Usage:
+#   python benchmarks/bench_conversation_search.py
+#   python benchmarks/bench_conversation_search.py --messages 500000
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from mindfulai_backend.analytics.search_index import ConversationSearchIndex
+from mindfulai_backend.core.records import MESSAGE_FIELDS, MessageRecord, message_row
+from mindfulai_backend.core.serialization import read_json, write_json
+
+TOPICS = ('work', 'my boss', 'exams', 'my sister', 'sleep', 'my job interview', 'the gym', 'my partner',
+          'money', 'moving house', 'my dog', 'a deadline', 'friends', 'my health', 'the weekend')
+USER_MESSAGE = MESSAGE_FIELDS.index('user_message')
+QUERIES = ('when did I talk about my job?', 'sister', 'deadline stress', 'dog')
+
+
+def make_history(path: Path, messages: int, now: float):
+    rng = random.Random(0)
+    rows = []
+    for i in range(messages):
+        topic = rng.choice(TOPICS)
+        record = MessageRecord.create(
+            f"I keep thinking about {topic} and it's making me feel {rng.choice(('tired', 'anxious', 'low'))}",
+            f"It sounds like {topic} has been on your mind a lot. What part of it feels heaviest today?",
+            rng.choice(('sad', 'anxious', 'neutral')), rng.uniform(0.5, 3.0))
+        record.id = now - (messages - i) * 60.0
+        rows.append(record.to_row())
+    write_json(path / 'bench.json', {'user_id': 'bench', 'messages': rows, 'metadata': {}})
+
+
+def scan_json(path: Path, query: str):
+    """What a search had to do before: load the whole file and substring-match every message"""
+    words = [w for w in query.lower().strip('?').split() if len(w) > 3]
+    return [row for row in map(message_row, read_json(path / 'bench.json')['messages'])
+            if any(w in row[USER_MESSAGE].lower() for w in words)][:20]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--messages', type=int, default=100000)
+    args = parser.parse_args()
+
+    tmp = Path(tempfile.mkdtemp())
+    conversations = tmp / 'conversations'
+    conversations.mkdir()
+    now = time.time()
+    make_history(conversations, args.messages, now)
+
+    index = ConversationSearchIndex(tmp / 'search', conversations)
+    started = time.perf_counter()
+    index.rebuild('bench')
+    build_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for i in range(200):
+        index.add('bench', MessageRecord.create(f"new message {i} about my job", "Tell me more.", 'neutral', 1.0).to_row(),
+                  args.messages + i)
+    add_ms = (time.perf_counter() - started) / 200 * 1000
+
+    print("=" * 80)
+    print(f"CONVERSATION SEARCH - {args.messages:,} messages, one user")
+    print("=" * 80)
+    print(f"backfill: {build_s:.1f}s   incremental add: {add_ms:.2f} ms/message")
+    print(f"{'query':>34} {'json scan ms':>13} {'fts5 ms':>9} {'hits':>6}")
+    for query in QUERIES:
+        started = time.perf_counter()
+        scan_json(conversations, query)
+        scan_ms = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        hits = index.search('bench', query, start=now - 30 * 86400)
+        fts_ms = (time.perf_counter() - started) * 1000
+        print(f"{query:>34} {scan_ms:>13.1f} {fts_ms:>9.2f} {len(hits):>6}")
+    print("-" * 80)
+    print(f"top hit: {index.search('bench', QUERIES[0])[0]['user_message']}")
+    print("=" * 80)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+# benchmarks/bench_conversation_store.py
+# Conversation persistence throughput: the two old classes vs the unified ConversationStore
+#
+# "old path" replays what ConversationManager and ConversationDatabase.save_message
+# both did (read the file, normalize, append, recompute the average over every
+# row, rewrite). Reads are history(limit=20) + analytics, once the old way
+# (re-parse the file, recount distinct days) and once from the store's cache.
+#
+# Usage:
+#   python benchmarks/bench_conversation_store.py
+#   python benchmarks/bench_conversation_store.py --messages 2000 --users 10 --batch 8
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from mindfulai_backend.core.records import (
+    MESSAGE_FIELDS, ROW_ID, ROW_RESPONSE_TIME, MessageRecord, message_dicts, message_row, normalize_messages
+)
+from mindfulai_backend.core.serialization import read_json, write_json
+from mindfulai_backend.core.storage import locked
+
+
+def old_save(conv_dir: Path, user_id, record: MessageRecord):
+    conv_file = conv_dir / f"{user_id}.json"
+    with locked(conv_file):
+        if conv_file.exists():
+            data = normalize_messages(read_json(conv_file))
+        else:
+            data = {"user_id": user_id, "created_at": datetime.now().isoformat(),
+                    "message_fields": list(MESSAGE_FIELDS), "messages": [],
+                    "metadata": {"total_messages": 0, "total_crises": 0, "emotions": {}, "avg_response_time": 0}}
+        data['messages'].append(record.to_row())
+        meta = data['metadata']
+        meta['total_messages'] = len(data['messages'])
+        meta['emotions'][record.emotion] = meta['emotions'].get(record.emotion, 0) + 1
+        response_times = [row[ROW_RESPONSE_TIME] for row in data['messages']]
+        meta['avg_response_time'] = sum(response_times) / len(response_times)
+        write_json(conv_file, data)
+
+
+def old_read(conv_dir: Path, user_id):
+    data = read_json(conv_dir / f"{user_id}.json")
+    history = message_dicts(message_row(item) for item in data['messages'][-20:])
+    days = len(set(datetime.fromtimestamp(message_row(item)[ROW_ID]).date() for item in data['messages']))
+    return history, days
+
+
+def record(i) -> MessageRecord:
+    return MessageRecord.create(f'message {i} about work and sleep', 'a thoughtful reply ' * 8, 'anxious',
+                                1.0 + i % 7, i % 50 == 0, 'bench', 'work')
+
+
+def timed(fn, count) -> float:
+    started = time.perf_counter()
+    fn()
+    return count / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--messages', type=int, default=2000)
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--batch', type=int, default=8)
+    parser.add_argument('--reads', type=int, default=2000)
+    args = parser.parse_args()
+
+    # The store uses a relative data/ path; run everything in a scratch directory
+    os.chdir(tempfile.mkdtemp())
+    Path('data').mkdir()
+    from mindfulai_backend.core.conversation_store import ConversationStore
+
+    old_dir = Path('old')
+    old_dir.mkdir()
+    store = ConversationStore(Path('data/conversations'))
+    batched = ConversationStore(Path('batched'))
+    n, users = args.messages, args.users
+
+    results = [
+        ('old save_message path', timed(lambda: [old_save(old_dir, i % users, record(i)) for i in range(n)], n)),
+        ('store.save_message', timed(lambda: [store.save_messages(i % users, [record(i)]) for i in range(n)], n)),
+        (f'store.save_messages (batch {args.batch})',
+         timed(lambda: [batched.save_messages(b % users, [record(i) for i in range(b, b + args.batch)])
+                        for b in range(0, n, args.batch)], n)),
+    ]
+    reads = [
+        ('old read (re-parse file)', timed(lambda: [old_read(old_dir, i % users) for i in range(args.reads)],
+                                           args.reads)),
+        ('store read (cached)', timed(lambda: [(store.get_conversation_history(i % users, 20),
+                                                store.get_conversation_analytics(i % users))
+                                               for i in range(args.reads)], args.reads)),
+    ]
+
+    print("=" * 80)
+    print(f"CONVERSATION STORE - {n:,} messages across {users} users ({n // users} per user at the end)")
+    print("=" * 80)
+    base = results[0][1]
+    for name, rate in results:
+        print(f"{name:>36} {rate:>9.0f} msg/s  ({rate / base:.1f}x)")
+    for name, rate in reads:
+        print(f"{name:>36} {rate:>9.0f} reads/s  ({rate / reads[0][1]:.1f}x)")
+    cache = store.cache.metrics()
+    print(f"{'store cache':>36} {cache['hits']} hits / {cache['misses']} misses")
+    print("=" * 80)
+
+
+if __name__ == '__main__':
+    main()
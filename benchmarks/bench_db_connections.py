@@ -0,0 +1,159 @@
+# benchmarks/bench_db_connections.py
+# Request latency with a new database connection per request vs persistent connections
+#
+# Drives Django's request cycle by hand (request_started -> a few queries ->
+# request_finished, which is where close_old_connections() runs) from a pool
+# of worker threads, once per database alias:
+#   per-request   CONN_MAX_AGE=0, what the app did before
+#   persistent    CONN_MAX_AGE=600 with CONN_HEALTH_CHECKS, what settings.py does now
+# The stand-in is a scratch SQLite file, whose connect is nearly free, so
+# --connect-ms adds a sleep to every new connection (connection_created) to
+# model the TCP + SCRAM handshake of a PostgreSQL server and --rtt-ms a sleep
+# to every query for the network round trip (which also lets the threads wait
+# on I/O the way a server's do, instead of fighting over the GIL); 0 measures
+# SQLite as is. --postgres runs against the DB_* environment settings instead (a
+# disposable server, e.g. docker run -e POSTGRES_PASSWORD=x -p 5432:5432 postgres).
+# Last, analytics reads are checked to land on the replica alias.
+#
+# Usage:
+#   python benchmarks/bench_db_connections.py
+#   python benchmarks/bench_db_connections.py --threads 16 --requests 4000 --connect-ms 5
+#   DB_NAME=postgres DB_USER=postgres DB_PASSWORD=x DB_PORT=5432 python benchmarks/bench_db_connections.py --postgres
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def database(postgres, db_path, **extra):
+    if postgres:
+        entry = {'ENGINE': 'django.db.backends.postgresql', 'NAME': os.getenv('DB_NAME', 'postgres'),
+                 'USER': os.getenv('DB_USER', 'postgres'), 'PASSWORD': os.getenv('DB_PASSWORD', ''),
+                 'HOST': os.getenv('DB_HOST', '127.0.0.1'), 'PORT': os.getenv('DB_PORT', '5432')}
+    else:
+        entry = {'ENGINE': 'django.db.backends.sqlite3', 'NAME': db_path}
+    return {**entry, **extra}
+
+
+def setup_django(postgres, db_path):
+    import django
+    from django.conf import settings
+    settings.configure(
+        DEBUG=False,
+        SECRET_KEY='bench-only-signing-key-' + 'x' * 32,
+        USE_TZ=True,
+        DATABASES={
+            'default': database(postgres, db_path),
+            'per-request': database(postgres, db_path, CONN_MAX_AGE=0),
+            'persistent': database(postgres, db_path, CONN_MAX_AGE=600, CONN_HEALTH_CHECKS=True),
+            'replica': database(postgres, db_path),
+        },
+        DATABASE_ROUTERS=['mindfulai_backend.core.db_router.AnalyticsReplicaRouter'],
+        INSTALLED_APPS=['django.contrib.auth', 'django.contrib.contenttypes',
+                        'mindfulai_backend.users', 'mindfulai_backend.analytics'],
+        AUTH_USER_MODEL='users.User',
+        DEFAULT_AUTO_FIELD='django.db.models.BigAutoField',
+    )
+    django.setup()
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+
+
+def percentile(samples, q):
+    return statistics.quantiles(samples, n=100)[q - 1] * 1e3
+
+
+def load(alias, threads, requests, queries, connect_ms, rtt_ms):
+    from django.core import signals
+    from django.db import connections
+    from django.db.backends.signals import connection_created
+
+    opened = 0
+    lock = threading.Lock()
+    latencies = []
+
+    def handshake(sender, connection, **kwargs):
+        nonlocal opened
+        if connection.alias != alias:
+            return
+        with lock:
+            opened += 1
+        time.sleep(connect_ms / 1e3)
+
+    def one(i):
+        started = time.perf_counter()
+        signals.request_started.send(sender=None)
+        try:
+            with connections[alias].cursor() as cursor:
+                for q in range(queries):
+                    cursor.execute('SELECT %s', [i + q])
+                    cursor.fetchone()
+                    time.sleep(rtt_ms / 1e3)
+        finally:
+            signals.request_finished.send(sender=None)
+        with lock:
+            latencies.append(time.perf_counter() - started)
+
+    connection_created.connect(handshake, weak=False)
+    try:
+        started = time.perf_counter()
+        with ThreadPoolExecutor(threads) as pool:
+            list(pool.map(one, range(requests)))
+        wall = time.perf_counter() - started
+    finally:
+        connection_created.disconnect(handshake)
+    print(f"{alias:>12} {requests / wall:>8.0f} req/s  p50 {percentile(latencies, 50):>6.2f} ms"
+          f"  p99 {percentile(latencies, 99):>6.2f} ms  connections opened {opened}")
+    return percentile(latencies, 99)
+
+
+def check_router():
+    from django.db import router
+    from mindfulai_backend.analytics.models import Message
+    from mindfulai_backend.users.models import User
+    Message.objects.count()
+    return {
+        'analytics read': router.db_for_read(Message),
+        'analytics write': router.db_for_write(Message) or 'default',
+        'users read': router.db_for_read(User) or 'default',
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--queries', type=int, default=3, help='queries per request')
+    parser.add_argument('--connect-ms', type=float, default=3.0, help='simulated handshake per new connection')
+    parser.add_argument('--rtt-ms', type=float, default=0.2, help='simulated network round trip per query')
+    parser.add_argument('--postgres', action='store_true', help='use the DB_* environment PostgreSQL')
+    args = parser.parse_args()
+    if args.postgres:
+        args.connect_ms = args.rtt_ms = 0
+
+    os.chdir(tempfile.mkdtemp())
+    setup_django(args.postgres, os.path.abspath('bench.sqlite3'))
+
+    print("=" * 80)
+    print(f"DB CONNECTIONS - {'postgres' if args.postgres else 'sqlite'}, {args.threads} threads, "
+          f"{args.requests:,} requests x {args.queries} queries, +{args.connect_ms:g} ms per connect, "
+          f"+{args.rtt_ms:g} ms per query")
+    print("=" * 80)
+    before = load('per-request', args.threads, args.requests, args.queries, args.connect_ms, args.rtt_ms)
+    after = load('persistent', args.threads, args.requests, args.queries, args.connect_ms, args.rtt_ms)
+    print(f"{'':>12} p99 {before:.2f} -> {after:.2f} ms")
+    for path, alias in check_router().items():
+        print(f"{path:>16} -> {alias}")
+    print("=" * 80)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+# benchmarks/bench_fair_scheduling.py
+# Load test: heavy vs light clients sharing a few LLM slots, FIFO vs fair scheduling + rate limits
+#
+# Usage:
+#   python benchmarks/bench_fair_scheduling.py
+#   python benchmarks/bench_fair_scheduling.py --heavy 3 --threads 16 --slots 4 --llm-ms 50
+
+import argparse
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from mindfulai_backend.chatbot.ai_engine.rate_limiter import FairScheduler, RateLimiter
+
+
+def run(args, fair: bool, limiter: RateLimiter = None):
+    """Every client loops until the deadline; returns per-class latency and counts"""
+    scheduler = FairScheduler(slots=args.slots)
+    results = {'heavy': [], 'light': []}
+    limited = {'heavy': 0, 'light': 0}
+    lock = threading.Lock()
+    stop_at = time.monotonic() + args.seconds
+
+    def client(kind, name, think_s):
+        while time.monotonic() < stop_at:
+            started = time.perf_counter()
+            if limiter is not None and limiter.check(user_id=name):
+                with lock:
+                    limited[kind] += 1
+                time.sleep(think_s or args.llm_ms / 1000)
+                continue
+            # FIFO baseline: every request shares one queue key
+            key = name if fair else 'all'
+            if scheduler.acquire(key, timeout=args.seconds):
+                try:
+                    time.sleep(args.llm_ms / 1000)  # stand-in for the LLM round trip
+                finally:
+                    scheduler.release()
+                with lock:
+                    results[kind].append(time.perf_counter() - started)
+            time.sleep(think_s)
+
+    threads = []
+    for h in range(args.heavy):
+        threads += [threading.Thread(target=client, args=('heavy', f'heavy-{h}', 0.0)) for _ in range(args.threads)]
+    for l in range(args.light):
+        threads.append(threading.Thread(target=client, args=('light', f'light-{l}', args.think_ms / 1000)))
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    summary = {}
+    for kind, latencies in results.items():
+        latencies.sort()
+        summary[kind] = {
+            'done': len(latencies),
+            'limited': limited[kind],
+            'p50_ms': statistics.median(latencies) * 1000 if latencies else 0.0,
+            'p95_ms': latencies[max(0, int(len(latencies) * 0.95) - 1)] * 1000 if latencies else 0.0,
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--heavy', type=int, default=2, help='heavy clients')
+    parser.add_argument('--threads', type=int, default=12, help='concurrent requests per heavy client')
+    parser.add_argument('--light', type=int, default=4, help='light clients (one request at a time)')
+    parser.add_argument('--think-ms', type=float, default=100.0, help='pause between light-client requests')
+    parser.add_argument('--slots', type=int, default=4)
+    parser.add_argument('--llm-ms', type=float, default=40.0)
+    parser.add_argument('--seconds', type=float, default=3.0)
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print(f"FAIR SCHEDULING LOAD TEST - {args.heavy} heavy x {args.threads} threads, "
+          f"{args.light} light, {args.slots} slots, {args.llm_ms:.0f}ms LLM")
+    print("=" * 80)
+    print(f"{'mode':>18} {'client':>7} {'done':>7} {'429s':>7} {'p50 ms':>9} {'p95 ms':>9}")
+
+    modes = (
+        ('fifo', False, None),
+        ('fair', True, None),
+        ('fair + rate limit', True, RateLimiter(per_minute=600, burst=10)),
+    )
+    for mode, fair, limiter in modes:
+        summary = run(args, fair, limiter)
+        for kind in ('heavy', 'light'):
+            r = summary[kind]
+            print(f"{mode:>18} {kind:>7} {r['done']:>7} {r['limited']:>7} {r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f}")
+
+    print("=" * 80)
+
+
+if __name__ == '__main__':
+    main()
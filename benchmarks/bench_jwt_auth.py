@@ -0,0 +1,108 @@
+# benchmarks/bench_jwt_auth.py
+# Per-request authentication cost: JWTAuthentication vs the stateless fast path
+#
+# Runs Django on a scratch SQLite database with simplejwt's token blacklist
+# installed. Each case authenticates the same stream of requests (a pool of
+# users, each reusing its access token as a browser would) and reports the
+# time spent in authenticate() and the number of SQL queries it issued.
+# Finally one token is revoked and checked to be rejected.
+#
+# Usage:
+#   python benchmarks/bench_jwt_auth.py
+#   python benchmarks/bench_jwt_auth.py --users 500 --requests 20000
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def setup_django(db_path):
+    import django
+    from django.conf import settings
+    settings.configure(
+        DEBUG=False,
+        SECRET_KEY='bench-only-signing-key-' + 'x' * 32,
+        USE_TZ=True,
+        DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': db_path}},
+        INSTALLED_APPS=['django.contrib.auth', 'django.contrib.contenttypes', 'rest_framework',
+                        'rest_framework_simplejwt.token_blacklist', 'mindfulai_backend.users'],
+        AUTH_USER_MODEL='users.User',
+        DEFAULT_AUTO_FIELD='django.db.models.BigAutoField',
+    )
+    django.setup()
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+
+
+def run(name, auth, requests):
+    from django.db import connection
+    queries = 0
+
+    def count(execute, *args):
+        nonlocal queries
+        queries += 1
+        return execute(*args)
+
+    with connection.execute_wrapper(count):
+        started = time.perf_counter()
+        for request in requests:
+            user, _ = auth.authenticate(request)
+            assert user.is_authenticated
+        us = (time.perf_counter() - started) / len(requests) * 1e6
+    print(f"{name:>34} {us:>8.1f} us/request  {queries / len(requests):>5.2f} queries/request")
+    return us
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=10000)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp())
+    setup_django(os.path.abspath('bench.sqlite3'))
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+    from rest_framework_simplejwt.authentication import JWTAuthentication, JWTStatelessUserAuthentication
+    from rest_framework_simplejwt.exceptions import InvalidToken
+    from rest_framework_simplejwt.tokens import RefreshToken
+    from mindfulai_backend.core.jwt_auth import StatelessJWTAuthentication, revocations, revoke
+    from mindfulai_backend.users.models import User
+
+    tokens = []
+    for u in range(args.users):
+        user = User.objects.create_user(username=f'user{u}', email=f'user{u}@naina.local', password='x')
+        tokens.append(str(RefreshToken.for_user(user).access_token))
+
+    factory = APIRequestFactory()
+    requests = [Request(factory.get('/api/users/me/', HTTP_AUTHORIZATION=f'Bearer {tokens[i % args.users]}'))
+                for i in range(args.requests)]
+
+    print("=" * 80)
+    print(f"JWT AUTH - {args.users} users, {args.requests:,} requests")
+    print("=" * 80)
+    base = run('JWTAuthentication (User row)', JWTAuthentication(), requests)
+    run('JWTStatelessUserAuthentication', JWTStatelessUserAuthentication(), requests)
+    fast = run('StatelessJWTAuthentication', StatelessJWTAuthentication(), requests)
+    print(f"{'':>34} {base / fast:>8.1f}x faster than the default")
+
+    auth = StatelessJWTAuthentication()
+    _, token = auth.authenticate(requests[0])
+    revoke(token)
+    try:
+        auth.authenticate(requests[0])
+        outcome = 'ACCEPTED (bug)'
+    except InvalidToken:
+        outcome = 'rejected'
+    revocations.sync()
+    print(f"{'revoked token':>34} {outcome}; {len(revocations)} jti(s) after blacklist sync")
+    print("=" * 80)
+
+
+if __name__ == '__main__':
+    main()
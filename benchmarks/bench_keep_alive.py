@@ -0,0 +1,133 @@
+# benchmarks/bench_keep_alive.py
+# Requests/second for the NAINA JSON handler: HTTP/1.0 per-request connections vs
+# HTTP/1.1 keep-alive vs pipelining, plus compressed sizes of a large analytics payload
+#
+# Usage:
+#   python benchmarks/bench_keep_alive.py
+#   python benchmarks/bench_keep_alive.py --requests 2000 --clients 8
+
+import argparse
+import http.client
+import json
+import socket
+import sys
+import threading
+import time
+from http.server import ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from mindfulai_backend.core.json_http import JSONRequestHandler, compress, brotli
+
+EXPORT = {'conversations': [
+    {'user_message': 'I have been feeling anxious about work', 'ai_response': 'That sounds tough. Tell me more.',
+     'emotion': 'anxious', 'response_time': 1.23, 'is_crisis': False, 'timestamp': f'2025-11-20T15:{i % 60:02d}:00'}
+    for i in range(500)
+]}
+
+
+class BenchHandler(JSONRequestHandler):
+    def do_GET(self):
+        if self.path == '/export':
+            self.send_json_response(EXPORT, 200)
+        else:
+            self.send_json_response({'status': 'healthy'}, 200)
+
+    def do_POST(self):
+        body = self.read_body()
+        self.send_json_response({'response': "I hear you.", 'echo': len(body)}, 200)
+
+
+class LegacyHandler(BenchHandler):
+    """The old behaviour: HTTP/1.0, one connection per request"""
+    protocol_version = 'HTTP/1.0'
+
+
+def serve(handler):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def per_request_connections(port, n):
+    for _ in range(n):
+        conn = http.client.HTTPConnection('127.0.0.1', port)
+        conn.request('POST', '/api/chat/chat/', body=b'{"message": "hi"}', headers={'Content-Type': 'application/json'})
+        conn.getresponse().read()
+        conn.close()
+
+
+def keep_alive(port, n):
+    conn = http.client.HTTPConnection('127.0.0.1', port)
+    for _ in range(n):
+        conn.request('POST', '/api/chat/chat/', body=b'{"message": "hi"}', headers={'Content-Type': 'application/json'})
+        conn.getresponse().read()
+    conn.close()
+
+
+def pipelined(port, n, depth=16):
+    """Write `depth` requests back to back, then read the responses in order"""
+    request = (b'POST /api/chat/chat/ HTTP/1.1\r\nHost: 127.0.0.1\r\nContent-Type: application/json\r\n'
+               b'Content-Length: 17\r\n\r\n{"message": "hi"}')
+    sock = socket.create_connection(('127.0.0.1', port))
+    reader = sock.makefile('rb')
+    for start in range(0, n, depth):
+        batch = min(depth, n - start)
+        sock.sendall(request * batch)
+        for _ in range(batch):
+            length = 0
+            while True:
+                line = reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                if line.lower().startswith(b'content-length:'):
+                    length = int(line.split(b':')[1])
+            reader.read(length)
+    sock.close()
+
+
+def throughput(fn, port, total, clients):
+    per_client = total // clients
+    threads = [threading.Thread(target=fn, args=(port, per_client)) for _ in range(clients)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return per_client * clients / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--clients', type=int, default=4)
+    args = parser.parse_args()
+
+    legacy = serve(LegacyHandler)
+    modern = serve(BenchHandler)
+
+    print("=" * 80)
+    print(f"KEEP-ALIVE BENCHMARK - {args.requests} requests, {args.clients} clients")
+    print("=" * 80)
+    print(f"{'mode':>34} {'req/s':>10}")
+    runs = (
+        ('HTTP/1.0, new connection each', per_request_connections, legacy.server_port),
+        ('HTTP/1.1, new connection each', per_request_connections, modern.server_port),
+        ('HTTP/1.1 keep-alive', keep_alive, modern.server_port),
+        ('HTTP/1.1 keep-alive + pipelining', pipelined, modern.server_port),
+    )
+    for name, fn, port in runs:
+        print(f"{name:>34} {throughput(fn, port, args.requests, args.clients):>10.0f}")
+
+    raw = json.dumps(EXPORT).encode()
+    print("-" * 80)
+    print(f"export payload: {len(raw) / 1024:.1f} KB raw, {len(compress(raw, 'gzip')) / 1024:.1f} KB gzip"
+          + (f", {len(compress(raw, 'br')) / 1024:.1f} KB brotli" if brotli else ' (brotli not installed)'))
+    print("=" * 80)
+
+    legacy.shutdown()
+    modern.shutdown()
+
+
+if __name__ == '__main__':
+    main()
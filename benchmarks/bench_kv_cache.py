@@ -0,0 +1,68 @@
+# benchmarks/bench_kv_cache.py
+# Per-turn latency of cached incremental generation vs full prompt re-encoding
+#
+# Usage:
+#   python benchmarks/bench_kv_cache.py                      # distilgpt2
+#   python benchmarks/bench_kv_cache.py --model training/naina_final_model --turns 30
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from mindfulai_backend.chatbot.ai_engine.generation_cache import IncrementalGenerator, SessionKVCache
+
+TURNS = [
+    "I have been feeling really low this week.",
+    "Work has been piling up and my manager keeps adding deadlines.",
+    "I can't sleep properly, I keep thinking about everything I have to do.",
+    "My friends say I should take a break but I feel guilty.",
+    "Maybe I just need someone to talk to about it.",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--model', default='distilgpt2')
+    parser.add_argument('--turns', type=int, default=20)
+    parser.add_argument('--new-tokens', type=int, default=20)
+    args = parser.parse_args()
+
+    from transformers import AutoTokenizer, AutoModelForCausalLM
+    tokenizer = AutoTokenizer.from_pretrained(args.model)
+    model = AutoModelForCausalLM.from_pretrained(args.model).eval()
+
+    preamble = "NAINA is a warm, empathetic mental wellness companion.\n"
+    # Greedy decoding so both paths produce the same tokens
+    cached = IncrementalGenerator(model, tokenizer, SessionKVCache(), preamble=preamble,
+                                  max_new_tokens=args.new_tokens, temperature=0)
+    full = IncrementalGenerator(model, tokenizer, preamble=preamble,
+                                max_new_tokens=args.new_tokens, temperature=0)
+
+    print("=" * 80)
+    print(f"KV-CACHE BENCHMARK - {args.model}")
+    print("=" * 80)
+    print(f"{'turn':>5} {'prompt tok':>11} {'full ms':>10} {'cached ms':>10} {'speedup':>8} {'cache KB':>9}")
+
+    for turn in range(args.turns):
+        message = TURNS[turn % len(TURNS)]
+
+        started = time.perf_counter()
+        full.generate('bench', message, use_cache=False)
+        full_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        cached.generate('bench', message)
+        cached_ms = (time.perf_counter() - started) * 1000
+
+        prompt_tokens = len(cached.preamble_ids) + len(cached._history.get('bench', []))
+        print(f"{turn + 1:>5} {prompt_tokens:>11} {full_ms:>10.1f} {cached_ms:>10.1f} "
+              f"{full_ms / cached_ms:>7.2f}x {cached.cache.total_bytes / 1024:>9.0f}")
+
+    print("=" * 80)
+    print(f"Cache stats: {cached.cache.stats}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+# benchmarks/bench_message_records.py
+# Memory for 100k conversation turns: per-message dicts vs compact records
+#
+# Usage:
+#   python benchmarks/bench_message_records.py
+#   python benchmarks/bench_message_records.py --turns 500000
+
+import argparse
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from mindfulai_backend.core.records import ChatTurn, Exchange, MessageRecord, message_row
+from mindfulai_backend.core.serialization import dumps, loads
+
+EMOTIONS = ('neutral', 'happy', 'sad', 'anxious', 'stressed', 'angry')
+
+
+def legacy_file(n):
+    """A conversation file in the old layout: one 9-key dict per message"""
+    messages = []
+    for i in range(n):
+        user_message = f"message {i}: I have been feeling anxious about work"
+        ai_response = f"reply {i}: That sounds exhausting. What's weighing on you most?"
+        messages.append({
+            'id': 1763631424.0 + i, 'timestamp': f'2025-11-20T15:07:04.{i:06d}',
+            'user_message': user_message, 'ai_response': ai_response,
+            'emotion': EMOTIONS[i % len(EMOTIONS)], 'response_time': 1.25, 'is_crisis': False,
+            'message_length': len(user_message), 'response_length': len(ai_response),
+        })
+    return {'messages': messages}
+
+
+def measure(build):
+    """Bytes still allocated by whatever build() returns"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--turns', type=int, default=100000)
+    args = parser.parse_args()
+    n = args.turns
+
+    legacy_json = dumps(legacy_file(n))
+    rows_json = dumps({'messages': [message_row(m) for m in loads(legacy_json)['messages']]})
+    contents = [f"turn {i}: I have been feeling anxious about work" for i in range(n)]
+
+    cases = (
+        ('stored messages, loaded',
+         lambda: loads(legacy_json)['messages'],
+         lambda: [MessageRecord.from_row(row) for row in loads(rows_json)['messages']]),
+        ('chat turns (user_conversations)',
+         lambda: [{'role': 'user', 'content': c} for c in contents],
+         lambda: [ChatTurn('user', c) for c in contents]),
+        ('session exchanges',
+         lambda: [{'user': c, 'assistant': c, 'emotion': EMOTIONS[i % 6], 'context': 'work'}
+                  for i, c in enumerate(contents)],
+         lambda: [Exchange.create(c, c, EMOTIONS[i % 6], 'work') for i, c in enumerate(contents)]),
+    )
+
+    print("=" * 80)
+    print(f"MESSAGE RECORD MEMORY - {n:,} turns")
+    print("=" * 80)
+    print(f"{'case':>32} {'dicts MB':>10} {'records MB':>11} {'saved':>8}")
+    for name, before, after in cases:
+        old, new = measure(before), measure(after)
+        print(f"{name:>32} {old / 2**20:>10.1f} {new / 2**20:>11.1f} {1 - new / old:>7.0%}")
+    print("-" * 80)
+    print(f"file size: {len(legacy_json) / 2**20:.1f} MB dict layout -> {len(rows_json) / 2**20:.1f} MB rows")
+    print("=" * 80)
+
+
+if __name__ == '__main__':
+    main()
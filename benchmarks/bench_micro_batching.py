@@ -0,0 +1,111 @@
+# benchmarks/bench_micro_batching.py
+# Throughput vs latency of micro-batched inference at 1/8/32 concurrent users (CPU only)
+#
+# Usage:
+#   python benchmarks/bench_micro_batching.py                 # synthetic NumPy transformer block
+#   python benchmarks/bench_micro_batching.py --model distilgpt2
+
+import argparse
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from mindfulai_backend.chatbot.ai_engine.batching import MicroBatcher
+
+
+def synthetic_forward():
+    """Stand-in for a DistilBERT-sized forward pass: 6 layers of 768 -> 3072 -> 768"""
+    import numpy as np
+    rng = np.random.default_rng(0)
+    layers = [(rng.standard_normal((768, 3072), dtype=np.float32) * 0.02,
+               rng.standard_normal((3072, 768), dtype=np.float32) * 0.02) for _ in range(6)]
+    seq_len = 16
+
+    def forward(prompts):
+        x = rng.standard_normal((len(prompts) * seq_len, 768), dtype=np.float32)
+        for w1, w2 in layers:
+            x = np.maximum(x @ w1, 0) @ w2
+        return [float(x[i * seq_len].sum()) for i in range(len(prompts))]
+
+    return forward
+
+
+def model_forward(model_name):
+    """Real padded forward pass through a local Hugging Face model"""
+    import torch
+    from transformers import AutoTokenizer, AutoModel
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    if tokenizer.pad_token is None:
+        tokenizer.pad_token = tokenizer.eos_token
+    model = AutoModel.from_pretrained(model_name).eval()
+
+    def forward(prompts):
+        encoded = tokenizer(prompts, return_tensors='pt', padding=True, truncation=True, max_length=64)
+        with torch.inference_mode():
+            hidden = model(**encoded).last_hidden_state
+        return [float(h[0].sum()) for h in hidden]
+
+    return forward
+
+
+def run(forward, users, requests_per_user, max_batch_size, max_wait_ms):
+    batcher = MicroBatcher(forward, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms, name='bench')
+    latencies = []
+    lock = threading.Lock()
+    prompt = "I have been feeling anxious about work and I can't sleep"
+
+    def user():
+        for _ in range(requests_per_user):
+            started = time.perf_counter()
+            batcher.run(prompt)
+            with lock:
+                latencies.append(time.perf_counter() - started)
+
+    threads = [threading.Thread(target=user) for _ in range(users)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    stats = batcher.stats()
+    batcher.stop()
+    latencies.sort()
+    return {
+        'throughput': len(latencies) / elapsed,
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p95_ms': latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        'avg_batch': stats['avg_batch_size'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--model', help='Hugging Face model name (default: synthetic NumPy model)')
+    parser.add_argument('--requests', type=int, default=20, help='requests per user')
+    parser.add_argument('--max-batch', type=int, default=32)
+    parser.add_argument('--max-wait-ms', type=float, default=10.0)
+    args = parser.parse_args()
+
+    forward = model_forward(args.model) if args.model else synthetic_forward()
+
+    print("=" * 80)
+    print(f"MICRO-BATCHING BENCHMARK - {args.model or 'synthetic 6-layer block'}")
+    print("=" * 80)
+    print(f"{'users':>6} {'mode':>10} {'req/s':>10} {'p50 ms':>10} {'p95 ms':>10} {'avg batch':>10}")
+
+    for users in (1, 8, 32):
+        for mode, batch, wait in (('serial', 1, 0.0), ('batched', args.max_batch, args.max_wait_ms)):
+            r = run(forward, users, args.requests, batch, wait)
+            print(f"{users:>6} {mode:>10} {r['throughput']:>10.1f} {r['p50_ms']:>10.1f} "
+                  f"{r['p95_ms']:>10.1f} {r['avg_batch']:>10.2f}")
+
+    print("=" * 80)
+
+
+if __name__ == '__main__':
+    main()
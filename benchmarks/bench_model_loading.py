@@ -0,0 +1,83 @@
+# benchmarks/bench_model_loading.py
+# Load time and resident memory per worker: from_pretrained vs mmap safetensors vs int8
+#
+# Usage:
+#   python training/export_quantized_model.py
+#   python benchmarks/bench_model_loading.py --model-dir training/naina_serving_model --workers 4
+
+import argparse
+import multiprocessing as mp
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def worker(model_dir, mode, ready, release, results):
+    from mindfulai_backend.chatbot.ai_engine.model_loader import load_model, process_memory
+    import torch
+    from transformers import AutoConfig, AutoModelForCausalLM  # keep import cost out of the numbers
+
+    before = process_memory()
+    model, seconds = load_model(model_dir, mode)
+    with torch.inference_mode():
+        model(torch.tensor([[1, 2, 3, 4]]))  # touch every weight once
+    after = process_memory()
+
+    results.put({
+        'load_s': seconds,
+        'rss_mb': after.get('VmRSS', 0) - before.get('VmRSS', 0),
+        'anon_mb': after.get('RssAnon', 0) - before.get('RssAnon', 0),
+        'pss_mb': after.get('Pss', 0) - before.get('Pss', 0),
+    })
+    # Stay alive until every worker has loaded so shared pages are counted once
+    ready.release()
+    release.wait()
+    results.put({'pss_mb_all_loaded': process_memory().get('Pss', 0) - before.get('Pss', 0)})
+
+
+def run(model_dir, mode, workers):
+    ctx = mp.get_context('spawn')
+    ready, release, results = ctx.Semaphore(0), ctx.Event(), ctx.Queue()
+    procs = [ctx.Process(target=worker, args=(model_dir, mode, ready, release, results)) for _ in range(workers)]
+    for p in procs:
+        p.start()
+    for _ in procs:
+        ready.acquire()
+    loads = [results.get() for _ in procs]
+    release.set()
+    shared = [results.get()['pss_mb_all_loaded'] for _ in procs]
+    for p in procs:
+        p.join()
+    n = len(loads)
+    return {
+        'load_s': sum(r['load_s'] for r in loads) / n,
+        'rss_mb': sum(r['rss_mb'] for r in loads) / n,
+        'anon_mb': sum(r['anon_mb'] for r in loads) / n,
+        'pss_mb': sum(shared) / n,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--model-dir', default='training/naina_serving_model')
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print(f"MODEL LOADING BENCHMARK - {args.model_dir} x {args.workers} workers")
+    print("=" * 80)
+    print(f"{'mode':>11} {'load s':>8} {'RSS MB':>9} {'private MB':>11} {'PSS MB':>9} {'total MB':>10}")
+    print("  (RSS counts shared pages in every worker; PSS splits them between workers)")
+
+    for mode in ('pretrained', 'mmap', 'int8'):
+        r = run(args.model_dir, mode, args.workers)
+        print(f"{mode:>11} {r['load_s']:>8.2f} {r['rss_mb']:>9.1f} {r['anon_mb']:>11.1f} "
+              f"{r['pss_mb']:>9.1f} {r['pss_mb'] * args.workers:>10.1f}")
+
+    print("=" * 80)
+
+
+if __name__ == '__main__':
+    main()
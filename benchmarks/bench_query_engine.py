@@ -0,0 +1,103 @@
+# benchmarks/bench_query_engine.py
+# Cross-user aggregate query latency over a synthetic multi-million-row archive
+#
+# Segments are generated straight from numpy in the layout write_segment()
+# produces (sorted ts, int16 coded columns, meta.json zone maps), so the
+# benchmark can reach tens of millions of rows without building Python rows.
+#
+# Usage:
+#   python benchmarks/bench_query_engine.py
+#   python benchmarks/bench_query_engine.py --rows 20000000 --segments 40
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from mindfulai_backend.analytics.conversation_archive import MANIFEST
+from mindfulai_backend.analytics.query_engine import QueryEngine
+from mindfulai_backend.core.serialization import write_json
+
+DICTIONARIES = {
+    'emotion': ['angry', 'anxious', 'crisis', 'happy', 'lonely', 'neutral', 'sad', 'stressed'],
+    'model': ['Qwen/Qwen2.5-3B-Instruct', 'crisis-templates', 'fallback-templates', 'unknown'],
+    'theme': ['family', 'general', 'health', 'relationship', 'school', 'sleep', 'work'],
+}
+DAYS = 180
+
+
+def make_archive(path: Path, rows: int, segments: int, now: float):
+    rng = np.random.default_rng(0)
+    per_segment = rows // segments
+    span = DAYS * 86400 / segments
+    names = []
+    for s in range(segments):
+        name = f'segment-{s:04d}'
+        seg = path / name
+        seg.mkdir()
+        start = now - DAYS * 86400 + s * span
+        ts = np.sort(rng.uniform(start, start + span, per_segment))
+        np.save(seg / 'ts.npy', ts)
+        np.save(seg / 'user.npy', rng.integers(0, 5000, per_segment, dtype=np.int32))
+        for column, values in DICTIONARIES.items():
+            np.save(seg / f'{column}.npy', rng.integers(0, len(values), per_segment).astype(np.int16))
+        np.save(seg / 'crisis.npy', rng.random(per_segment) < 0.02)
+        np.save(seg / 'response_time.npy', rng.gamma(2.0, 0.6, per_segment).astype(np.float32))
+        write_json(seg / 'meta.json', {'rows': per_segment, 'users': [f'user{u}' for u in range(5000)],
+                                       'dictionaries': DICTIONARIES,
+                                       'ts_min': float(ts[0]), 'ts_max': float(ts[-1])})
+        names.append(name)
+    write_json(path / MANIFEST, {'segments': names, 'watermarks': {}})
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=10_000_000)
+    parser.add_argument('--segments', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    now = time.time()
+    path = Path(tempfile.mkdtemp())
+    started = time.perf_counter()
+    make_archive(path, args.rows, args.segments, now)
+    build_s = time.perf_counter() - started
+
+    engine = QueryEngine(path)
+    week = now - 7 * 86400
+    queries = (
+        ('crisis events per hour (last 7d)',
+         dict(metrics=('count',), bucket='hour', filters={'crisis': True}, start=week)),
+        ('emotion distribution per day',
+         dict(metrics=('count',), group_by=('emotion',), bucket='day')),
+        ('response time p50/p95/p99 per model',
+         dict(metrics=('count', 'p50', 'p95', 'p99'), group_by=('model',))),
+        ('top 5 themes by crisis rate',
+         dict(metrics=('crisis_rate', 'count'), group_by=('theme',), limit=5)),
+        ('sad+anxious per model per day (last 30d)',
+         dict(metrics=('count', 'avg_response_time'), group_by=('model',), bucket='day',
+              filters={'emotion': ['sad', 'anxious']}, start=now - 30 * 86400)),
+    )
+
+    print("=" * 80)
+    print(f"QUERY ENGINE - {args.rows:,} rows in {args.segments} segments (built in {build_s:.1f}s)")
+    print("=" * 80)
+    print(f"{'query':>42} {'best ms':>9} {'scanned':>12} {'segs skipped':>13}")
+    for name, query in queries:
+        best = float('inf')
+        for _ in range(args.repeat):
+            result = engine.query(**query)
+            best = min(best, result['stats']['elapsed_ms'])
+        stats = result['stats']
+        print(f"{name:>42} {best:>9.1f} {stats['rows_scanned']:>12,} {stats['segments_skipped']:>13}")
+    print("-" * 80)
+    print(engine.metrics.snapshot())
+    print("=" * 80)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+# benchmarks/bench_read_cache.py
+# Dashboard page loads against the conversation store with and without the read cache
+#
+# One "dashboard load" is what the analytics page asks for back to back:
+# history(50), stats and export (json), plus the export behind /insights/.
+# Users are picked at random, some of them hot; every
+# --write-every loads a new message lands, invalidating that user's entry.
+#
+# Usage:
+#   python benchmarks/bench_read_cache.py
+#   python benchmarks/bench_read_cache.py --users 200 --messages 300 --loads 3000 --cache-mb 8
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from mindfulai_backend.core.records import MessageRecord
+
+
+def dashboard(store, user_id):
+    store.get_conversation_history(user_id, 50)
+    store.get_conversation_analytics(user_id)
+    store.export_conversation(user_id)
+    store.export_conversation(user_id)
+
+
+def run(store, user_ids, loads, write_every, seed=7):
+    rng = random.Random(seed)
+    hot = user_ids[:max(1, len(user_ids) // 10)]
+    started = time.perf_counter()
+    for i in range(loads):
+        # 80% of page loads come from the busiest 10% of users
+        user_id = rng.choice(hot) if rng.random() < 0.8 else rng.choice(user_ids)
+        dashboard(store, user_id)
+        if write_every and i % write_every == 0:
+            store.save_message(user_id, 'new message', 'reply', 'calm', 1.0)
+    return (time.perf_counter() - started) / loads * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--messages', type=int, default=200, help='messages per user')
+    parser.add_argument('--loads', type=int, default=2000)
+    parser.add_argument('--write-every', type=int, default=20)
+    parser.add_argument('--cache-mb', type=float, default=32)
+    args = parser.parse_args()
+
+    # The stores use relative data/ paths; run everything in a scratch directory
+    os.chdir(tempfile.mkdtemp())
+    from mindfulai_backend.core.conversation_store import ConversationStore
+    from mindfulai_backend.core.read_cache import ReadCache
+
+    seed_store = ConversationStore(Path('data/conversations'), ReadCache('seed', 0))
+    user_ids = [f'user{u}' for u in range(args.users)]
+    for user_id in user_ids:
+        seed_store.save_messages(user_id, [
+            MessageRecord.create(f'message {i} about my job and sleep', 'a thoughtful reply ' * 10, 'anxious',
+                                 1.0 + i % 5, False, 'bench', 'work')
+            for i in range(args.messages)])
+
+    print("=" * 80)
+    print(f"READ CACHE - {args.users} users x {args.messages} messages, {args.loads:,} dashboard loads")
+    print("=" * 80)
+    for name, max_bytes in (('no cache', 0), (f'read cache ({args.cache_mb:g} MB)', int(args.cache_mb * 2 ** 20))):
+        store = ConversationStore(Path('data/conversations'), ReadCache(name, max_bytes))
+        ms = run(store, user_ids, args.loads, args.write_every)
+        metrics = store.cache.metrics()
+        print(f"{name:>28} {ms:>8.2f} ms/load  file parses {metrics['misses']:>6}"
+              f"  hit rate {metrics['hit_rate']:.1%}  evictions {metrics['evictions']}")
+    print("=" * 80)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,204 @@
+# benchmarks/bench_registration.py
+# Signup cost and correctness: exists() checks + create_user vs one INSERT
+#
+# Runs Django on a scratch SQLite database. Three parts:
+#   latency      sequential signups through the old flow (two exists()
+#                queries, then create_user) and through register_user, with
+#                SQL queries per signup. --hasher picks PASSWORD_HASHERS:
+#                'md5' isolates the database work, 'pbkdf2' is the real cost.
+#   race         --racers threads sign up the same username/email at once;
+#                exactly one must get 201 and the rest the existing 400 error
+#   burst        --burst signups at once with the real hasher, reporting how
+#                long a cheap concurrent request waits meanwhile, unbounded
+#                hashing vs NAINA_HASH_WORKERS slots
+# Every signup comes from one address, so the per-IP signup limit is lifted;
+# it would otherwise turn most of them away with 429.
+#
+# Usage:
+#   python benchmarks/bench_registration.py
+#   python benchmarks/bench_registration.py --signups 2000 --racers 32 --burst 16
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+HASHERS = {
+    'md5': 'django.contrib.auth.hashers.MD5PasswordHasher',
+    'pbkdf2': 'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+}
+
+
+def setup_django(db_path):
+    import django
+    from django.conf import settings
+    settings.configure(
+        DEBUG=False,
+        SECRET_KEY='bench-only-signing-key-' + 'x' * 32,
+        USE_TZ=True,
+        DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': db_path,
+                               'OPTIONS': {'timeout': 30}}},
+        INSTALLED_APPS=['django.contrib.auth', 'django.contrib.contenttypes', 'rest_framework',
+                        'mindfulai_backend.users'],
+        AUTH_USER_MODEL='users.User',
+        PASSWORD_HASHERS=list(HASHERS.values()),
+        DEFAULT_AUTO_FIELD='django.db.models.BigAutoField',
+    )
+    django.setup()
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+
+
+def use_hasher(name):
+    from django.conf import settings
+    from django.contrib.auth.hashers import get_hashers, get_hashers_by_algorithm
+    settings.PASSWORD_HASHERS = [HASHERS[name]] + [h for h in HASHERS.values() if h != HASHERS[name]]
+    get_hashers.cache_clear()
+    get_hashers_by_algorithm.cache_clear()
+
+
+def old_register(data):
+    """register_user as it was: two exists() round trips, then create_user"""
+    from django.db import IntegrityError
+    from mindfulai_backend.users.models import User
+    if User.objects.filter(username=data['username']).exists():
+        return 400
+    if User.objects.filter(email=data['email']).exists():
+        return 400
+    try:
+        User.objects.create_user(username=data['username'], email=data['email'], password=data['password'])
+    except IntegrityError:
+        return 500  # lost the race between the checks and the insert
+    return 201
+
+
+def new_register(data):
+    from rest_framework.test import APIRequestFactory
+    from mindfulai_backend.users.views import register_user
+    return register_user(APIRequestFactory().post('/api/users/register/', data, format='json')).status_code
+
+
+def signup(prefix, i):
+    return {'username': f'{prefix}{i}', 'email': f'{prefix}{i}@naina.local', 'password': 'calm-waters-42'}
+
+
+def latency(name, register, signups):
+    from django.db import connection
+    queries = 0
+
+    def count(execute, *args):
+        nonlocal queries
+        queries += 1
+        return execute(*args)
+
+    timings = []
+    with connection.execute_wrapper(count):
+        for i in range(signups):
+            started = time.perf_counter()
+            assert register(signup(name, i)) == 201
+            timings.append(time.perf_counter() - started)
+        # A duplicate, which the old flow caught with a query and the new one with the constraint
+        assert register(signup(name, 0)) == 400
+    print(f"{name:>10} mean {statistics.mean(timings) * 1e3:>6.2f} ms"
+          f"  p99 {statistics.quantiles(timings, n=100)[98] * 1e3:>6.2f} ms"
+          f"  {queries / (signups + 1):.2f} queries/signup")
+
+
+def race(name, register, racers):
+    from django.db import connection
+    barrier = threading.Barrier(racers)
+
+    def one(_):
+        barrier.wait()
+        try:
+            return register(signup(f'{name}-race', 0))
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(racers) as pool:
+        outcomes = list(pool.map(one, range(racers)))
+    verdict = 'ok' if outcomes.count(201) == 1 else 'DUPLICATE ACCOUNTS' if outcomes.count(201) > 1 else 'NONE CREATED'
+    print(f"{name:>10} {racers} racers -> {outcomes.count(201)} created, {outcomes.count(400)} rejected,"
+          f" {outcomes.count(500)} server errors ({verdict})")
+
+
+def burst(name, register, signups):
+    """Time a trivial request repeatedly while `signups` hashes run"""
+    from django.db import connection
+    probe_ms = []
+    done = threading.Event()
+
+    def probe():
+        while not done.is_set():
+            started = time.perf_counter()
+            sum(range(2000))
+            probe_ms.append((time.perf_counter() - started) * 1e3)
+            time.sleep(0.005)
+
+    def one(i):
+        try:
+            return register(signup(f'{name}-burst', i))
+        finally:
+            connection.close()
+
+    watcher = threading.Thread(target=probe)
+    watcher.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(signups) as pool:
+        outcomes = list(pool.map(one, range(signups)))
+    wall = time.perf_counter() - started
+    done.set()
+    watcher.join()
+    print(f"{name:>10} {signups} signups in {wall:.2f} s ({outcomes.count(201)} created, {outcomes.count(503)} told to retry)"
+          f"  concurrent request p99 {statistics.quantiles(probe_ms, n=100)[98]:.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--signups', type=int, default=500)
+    parser.add_argument('--racers', type=int, default=16)
+    parser.add_argument('--burst', type=int, default=8)
+    parser.add_argument('--hasher', choices=HASHERS, default='md5')
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp())
+    setup_django(os.path.abspath('bench.sqlite3'))
+    from django.contrib.auth.hashers import make_password
+    from mindfulai_backend.chatbot.ai_engine.rate_limiter import RateLimiter
+    from mindfulai_backend.users import views
+    from mindfulai_backend.users.password_hashing import PasswordHasherPool
+    views.signup_limiter = RateLimiter(ip_per_minute=1e9, ip_burst=10 ** 9)
+
+    print("=" * 80)
+    print(f"REGISTRATION - {args.signups} signups, {args.hasher} hasher")
+    print("=" * 80)
+    use_hasher(args.hasher)
+    latency('old', old_register, args.signups)
+    latency('new', new_register, args.signups)
+    print("-" * 80)
+    race('old', old_register, args.racers)
+    race('new', new_register, args.racers)
+    print("-" * 80)
+    use_hasher('pbkdf2')
+
+    class Inline:
+        hash = staticmethod(make_password)
+
+    pool = views.password_hasher
+    views.password_hasher = Inline()
+    burst('unbounded', new_register, args.burst)
+    views.password_hasher = PasswordHasherPool()
+    burst('bounded', new_register, args.burst)
+    views.password_hasher = pool
+    print("=" * 80)
+
+
+if __name__ == '__main__':
+    main()
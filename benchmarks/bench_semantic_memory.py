@@ -0,0 +1,92 @@
+# benchmarks/bench_semantic_memory.py
+# Semantic recall for one user's history: IVF search vs exact search (recall@k, latency)
+#
+# Usage:
+#   python benchmarks/bench_semantic_memory.py
+#   python benchmarks/bench_semantic_memory.py --messages 200000 --nprobe 16
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from mindfulai_backend.analytics.semantic_memory import HashingEmbedder, UserMemory
+
+PEOPLE = ('my mom', 'my dad', 'my sister', 'my brother', 'my partner', 'my best friend', 'my boss', 'my grandmother',
+          'my roommate', 'my teacher', 'my son', 'my daughter', 'my coach', 'my neighbour', 'my therapist')
+EVENTS = ('is in hospital', 'lost their job', 'moved away', 'stopped talking to me', 'got engaged',
+          'has been drinking again', 'is getting divorced', 'had surgery', 'started a new job', 'is sick',
+          'yelled at me', 'forgot my birthday', 'passed an exam', 'is struggling with money', 'had a baby')
+FEELINGS = ('I feel scared', 'I cannot sleep', 'I feel guilty', 'I am so angry', 'I feel relieved',
+            'I feel numb', 'I keep crying', 'I feel proud', 'I feel lonely', 'I am exhausted')
+
+
+def make_turns(n: int, now: float):
+    rng = random.Random(0)
+    return [[now - (n - i) * 300.0, f"{rng.choice(PEOPLE)} {rng.choice(EVENTS)} and {rng.choice(FEELINGS)}"]
+            for i in range(n)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--messages', type=int, default=50000)
+    parser.add_argument('--queries', type=int, default=300)
+    parser.add_argument('--k', type=int, default=5)
+    parser.add_argument('--nprobe', type=int, default=16)
+    args = parser.parse_args()
+
+    path = Path(tempfile.mkdtemp()) / 'user'
+    turns = make_turns(args.messages, time.time())
+    embedder = HashingEmbedder()
+
+    started = time.perf_counter()
+    memory = UserMemory(path, embedder)
+    memory.add(turns)
+    build_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    memory = UserMemory(path, embedder)
+    load_ms = (time.perf_counter() - started) * 1000
+
+    rng = random.Random(1)
+    queries = [f"{rng.choice(PEOPLE)} {rng.choice(EVENTS)}" for _ in range(args.queries)]
+    vectors = embedder.embed(queries)
+    index = memory.index
+
+    exact_ms, ivf_ms, recall = [], [], []
+    for q in vectors:
+        started = time.perf_counter()
+        scores = index.vectors @ q
+        truth = np.argpartition(-scores, args.k - 1)[:args.k]
+        exact_ms.append((time.perf_counter() - started) * 1000)
+        started = time.perf_counter()
+        rows, _ = index.search(q, args.k, nprobe=args.nprobe)
+        ivf_ms.append((time.perf_counter() - started) * 1000)
+        # Ties are common with templated text: count a hit as correct if it scores as well as the k-th truth
+        kth = np.sort(scores[truth])[0]
+        recall.append(np.count_nonzero(scores[rows] >= kth - 1e-6) / args.k)
+
+    started = time.perf_counter()
+    for query in queries[:50]:
+        memory.search(query, args.k, min_score=0.3)
+    recall_ms = (time.perf_counter() - started) / 50 * 1000
+
+    print("=" * 80)
+    print(f"SEMANTIC MEMORY - {args.messages:,} turns, {len(index.centroids) if index.centroids is not None else 0} "
+          f"IVF lists, nprobe={args.nprobe}, k={args.k}")
+    print("=" * 80)
+    print(f"embed + index + persist: {build_s:.1f}s   reload from disk: {load_ms:.0f} ms")
+    print(f"{'exact search':>28} p50 {np.percentile(exact_ms, 50):6.2f} ms   p99 {np.percentile(exact_ms, 99):6.2f} ms")
+    print(f"{'IVF search':>28} p50 {np.percentile(ivf_ms, 50):6.2f} ms   p99 {np.percentile(ivf_ms, 99):6.2f} ms")
+    print(f"{'IVF recall@' + str(args.k):>28} {np.mean(recall):.3f}")
+    print(f"{'recall() incl. embedding':>28} {recall_ms:.2f} ms")
+    print("=" * 80)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+# benchmarks/bench_serialization.py
+# JSON cost per store/endpoint: old stdlib json (indent=2) vs core.serialization
+# (compact, orjson when installed, mmap decode for large files)
+#
+# Usage:
+#   python benchmarks/bench_serialization.py
+#   python benchmarks/bench_serialization.py --messages 20000
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from mindfulai_backend.core import serialization
+from mindfulai_backend.core.serialization import ChatRequest, decode, dumps, loads, read_json, write_json
+
+
+def conversation_file(n):
+    """Same shape ConversationDatabase.save_message() writes"""
+    return {
+        'user_id': 'bench-user',
+        'created_at': '2025-11-20T15:07:04',
+        'messages': [{
+            'id': 1763631424.0 + i,
+            'timestamp': f'2025-11-20T15:{i % 60:02d}:04.123456',
+            'user_message': "I have been feeling anxious about work and I can't sleep",
+            'ai_response': "That sounds exhausting. What's been weighing on you the most?",
+            'emotion': ('anxious', 'sad', 'neutral', 'happy')[i % 4],
+            'response_time': 1.234 + i % 7,
+            'is_crisis': False,
+            'message_length': 56,
+            'response_length': 61,
+        } for i in range(n)],
+        'metadata': {'total_messages': n, 'total_crises': 0,
+                     'emotions': {'anxious': n // 4, 'sad': n // 4, 'neutral': n // 4, 'happy': n // 4},
+                     'avg_response_time': 4.2},
+    }
+
+
+def timed(fn, repeat):
+    fn()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--messages', type=int, default=5000, help='messages in the large conversation file')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    tmp = Path(tempfile.mkdtemp())
+    small, large = conversation_file(50), conversation_file(args.messages)
+    body = b'{"message": "I have been feeling anxious about work", "user_id": "user_123456"}'
+
+    def old_store(data, path):
+        def run():
+            with open(path, 'w') as f:
+                json.dump(data, f, indent=2)
+            with open(path, 'r') as f:
+                json.load(f)
+        return run
+
+    def new_store(data, path):
+        def run():
+            write_json(path, data)
+            read_json(path)
+        return run
+
+    cases = (
+        ('store write+read, 50 msgs', old_store(small, tmp / 'a.json'), new_store(small, tmp / 'b.json')),
+        (f'store write+read, {args.messages} msgs', old_store(large, tmp / 'c.json'), new_store(large, tmp / 'd.json')),
+        (f'export response, {args.messages} msgs', lambda: json.dumps(large).encode(), lambda: dumps(large)),
+        ('chat request decode', lambda: json.loads(body), lambda: decode(body, ChatRequest)),
+        ('chat request loads only', lambda: json.loads(body), lambda: loads(body)),
+    )
+
+    print("=" * 80)
+    print(f"SERIALIZATION BENCHMARK - backend: {serialization.BACKEND}")
+    print("=" * 80)
+    print(f"{'case':>34} {'stdlib ms':>11} {'new ms':>11} {'speedup':>9}")
+    for name, old, new in cases:
+        repeat = args.repeat if 'msgs' in name else args.repeat * 1000
+        old_ms, new_ms = timed(old, repeat), timed(new, repeat)
+        print(f"{name:>34} {old_ms:>11.4f} {new_ms:>11.4f} {old_ms / new_ms:>8.1f}x")
+
+    print("-" * 80)
+    old_size = (tmp / 'c.json').stat().st_size
+    new_size = (tmp / 'd.json').stat().st_size
+    print(f"{args.messages}-message file: {old_size / 1024:.0f} KB indented -> {new_size / 1024:.0f} KB compact")
+    print("=" * 80)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+# benchmarks/bench_store_concurrency.py
+# Many concurrent writers on the JSON conversation store: lost updates and throughput
+#
+# Runs the old unlocked read-modify-write next to the locked, atomic
+# ConversationManager.save_message(), with threads and with several
+# processes hitting the same users, then counts what actually landed on disk.
+#
+# Usage:
+#   python benchmarks/bench_store_concurrency.py
+#   python benchmarks/bench_store_concurrency.py --threads 32 --processes 4 --saves 200
+#   NAINA_FSYNC=0 python benchmarks/bench_store_concurrency.py   # atomic rename, no fsync
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from mindfulai_backend.core.serialization import dumps, read_json
+
+USERS = 4
+
+
+def unlocked_save(user_id, n):
+    """What every store did before: read, append, truncate-and-rewrite, no lock"""
+    conv_file = Path('data/conversations') / f'{user_id}.json'
+    data = read_json(conv_file) if conv_file.exists() else {'user_id': user_id, 'messages': []}
+    data['messages'].append([time.time(), f'message {n}', 'reply', 'neutral', 1.0, False, None, None])
+    with open(conv_file, 'wb') as f:
+        f.write(dumps(data))
+
+
+def locked_save(user_id, n):
+    from mindfulai_backend.core.conversation_manager import ConversationManager
+    ConversationManager.save_message(user_id, f'message {n}', 'reply', 'neutral', 1.0)
+
+
+def hammer(save, threads, saves, prefix):
+    def worker(t):
+        for i in range(saves):
+            try:
+                save(f'{prefix}{(t + i) % USERS}', i)
+            except ValueError:
+                pass  # the unlocked path can read a half-written file
+    pool = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+
+
+def landed(prefix) -> int:
+    total = 0
+    for u in range(USERS):
+        conv_file = Path('data/conversations') / f'{prefix}{u}.json'
+        try:
+            total += len(read_json(conv_file)['messages'])
+        except (FileNotFoundError, ValueError):
+            pass
+    return total
+
+
+def run(name, save, threads, processes, saves, prefix):
+    started = time.perf_counter()
+    if processes > 1:
+        ctx = multiprocessing.get_context('fork')
+        procs = [ctx.Process(target=hammer, args=(save, threads, saves, prefix)) for _ in range(processes)]
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join()
+    else:
+        hammer(save, threads, saves, prefix)
+    elapsed = time.perf_counter() - started
+    expected = threads * saves * max(processes, 1)
+    got = landed(prefix)
+    print(f"{name:>34} {expected / elapsed:>9.0f}/s {expected:>8} {expected - got:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--saves', type=int, default=100, help='saves per thread')
+    args = parser.parse_args()
+
+    # The stores use relative data/ paths; run everything in a scratch directory
+    os.chdir(tempfile.mkdtemp())
+    Path('data/conversations').mkdir(parents=True)
+
+    print("=" * 80)
+    print(f"STORE CONCURRENCY - {USERS} users, {args.saves} saves per thread")
+    print("=" * 80)
+    print(f"{'case':>34} {'throughput':>11} {'saves':>8} {'lost':>8}")
+    run('unlocked, 1 thread', unlocked_save, 1, 1, args.saves * 4, 'a')
+    run('locked + atomic, 1 thread', locked_save, 1, 1, args.saves * 4, 'b')
+    run(f'unlocked, {args.threads} threads', unlocked_save, args.threads, 1, args.saves, 'c')
+    run(f'locked + atomic, {args.threads} threads', locked_save, args.threads, 1, args.saves, 'd')
+    run(f'unlocked, {args.processes}x{args.threads}', unlocked_save, args.threads, args.processes, args.saves, 'e')
+    run(f'locked + atomic, {args.processes}x{args.threads}', locked_save, args.threads, args.processes,
+        args.saves, 'f')
+    print("=" * 80)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+# benchmarks/bench_user_cache.py
+# /api/users/me/ and per-user stats aggregates under concurrency, with and without UserCache
+#
+# Runs Django on a scratch SQLite database (no PostgreSQL needed): real JWT
+# authentication for /me/, and the stats aggregates the chatbot /stats/
+# endpoint is meant to run over analytics.Message. "no cache" is the same
+# code on Django's DummyCache backend. Messages keep arriving, bumping the
+# sender's version. The stampede test bumps one hot user and fires every
+# thread at it at once, counting how many of them recompute.
+#
+# Usage:
+#   python benchmarks/bench_user_cache.py
+#   python benchmarks/bench_user_cache.py --threads 32 --requests 4000 --messages 200
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def setup_django(db_path):
+    import django
+    from django.conf import settings
+    settings.configure(
+        DEBUG=False,
+        SECRET_KEY='bench-only-signing-key-' + 'x' * 32,
+        USE_TZ=True,
+        DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': db_path}},
+        INSTALLED_APPS=['django.contrib.auth', 'django.contrib.contenttypes', 'rest_framework',
+                        'mindfulai_backend.users', 'mindfulai_backend.analytics'],
+        AUTH_USER_MODEL='users.User',
+        CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+                'dummy': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}},
+        REST_FRAMEWORK={'DEFAULT_AUTHENTICATION_CLASSES': [
+            'rest_framework_simplejwt.authentication.JWTAuthentication']},
+        DEFAULT_AUTO_FIELD='django.db.models.BigAutoField',
+    )
+    django.setup()
+    from django.core.management import call_command
+    call_command('migrate', verbosity=0)
+
+
+def seed(users, messages):
+    from mindfulai_backend.analytics.models import Conversation, Message
+    from mindfulai_backend.users.models import User
+    people = []
+    for u in range(users):
+        user = User.objects.create_user(username=f'user{u}', email=f'user{u}@naina.local', password='x')
+        conversation = Conversation.objects.create(user=user)
+        Message.objects.bulk_create(Message(conversation=conversation, user=user, content=f'message {i}',
+                                            role='user', emotion=('sad', 'calm', 'anxious')[i % 3],
+                                            response_time=1.0 + i % 5) for i in range(messages))
+        people.append(user)
+    return people
+
+
+def user_stats(user):
+    from django.db.models import Avg, Count
+    from mindfulai_backend.analytics.models import Message
+    messages = Message.objects.filter(user=user)
+    totals = messages.aggregate(total=Count('id'), conversations=Count('conversation', distinct=True),
+                                avg_response=Avg('response_time'))
+    emotions = dict(messages.values_list('emotion').annotate(n=Count('id')))
+    return {'total_messages': totals['total'], 'total_conversations': totals['conversations'],
+            'avg_response_time': totals['avg_response'], 'emotions': emotions}
+
+
+def percentile(samples, q):
+    return statistics.quantiles(samples, n=100)[q - 1] * 1e3
+
+
+def load(name, cache, people, tokens, threads, requests, write_every):
+    from rest_framework.test import APIRequestFactory
+    from mindfulai_backend.users import views
+
+    views.user_cache = cache
+    factory = APIRequestFactory()
+    latencies = []
+    lock = threading.Lock()
+
+    def one(i):
+        user = people[(i * 7919) % len(people)]
+        started = time.perf_counter()
+        request = factory.get('/api/users/me/', HTTP_AUTHORIZATION=f'Bearer {tokens[user.pk]}')
+        response = views.get_current_user(request)
+        assert response.status_code == 200, response.data
+        cache.get(user.pk, 'stats', lambda: user_stats(user))
+        elapsed = time.perf_counter() - started
+        if write_every and i % write_every == 0:
+            cache.bump(user.pk)  # what saving the User row does
+        with lock:
+            latencies.append(elapsed)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(one, range(requests)))
+    wall = time.perf_counter() - started
+    print(f"{name:>22} {requests / wall:>8.0f} req/s  p50 {percentile(latencies, 50):>6.2f} ms"
+          f"  p99 {percentile(latencies, 99):>6.2f} ms  recomputes {cache.stats['recomputes']}")
+
+
+def stampede(name, cache, user, threads):
+    from django.db import connection
+    barrier = threading.Barrier(threads)
+
+    def one(_):
+        barrier.wait()
+        try:
+            return cache.get(user.pk, 'stats', lambda: (time.sleep(0.05), user_stats(user))[1])
+        finally:
+            connection.close()
+
+    cache.bump(user.pk)
+    before = cache.stats['recomputes']
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(one, range(threads)))
+    print(f"{name:>22} {threads} concurrent misses -> {cache.stats['recomputes'] - before} recomputes")
+
+
+def naive_stampede(cache, user, threads):
+    """get / compute / set with no single-flight: every waiting request recomputes"""
+    from django.db import connection
+    barrier = threading.Barrier(threads)
+    computed = []
+
+    def one(_):
+        barrier.wait()
+        try:
+            key = f'naive:{user.pk}:stats'
+            if cache.get(key) is None:
+                computed.append(1)
+                time.sleep(0.05)
+                cache.set(key, user_stats(user))
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(one, range(threads)))
+    print(f"{'get/compute/set':>22} {threads} concurrent misses -> {len(computed)} recomputes")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--messages', type=int, default=100, help='messages per user')
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=3000)
+    parser.add_argument('--write-every', type=int, default=50)
+    args = parser.parse_args()
+
+    os.chdir(tempfile.mkdtemp())
+    setup_django(os.path.abspath('bench.sqlite3'))
+    from django.core.cache import caches
+    from rest_framework_simplejwt.tokens import AccessToken
+    from mindfulai_backend.core.user_cache import UserCache
+
+    people = seed(args.users, args.messages)
+    tokens = {user.pk: str(AccessToken.for_user(user)) for user in people}
+
+    print("=" * 80)
+    print(f"USER CACHE - {args.users} users x {args.messages} messages, {args.threads} threads, "
+          f"/me/ + stats per request")
+    print("=" * 80)
+    load('no cache (DummyCache)', UserCache(caches['dummy']), people, tokens, args.threads, args.requests,
+         args.write_every)
+    cached = UserCache(caches['default'])
+    load('UserCache (locmem)', cached, people, tokens, args.threads, args.requests, args.write_every)
+    print("-" * 80)
+    naive_stampede(caches['default'], people[0], args.threads)
+    stampede('UserCache', cached, people[0], args.threads)
+    print("=" * 80)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,32 @@
 # data/conversational_ai_module.py
 # Conversational AI for NAINA - Week 2
 
+import os
+import sys
+import threading
 import torch
-from transformers import pipeline, AutoTokenizer, AutoModelForCausalLM
+from transformers import pipeline, AutoTokenizer
 import pandas as pd
+from collections import OrderedDict
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from mindfulai_backend.chatbot.ai_engine.batching import MicroBatcher
+from mindfulai_backend.chatbot.ai_engine.generation_cache import IncrementalGenerator, SessionKVCache
+from mindfulai_backend.chatbot.ai_engine.model_loader import load_model
+from mindfulai_backend.core.records import Exchange
+
+# Micro-batching: concurrent requests wait up to MAX_WAIT_MS to share one forward pass
+MAX_BATCH_SIZE = int(os.getenv('NAINA_MAX_BATCH_SIZE', 16))
+MAX_WAIT_MS = float(os.getenv('NAINA_MAX_WAIT_MS', 10))
+MAX_NEW_TOKENS = 60
+
+# Per-session KV cache for multi-turn chats (total bytes across all sessions)
+KV_CACHE_MAX_BYTES = int(os.getenv('NAINA_KV_CACHE_MB', 256)) * 1024 * 1024
+# Sessions whose memory and generation state are kept, least recently used dropped first
+MAX_SESSIONS = int(os.getenv('NAINA_MAX_SESSIONS', 10000))
+CHAT_PREAMBLE = "NAINA is a warm, empathetic mental wellness companion who listens and asks gentle follow-up questions.\n"
+
 print("="*80)
 print("🧠 NAINA CONVERSATIONAL AI MODULE - WEEK 2")
 print("="*80)
@@ -14,17 +35,21 @@ print("="*80)
 print("\n📥 Loading pre-trained conversational model...")
 
 try:
-    # Using DistilGPT-2 for faster, lighter responses
-    model_name = "distilgpt2"
+    # Using DistilGPT-2 for faster, lighter responses (or the fine-tuned NAINA model)
+    model_name = os.getenv('NAINA_LOCAL_MODEL', "distilgpt2")
     
     tokenizer = AutoTokenizer.from_pretrained(model_name)
-    model = AutoModelForCausalLM.from_pretrained(model_name)
+    # GPT-2 has no pad token; pad on the left so generation continues the prompt
+    tokenizer.pad_token = tokenizer.eos_token
+    tokenizer.padding_side = 'left'
+    # Exported serving artifacts are memory-mapped (NAINA_MODEL_MODE=mmap|int8)
+    model, load_seconds = load_model(model_name)
     
     # Move to GPU if available
     device = "cuda" if torch.cuda.is_available() else "cpu"
     model = model.to(device)
     
-    print(f"✅ Model loaded: {model_name}")
+    print(f"✅ Model loaded: {model_name} ({load_seconds:.2f}s)")
     print(f"✅ Device: {device}")
     
 except Exception as e:
@@ -42,8 +67,57 @@ except Exception as e:
     print(f"⚠️  Emotion classifier failed: {e}")
     emotion_pipe = None
 
-# Conversation memory
-conversation_memory = {}
+
+def _classify_batch(messages):
+    """One padded SST-2 forward pass for every queued message"""
+    return emotion_pipe([m[:512] for m in messages], batch_size=len(messages))
+
+
+def _generate_batch(prompts):
+    """One padded generate() call for every queued prompt"""
+    inputs = tokenizer(prompts, return_tensors='pt', padding=True).to(device)
+    with torch.inference_mode():
+        outputs = model.generate(
+            **inputs,
+            max_new_tokens=MAX_NEW_TOKENS,
+            num_beams=2,
+            no_repeat_ngram_size=2,
+            temperature=0.7,
+            top_p=0.9,
+            pad_token_id=tokenizer.eos_token_id
+        )
+    # Left padding means every prompt ends at the same column
+    prompt_length = inputs['input_ids'].shape[1]
+    return [tokenizer.decode(out[prompt_length:], skip_special_tokens=True) for out in outputs]
+
+
+emotion_batcher = MicroBatcher(_classify_batch, MAX_BATCH_SIZE, MAX_WAIT_MS, name='emotion') if emotion_pipe else None
+generate_batcher = MicroBatcher(_generate_batch, MAX_BATCH_SIZE, MAX_WAIT_MS, name='generate')
+
+try:
+    chat_generator = IncrementalGenerator(
+        model, tokenizer, SessionKVCache(KV_CACHE_MAX_BYTES),
+        preamble=CHAT_PREAMBLE, max_new_tokens=MAX_NEW_TOKENS, max_sessions=MAX_SESSIONS
+    )
+except Exception as e:
+    print(f"⚠️  Incremental chat generation unavailable: {e}")
+    chat_generator = None
+
+# Conversation memory, one entry per session (LRU-bounded by MAX_SESSIONS)
+conversation_memory = OrderedDict()
+_memory_lock = threading.Lock()
+
+
+def _remember(user_id: str, exchange):
+    """Record an exchange; sessions pushed out of the store are ended everywhere"""
+    with _memory_lock:
+        conversation_memory.setdefault(user_id, []).append(exchange)
+        conversation_memory.move_to_end(user_id)
+        evicted = []
+        while len(conversation_memory) > MAX_SESSIONS:
+            evicted.append(conversation_memory.popitem(last=False)[0])
+    for old in evicted:
+        end_session(old)
 
 def generate_response(user_message: str, user_id: str = "default") -> dict:
     """
@@ -66,8 +140,8 @@ def generate_response(user_message: str, user_id: str = "default") -> dict:
         emotion = "neutral"
         confidence = 0.5
         
-        if emotion_pipe:
-            result = emotion_pipe(user_message[:512])[0]
+        if emotion_batcher:
+            result = emotion_batcher.run(user_message)
             emotion = result['label']
             confidence = result['score']
         
@@ -81,30 +155,11 @@ def generate_response(user_message: str, user_id: str = "default") -> dict:
         
         prompt = prompts.get(emotion, f"User: {user_message}\nAssistant: ")
         
-        # Generate response
-        inputs = tokenizer.encode(prompt, return_tensors='pt').to(device)
-        
-        outputs = model.generate(
-            inputs,
-            max_length=100,
-            num_beams=2,
-            no_repeat_ngram_size=2,
-            temperature=0.7,
-            top_p=0.9
-        )
-        
-        response_text = tokenizer.decode(outputs[0], skip_special_tokens=True)
-        response = response_text.replace(prompt, '').strip()
+        # Generate response (batched with any concurrent requests)
+        response = generate_batcher.run(prompt).strip()
         
         # Store in memory
-        if user_id not in conversation_memory:
-            conversation_memory[user_id] = []
-        
-        conversation_memory[user_id].append({
-            'user': user_message,
-            'assistant': response,
-            'emotion': emotion
-        })
+        _remember(user_id, Exchange.create(user_message, response, emotion))
         
         return {
             'response': response if response else "I'm here to listen. Tell me more.",
@@ -120,9 +175,35 @@ def generate_response(user_message: str, user_id: str = "default") -> dict:
             'confidence': 0.5
         }
 
+def generate_conversation_reply(user_message: str, user_id: str = "default") -> str:
+    """Multi-turn reply that only encodes the new turn (cached conversation prefix)"""
+    if chat_generator is None:
+        return generate_response(user_message, user_id)['response']
+    
+    try:
+        response = chat_generator.generate(user_id, user_message)
+    except Exception as e:
+        print(f"Error generating reply: {e}")
+        chat_generator.end_session(user_id)
+        response = ""
+    
+    _remember(user_id, Exchange.create(user_message, response))
+    return response if response else "I'm here to listen. Tell me more."
+
+
+def end_session(user_id: str):
+    """Drop a user's session memory and its cached generation state"""
+    with _memory_lock:
+        conversation_memory.pop(user_id, None)
+    if chat_generator is not None:
+        chat_generator.end_session(user_id)
+
+
 def get_conversation_history(user_id: str = "default") -> list:
     """Get conversation history for a user"""
-    return conversation_memory.get(user_id, [])
+    with _memory_lock:
+        exchanges = list(conversation_memory.get(user_id, []))
+    return [exchange.to_dict() for exchange in exchanges]
 
 # Test
 if __name__ == "__main__":
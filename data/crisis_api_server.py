@@ -1,23 +1,35 @@
 ﻿# data/crisis_api_server.py - OPTIMIZED FOR SPEED & CONVERSATION
-import json
 import sys
 import os
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
 from pathlib import Path
 import time
-from urllib.parse import urlparse
-import threading
+from urllib.parse import parse_qs, urlparse
 
 # Get API key from environment
 BYTEZ_API_KEY = os.getenv('BYTEZ_API_KEY', '05bb0c56a16725d749100641b2dceaf2')
 print(f"🔑 API Key loaded: {BYTEZ_API_KEY[:15]}...")
 
+# Recorded with every saved message so analytics can group replies by what produced them
+LLM_MODEL_ID = "Qwen/Qwen2.5-3B-Instruct"
+FALLBACK_TEMPLATES = 'fallback-templates'
+CRISIS_TEMPLATES = 'crisis-templates'
+
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 try:
     from bytez import Bytez
     from mindfulai_backend.chatbot.ai_engine.crisis_detector import CrisisDetector, get_crisis_response
-    from mindfulai_backend.chatbot.ai_engine.emotion_classifier import EmotionClassifier
+    from mindfulai_backend.chatbot.ai_engine.emotion_classifier import get_emotion_engine
+    from mindfulai_backend.chatbot.ai_engine.fallback_engine import conversational_engine
+    from mindfulai_backend.chatbot.ai_engine.hedged_llm import HedgedResponder
+    from mindfulai_backend.chatbot.ai_engine.prompt_builder import prompt_builder
+    from mindfulai_backend.chatbot.ai_engine.rate_limiter import FairScheduler, get_rate_limiter
+    from mindfulai_backend.chatbot.ai_engine.priority_lanes import PriorityLanes, lane_for, CRISIS_LANE
+    from mindfulai_backend.core.json_http import BadBody, JSONRequestHandler
+    from mindfulai_backend.core.read_cache import cache_metrics
+    from mindfulai_backend.core.records import assistant_turn, user_turn
+    from mindfulai_backend.core.serialization import ChatRequest, decode
     from mindfulai_backend.analytics.conversation_db import ConversationDatabase
     from mindfulai_backend.analytics.models import UserProfile
     from mindfulai_backend.analytics.nlp_engine import AdvancedNLPEngine
@@ -29,37 +41,62 @@ except Exception as e:
 
 try:
     sdk = Bytez(BYTEZ_API_KEY)
-    model = sdk.model("Qwen/Qwen2.5-3B-Instruct")
+    model = sdk.model(LLM_MODEL_ID)
     print("✅ Bytez SDK initialized")
 except Exception as e:
     print(f"⚠️ Bytez initialization failed: {e}")
     model = None
 
+rate_limiter = get_rate_limiter()
+request_lanes = PriorityLanes()
+CRISIS_DEADLINE = float(os.getenv('NAINA_CRISIS_DEADLINE_MS', 500)) / 1000
+llm_scheduler = FairScheduler()
+llm_responder = HedgedResponder(model.run, scheduler=llm_scheduler) if model is not None else None
+
 detector = CrisisDetector()
-emotion_classifier = EmotionClassifier()
+emotion_classifier = get_emotion_engine()
 user_conversations = {}
 
 print("="*80)
 print("NAINA v6.0 - OPTIMIZED (FAST & CONVERSATIONAL)")
 print("="*80)
-print("✅ Crisis Detection: ACTIVE")
-print("✅ Emotion Analysis: ACTIVE")
+print(f"✅ Crisis Detection: ACTIVE ({request_lanes.lanes[CRISIS_LANE].workers} reserved workers, {CRISIS_DEADLINE * 1000:.0f}ms deadline)")
+print(f"✅ Emotion Analysis: ACTIVE ({emotion_classifier.name} engine)")
 print("✅ Conversational Mode: ACTIVE")
-print("✅ Response Time: OPTIMIZED (30s timeout)")
+print(f"✅ Rate Limit: {rate_limiter.rate * 60:.0f}/min per user, {rate_limiter.ip_rate * 60:.0f}/min per IP ({llm_scheduler.slots} fair LLM slots)")
+if llm_responder:
+    print(f"✅ Response Time: HEDGED ({llm_responder.soft_deadline:.0f}s soft / {llm_responder.hard_deadline:.0f}s hard, mode={llm_responder.mode})")
 print("="*80 + "\n")
 
 
-class NAINAHandler(BaseHTTPRequestHandler):
+def crisis_payload(crisis_response: str) -> dict:
+    return {
+        'response': crisis_response,
+        'type': 'crisis',
+        'emotion': 'crisis',
+        'confidence': 1.0
+    }
+
+
+class NAINAHandler(JSONRequestHandler):
     
     def do_POST(self):
         try:
+            # Always drain the body so the next request on this connection parses cleanly
+            try:
+                body = self.read_body()
+            except BadBody as e:
+                self.send_json_response({'error': str(e)}, e.status, headers={'Connection': 'close'})
+                return
             if self.path == '/api/chat/chat/':
-                content_length = int(self.headers.get('Content-Length', 0))
-                body = self.rfile.read(content_length)
-                data = json.loads(body)
+                try:
+                    request = decode(body, ChatRequest)
+                except ValueError as e:
+                    self.send_json_response({'error': f'Invalid request: {e}'}, 400)
+                    return
                 
-                user_message = data.get('message', '').strip()
-                user_id = data.get('user_id', 'default')
+                user_message = request.message.strip()
+                user_id = request.user_id
                 
                 if not user_message:
                     self.send_json_response({'error': 'Empty message'}, 400)
@@ -67,102 +104,39 @@ class NAINAHandler(BaseHTTPRequestHandler):
                 
                 print(f"\n[USER] {user_message}")
                 
-                # Create user profile
-                UserProfile.create_user(user_id, f"User_{user_id[-6:]}")
-                
-                # Initialize conversation history
-                if user_id not in user_conversations:
-                    user_conversations[user_id] = {
-                        'messages': [],
-                        'crisis_count': 0,
-                        'negative_count': 0
-                    }
-                
-                user_conversations[user_id]['messages'].append({
-                    'role': 'user',
-                    'content': user_message
-                })
-                
-                start_time = time.time()
-                
-                # Crisis detection
+                # Crisis tier is decided before any queueing: crisis messages are never
+                # rate limited and run on their own reserved lane
                 crisis_result = detector.detect(user_message)
+                lane = lane_for(crisis_result)
                 
-                # IMPROVED: Only respond with crisis help if TRULY severe
-                if crisis_result['is_crisis'] and crisis_result['severity'] in ['HIGH', 'CRITICAL']:
-                    print(f"[CRITICAL CRISIS] {crisis_result['severity']}")
-                    user_conversations[user_id]['crisis_count'] += 1
-                    
-                    # Only suggest professional help after repeated crises
-                    if user_conversations[user_id]['crisis_count'] >= 3:
-                        crisis_response = get_crisis_response(crisis_result['severity'])
-                    else:
-                        # First crisis responses - be supportive, not dismissive
-                        crisis_response = self.get_supportive_crisis_response(user_message)
-                    
-                    response_time = time.time() - start_time
-                    
-                    ContextMemory.store_context(user_id, 'crisis', 'crisis', ['emergency'], 'crisis')
-                    ConversationDatabase.save_message(
-                        user_id, user_message, crisis_response, 
-                        'crisis', response_time, is_crisis=True
+                if lane == CRISIS_LANE:
+                    started = time.time()
+                    # Guaranteed tail latency: past the deadline the static crisis reply needs no work
+                    payload, on_time = request_lanes.run(
+                        CRISIS_LANE, self.crisis_reply, user_id, user_message, crisis_result,
+                        timeout=CRISIS_DEADLINE,
+                        fallback=lambda: crisis_payload(get_crisis_response(crisis_result['severity']))
                     )
-                    
-                    user_conversations[user_id]['messages'].append({
-                        'role': 'assistant',
-                        'content': crisis_response
-                    })
-                    
-                    self.send_json_response({
-                        'response': crisis_response,
-                        'type': 'crisis',
-                        'emotion': 'crisis',
-                        'confidence': 1.0
-                    }, 200)
+                    self.send_json_response(payload, 200)
+                    if not on_time:
+                        # The worker gave up this turn, so record the reply that was actually sent
+                        print(f"[CRISIS LANE] Deadline {CRISIS_DEADLINE:.2f}s passed, sent static reply")
+                        self.record_crisis_turn(user_id, user_message, crisis_result, payload, started)
                     return
                 
-                # Emotion analysis
-                emotion_result = emotion_classifier.classify(user_message)
-                emotion, intensity, confidence = AdvancedNLPEngine.analyze_emotion_intensity(user_message)
-                print(f"[EMOTION] {emotion} (intensity: {intensity:.2f})")
-                
-                # Track negative emotions
-                if emotion in ['sad', 'anxious', 'stressed', 'angry']:
-                    user_conversations[user_id]['negative_count'] += 1
-                else:
-                    user_conversations[user_id]['negative_count'] = max(0, user_conversations[user_id]['negative_count'] - 1)
-                
-                # Intent & theme
-                intent, intent_confidence, intent_keywords = AdvancedNLPEngine.detect_intent(user_message)
-                theme, theme_confidence, theme_keywords = AdvancedNLPEngine.extract_conversation_theme(user_message)
-                
-                # OPTIMIZED: Fast response with 30s timeout
-                ai_response = self.generate_fast_response(user_id, emotion, intensity)
-                response_time = time.time() - start_time
-                print(f"[RESPONSE TIME] {response_time:.2f}s")
-                
-                user_conversations[user_id]['messages'].append({
-                    'role': 'assistant',
-                    'content': ai_response
-                })
-                
-                # Store context
-                all_keywords = theme_keywords + intent_keywords
-                ContextMemory.store_context(user_id, theme, intent, all_keywords, emotion)
-                ConversationDatabase.save_message(
-                    user_id, user_message, ai_response,
-                    emotion, response_time, is_crisis=False
-                )
+                client_ip = self.remote_ip()
+                retry_after = rate_limiter.check(user_id, client_ip)
+                if retry_after:
+                    print(f"[RATE LIMIT] {user_id} ({client_ip or 'proxied'}), retry in {retry_after:.1f}s")
+                    self.send_json_response({
+                        'error': 'Too many messages, please slow down',
+                        'retry_after': round(retry_after, 1)
+                    }, 429, headers={'Retry-After': str(max(1, round(retry_after)))})
+                    return
                 
-                self.send_json_response({
-                    'response': ai_response,
-                    'type': 'conversation',
-                    'emotion': emotion,
-                    'intensity': intensity,
-                    'intent': intent,
-                    'theme': theme,
-                    'confidence': confidence
-                }, 200)
+                # Normal chat runs on this request thread; the FairScheduler orders it at the LLM slots
+                payload = self.conversation_reply(user_id, user_message)
+                self.send_json_response(payload, 200)
             
             else:
                 self.send_json_response({'error': 'Not found'}, 404)
@@ -173,6 +147,104 @@ class NAINAHandler(BaseHTTPRequestHandler):
             traceback.print_exc()
             self.send_json_response({'error': str(e)}, 500)
     
+    def start_turn(self, user_id: str, user_message: str) -> dict:
+        """Create the profile and conversation for a user and record their message"""
+        UserProfile.create_user(user_id, f"User_{user_id[-6:]}")
+        
+        # Initialize conversation history (setdefault: requests run on parallel threads)
+        conversation = user_conversations.setdefault(user_id, {
+            'messages': [],
+            'crisis_count': 0,
+            'negative_count': 0
+        })
+        conversation['messages'].append(user_turn(user_message))
+        return conversation
+    
+    def crisis_reply(self, outcome, user_id: str, user_message: str, crisis_result: dict) -> dict:
+        """Crisis-lane work: supportive reply first, hotlines after repeated crises"""
+        start_time = time.time()
+        conversation = user_conversations.get(user_id)
+        crisis_count = (conversation['crisis_count'] if conversation else 0) + 1
+        
+        # Only suggest professional help after repeated crises
+        if crisis_count >= 3:
+            crisis_response = get_crisis_response(crisis_result['severity'])
+        else:
+            # First crisis responses - be supportive, not dismissive
+            crisis_response = self.get_supportive_crisis_response(user_message)
+        
+        payload = crisis_payload(crisis_response)
+        if not outcome.settle(payload):
+            # Deadline passed: the handler sent and records the static reply instead
+            return outcome.value
+        return self.record_crisis_turn(user_id, user_message, crisis_result, payload, start_time)
+    
+    def record_crisis_turn(self, user_id: str, user_message: str, crisis_result: dict,
+                           payload: dict, start_time: float) -> dict:
+        """Record a crisis turn with the reply the user was sent"""
+        conversation = self.start_turn(user_id, user_message)
+        
+        print(f"[CRITICAL CRISIS] {crisis_result['severity']}")
+        conversation['crisis_count'] += 1
+        crisis_response = payload['response']
+        response_time = time.time() - start_time
+        
+        ContextMemory.store_context(user_id, 'crisis', 'crisis', ['emergency'], 'crisis')
+        ConversationDatabase.save_message(
+            user_id, user_message, crisis_response, 
+            'crisis', response_time, is_crisis=True,
+            model=CRISIS_TEMPLATES, theme='crisis'
+        )
+        
+        conversation['messages'].append(assistant_turn(crisis_response))
+        return payload
+    
+    def conversation_reply(self, user_id: str, user_message: str) -> dict:
+        """Normal-lane work: emotion, intent and theme analysis plus the hedged LLM reply"""
+        start_time = time.time()
+        conversation = self.start_turn(user_id, user_message)
+        
+        # Emotion analysis
+        emotion_result = emotion_classifier.classify(user_message)
+        emotion, intensity, confidence = AdvancedNLPEngine.analyze_emotion_intensity(user_message)
+        print(f"[EMOTION] {emotion} (intensity: {intensity:.2f})")
+        
+        # Track negative emotions
+        if emotion in ['sad', 'anxious', 'stressed', 'angry']:
+            conversation['negative_count'] += 1
+        else:
+            conversation['negative_count'] = max(0, conversation['negative_count'] - 1)
+        
+        # Intent & theme
+        intent, intent_confidence, intent_keywords = AdvancedNLPEngine.detect_intent(user_message)
+        theme, theme_confidence, theme_keywords = AdvancedNLPEngine.extract_conversation_theme(user_message)
+        
+        # OPTIMIZED: Hedged response, fallback at the hard deadline
+        ai_response, path = self.generate_fast_response(user_id, emotion, intensity)
+        response_time = time.time() - start_time
+        print(f"[RESPONSE TIME] {response_time:.2f}s")
+        
+        conversation['messages'].append(assistant_turn(ai_response))
+        
+        # Store context
+        all_keywords = theme_keywords + intent_keywords
+        ContextMemory.store_context(user_id, theme, intent, all_keywords, emotion)
+        ConversationDatabase.save_message(
+            user_id, user_message, ai_response,
+            emotion, response_time, is_crisis=False,
+            model=FALLBACK_TEMPLATES if path == 'fallback' else LLM_MODEL_ID, theme=theme
+        )
+        
+        return {
+            'response': ai_response,
+            'type': 'conversation',
+            'emotion': emotion,
+            'intensity': intensity,
+            'intent': intent,
+            'theme': theme,
+            'confidence': confidence
+        }
+    
     def do_GET(self):
         if self.path == '/':
             self.send_json_response({
@@ -186,28 +258,28 @@ class NAINAHandler(BaseHTTPRequestHandler):
             self.send_json_response({
                 'status': 'healthy',
                 'version': 'v6.0',
-                'model': 'Qwen2.5-3B-Instruct',
+                'model': LLM_MODEL_ID.split('/')[-1],
                 'provider': 'Bytez.com',
-                'timeout': '30s',
+                'soft_deadline': f"{llm_responder.soft_deadline}s" if llm_responder else None,
+                'hard_deadline': f"{llm_responder.hard_deadline}s" if llm_responder else None,
+                'response_paths': llm_responder.metrics.snapshot() if llm_responder else None,
+                'rate_limit': rate_limiter.stats,
+                'llm_slots': llm_scheduler.snapshot(),
+                'lanes': request_lanes.snapshot(),
+                'read_cache': cache_metrics(),
                 'mode': 'conversational',
+                'emotion_engine': emotion_classifier.name,
                 'active_conversations': len(user_conversations)
             }, 200)
         
         elif self.path.startswith('/api/analytics/'):
             from mindfulai_backend.analytics.views import handle_analytics_api
-            query_params = {}
-            query_string = urlparse(self.path).query
-            if query_string:
-                for param in query_string.split('&'):
-                    if '=' in param:
-                        k, v = param.split('=', 1)
-                        query_params[k] = [v]
-            response_data, status_code = handle_analytics_api(self.path, query_params)
+            url = urlparse(self.path)
+            response_data, status_code = handle_analytics_api(url.path, parse_qs(url.query))
             self.send_json_response(response_data, status_code)
         
         else:
-            self.send_response(404)
-            self.end_headers()
+            self.send_json_response({'error': 'Not found'}, 404)
     
     def get_supportive_crisis_response(self, message):
         """Supportive response for crisis situations - conversational first"""
@@ -229,157 +301,48 @@ class NAINAHandler(BaseHTTPRequestHandler):
         else:
             return responses['default']
     
-    def generate_fast_response(self, user_id: str, emotion: str, intensity: float) -> str:
-        """OPTIMIZED: Fast response with 30s timeout"""
-        
-        # Build conversational context
-        messages = [
-            {
-                "role": "system",
-                "content": """You are NAINA, a warm and empathetic mental health AI companion. 
-
-YOUR PERSONALITY:
-- Be conversational, not clinical
-- Use active listening techniques
-- Ask follow-up questions
-- Validate emotions before suggesting solutions
-- Be present and engaged, not detached
+    def generate_fast_response(self, user_id: str, emotion: str, intensity: float) -> tuple:
+        """OPTIMIZED: Hedged response (soft deadline + hedge, hard deadline -> fallback)
 
-CONVERSATION RULES:
-1. ALWAYS respond conversationally first
-2. Ask about their feelings/thoughts
-3. Only suggest professional help if they're in real danger (suicidal)
-4. For sadness, stress, anxiety → listen, validate, help them process
-5. Keep responses under 100 words
-6. Use empathetic phrases: "I hear you", "That sounds tough", "Tell me more"
-
-DO NOT:
-- Jump to "talk to a friend" immediately
-- Give generic advice without understanding context
-- Be dismissive of their feelings
-- Suggest professional help unless truly critical
-
-REMEMBER: You're a supportive listener first, advisor second."""
-            }
-        ]
-        
-        # Add recent conversation history (last 6 messages for speed)
-        messages.extend(user_conversations[user_id]['messages'][-6:])
-        
-        # Try AI response with SHORT timeout
-        if model is not None:
-            try:
-                result_container = {'output': None, 'error': None}
-                
-                def call_bytez():
-                    try:
-                        result = model.run(messages)
-                        result_container['output'] = result
-                    except Exception as e:
-                        result_container['error'] = str(e)
-                
-                thread = threading.Thread(target=call_bytez)
-                thread.daemon = True
-                thread.start()
-                thread.join(timeout=30.0)  # REDUCED from 120s to 30s
-                
-                if thread.is_alive():
-                    print("[TIMEOUT] Switching to fast fallback")
-                    return self.fast_fallback_response(user_conversations[user_id]['messages'][-1]['content'], emotion, intensity)
-                
-                if result_container['error']:
-                    return self.fast_fallback_response(user_conversations[user_id]['messages'][-1]['content'], emotion, intensity)
-                
-                result = result_container['output']
-                
-                if result and hasattr(result, 'output') and result.output:
-                    if isinstance(result.output, str):
-                        response = result.output.strip()
-                        # Ensure response is conversational and not too long
-                        if len(response) > 500:
-                            response = response[:497] + "..."
-                        return response
-                    elif isinstance(result.output, dict) and 'content' in result.output:
-                        return result.output['content'].strip()
-                
-                return self.fast_fallback_response(user_conversations[user_id]['messages'][-1]['content'], emotion, intensity)
-            
-            except Exception as e:
-                print(f"[ERROR] {e}")
-                return self.fast_fallback_response(user_conversations[user_id]['messages'][-1]['content'], emotion, intensity)
-        else:
-            return self.fast_fallback_response(user_conversations[user_id]['messages'][-1]['content'], emotion, intensity)
-    
-    def fast_fallback_response(self, message: str, emotion: str, intensity: float) -> str:
-        """Fast, intelligent fallback responses - CONVERSATIONAL"""
+        Returns (response, path) where path is 'primary', 'hedge' or 'fallback'.
+        """
         
-        message_lower = message.lower()
+        # Build conversational context
+        # Bounded prompt: cached persona prefix + summary of older turns + newest turns that fit
+        messages, prompt_info = prompt_builder.build('naina_server', user_conversations[user_id]['messages'], user_id)
+        print(f"[PROMPT] {prompt_info['prompt_tokens']} tokens (prefix {prompt_info['prefix_hash']})")
         
-        # Emotion-specific conversational responses
-        responses = {
-            'sad': [
-                "I can hear the sadness in what you're saying. What's been weighing on you?",
-                "That sounds really tough. How long have you been feeling this way?",
-                "I'm here with you. Tell me more about what's making you feel sad."
-            ],
-            'anxious': [
-                "Anxiety can feel so overwhelming. What's triggering these feelings right now?",
-                "I understand how unsettling anxiety can be. What's been on your mind?",
-                "Let's work through this together. What specifically is making you anxious?"
-            ],
-            'stressed': [
-                "Stress can be exhausting. What's causing the most pressure right now?",
-                "I hear you. What's been the biggest source of stress lately?",
-                "That sounds like a lot to handle. Want to talk about what's stressing you most?"
-            ],
-            'angry': [
-                "It's okay to feel angry. What happened that's making you feel this way?",
-                "Anger is a valid emotion. Tell me what's frustrating you.",
-                "I can sense your frustration. What's been building up?"
-            ],
-            'neutral': [
-                "I'm listening. Tell me more about what's on your mind.",
-                "How have things been going for you lately?",
-                "What would you like to talk about today?"
-            ],
-            'happy': [
-                "It's wonderful to hear some positivity! What's been going well?",
-                "I'm glad things are looking up. Tell me more!",
-                "That's great to hear. What's been making you feel good?"
-            ]
-        }
+        # Hedged LLM call: a slow reply gets a second request; the fallback is built only if used
+        last_message = user_conversations[user_id]['messages'][-1]['content']
+        fallback = lambda: self.fast_fallback_response(last_message, emotion, intensity, user_id)
         
-        # Get responses for current emotion
-        emotion_responses = responses.get(emotion, responses['neutral'])
+        if llm_responder is None:
+            return fallback(), 'fallback'
         
-        # Rotate through responses for variety
-        import random
-        return random.choice(emotion_responses)
-    
-    def send_json_response(self, data, status_code):
-        self.send_response(status_code)
-        self.send_header('Content-Type', 'application/json')
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'POST, GET, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
-        self.end_headers()
-        self.wfile.write(json.dumps(data).encode())
+        response, path = llm_responder.respond(messages, fallback, client=user_id)
+        print(f"[RESPONSE PATH] {path}")
+        return response, path
     
-    def do_OPTIONS(self):
-        self.send_response(200)
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'POST, GET, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
-        self.end_headers()
-    
-    def log_message(self, format, *args):
-        pass
+    def fast_fallback_response(self, message: str, emotion: str, intensity: float, user_id: str = 'default') -> str:
+        """Fast, intelligent fallback responses - CONVERSATIONAL
+        
+        Templates are precomputed in fallback_engine and rotate per user,
+        so nothing is rebuilt here and the user never gets the same line twice in a row.
+        """
+        return conversational_engine.respond(message, emotion, user_id)
 
 
 if __name__ == '__main__':
     port = int(os.getenv('PORT', 8000))
-    server = HTTPServer(('0.0.0.0', port), NAINAHandler)
+    server = ThreadingHTTPServer(('0.0.0.0', port), NAINAHandler)
     print(f"🚀 NAINA v6.0 Server running on port {port}")
-    print("⚡ Optimized for speed (30s timeout)")
+    print("⚡ Optimized for speed (hedged LLM requests, threaded, fair LLM slots, HTTP/1.1 keep-alive)")
     print("💬 Conversational mode enabled")
-    server.serve_forever()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # Fold context logs into snapshots so the next start replays nothing
+        ContextMemory.flush_all()
+        server.server_close()
@@ -0,0 +1,107 @@
+# analytics/admin_views.py
+# Admin-only analytics: cross-user aggregates and per-user conversation search
+# Author: VINAYAK TIWARI | ARQONX-AI TECHNOLOGY
+
+import threading
+
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework import status
+
+from mindfulai_backend.core.read_cache import cache_metrics
+from .conversation_db import ConversationDatabase
+from .query_params import QueryError, parse_timestamp
+
+_query_engine = None
+_query_engine_lock = threading.Lock()
+
+
+def _engine():
+    """The shared QueryEngine, built on first use: it needs numpy, the other routes don't"""
+    global _query_engine
+    with _query_engine_lock:
+        if _query_engine is None:
+            from .query_engine import QueryEngine
+            _query_engine = QueryEngine()
+    return _query_engine
+
+
+def _csv(value):
+    return tuple(part.strip() for part in value.split(',') if part.strip()) if value else ()
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def aggregate_query(request):
+    """
+    Aggregate metrics across all users
+    GET /api/analytics/query/?metrics=count,crisis_rate&group_by=model&bucket=hour
+        &start=2025-11-01&end=2025-11-08&emotion=sad,anxious&crisis=true&order_by=count&limit=10
+    """
+    from .query_engine import DIMENSIONS
+
+    query_engine = _engine()
+    params = request.query_params
+    try:
+        filters = {dim: _csv(params[dim]) for dim in DIMENSIONS if params.get(dim)}
+        if params.get('crisis'):
+            filters['crisis'] = params['crisis'].lower() in ('1', 'true', 'yes')
+        limit = params.get('limit')
+        result = query_engine.query(
+            metrics=_csv(params.get('metrics')) or ('count',),
+            group_by=_csv(params.get('group_by')),
+            bucket=params.get('bucket') or None,
+            filters=filters,
+            start=parse_timestamp(params.get('start')),
+            end=parse_timestamp(params.get('end')),
+            order_by=params.get('order_by') or None,
+            limit=int(limit) if limit else None,
+        )
+    except (QueryError, ValueError) as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    result['stats']['engine'] = query_engine.metrics.snapshot()
+    return Response(result)
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def archive_status(request):
+    """
+    What the query engine can see
+    GET /api/analytics/archive/
+    """
+    return Response(_engine().snapshot())
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def cache_status(request):
+    """
+    Hit/miss counters of the per-user read caches in this worker
+    GET /api/analytics/cache/
+    """
+    return Response(cache_metrics())
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def search_user_conversations(request):
+    """
+    Full-text search over one user's conversation history
+    GET /api/analytics/search/?user_id=alice&q=my job&start=2025-11-01&limit=20
+    """
+    params = request.query_params
+    if not params.get('user_id'):
+        return Response({'error': 'user_id is required'}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        results = ConversationDatabase.search_conversations(
+            params['user_id'], params.get('q', ''),
+            start=parse_timestamp(params.get('start')),
+            end=parse_timestamp(params.get('end')),
+            limit=int(params.get('limit', 20)),
+        )
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({'user_id': params['user_id'], 'query': params.get('q', ''), 'results': results})
@@ -1,105 +1,264 @@
-import json
+import gzip
+import threading
+import time
+from collections import Counter, OrderedDict, deque
 from datetime import datetime
 from pathlib import Path
-from collections import defaultdict
+
+from mindfulai_backend.core.serialization import dumps, loads, read_json, write_json
+from mindfulai_backend.core.storage import locked
+
+# Tiers, per user:
+#   hot   in-process ring buffer of the last HOT_CONTEXTS entries + maintained counters
+#   warm  data/memory/<user>_context.json  snapshot (counters + hot entries as rows)
+#         data/memory/<user>_context.log   one row appended per entry since the snapshot
+#   cold  data/memory/archive/<user>_context.jsonl.gz  entries that left the ring buffer
+# The hot tier is per process, so reads in one worker don't see entries other
+# workers appended since it last flushed. File updates take the user's storage
+# lock, and a flush first reloads snapshot + log from disk (every process's
+# entries) under that lock, so the files never lose another worker's entries.
+CONTEXT_FIELDS = ('ts', 'theme', 'intent', 'keywords', 'emotion')
+HOT_CONTEXTS = 100
+SUMMARY_WINDOW = 10
+SNAPSHOT_EVERY = 25
+MAX_HOT_USERS = 10000
+
+
+def _context_row(item) -> list:
+    """Stored row from a row or a legacy {'timestamp', 'theme', ...} entry"""
+    if isinstance(item, list):
+        return item
+    return [datetime.fromisoformat(item['timestamp']).timestamp(), item.get('theme'), item.get('intent'),
+            item.get('keywords', []), item.get('emotion')]
+
+
+def _context_dict(row) -> dict:
+    return {'timestamp': datetime.fromtimestamp(row[0]).isoformat(), 'theme': row[1], 'intent': row[2],
+            'keywords': row[3], 'emotion': row[4]}
+
+
+class UserContext:
+    """Hot tier for one user: ring buffer plus counters kept in step with it"""
+
+    __slots__ = ('user_id', 'created_at', 'contexts', 'total', 'theme_history', 'intent_history',
+                 'recent_emotions', 'recent_themes', 'recent_intents', 'pending_cold', 'log_rows', 'lock')
+
+    def __init__(self, user_id, created_at=None):
+        self.user_id = user_id
+        self.created_at = created_at or datetime.now().isoformat()
+        self.contexts = deque(maxlen=HOT_CONTEXTS)
+        self.total = 0
+        self.theme_history = Counter()
+        self.intent_history = Counter()
+        # Counters over the last SUMMARY_WINDOW entries only
+        self.recent_emotions = Counter()
+        self.recent_themes = Counter()
+        self.recent_intents = Counter()
+        self.pending_cold = []
+        self.log_rows = 0
+        self.lock = threading.Lock()
+
+    def _window_add(self, row, amount):
+        for counter, value in ((self.recent_themes, row[1]), (self.recent_intents, row[2]),
+                               (self.recent_emotions, row[4])):
+            counter[value] += amount
+            if counter[value] <= 0:
+                del counter[value]
+
+    def push(self, row, count=True):
+        """Append one entry; `count=False` replays an entry the all-time counters already include"""
+        if len(self.contexts) >= SUMMARY_WINDOW:
+            self._window_add(self.contexts[-SUMMARY_WINDOW], -1)
+        if len(self.contexts) == self.contexts.maxlen:
+            self.pending_cold.append(self.contexts[0])
+        self.contexts.append(row)
+        self._window_add(row, 1)
+        if count:
+            self.total += 1
+            self.theme_history[row[1]] += 1
+            self.intent_history[row[2]] += 1
+
+    def snapshot(self) -> dict:
+        return {
+            'user_id': self.user_id,
+            'created_at': self.created_at,
+            'context_fields': list(CONTEXT_FIELDS),
+            'total_interactions': self.total,
+            'last_ts': self.contexts[-1][0] if self.contexts else 0.0,
+            'contexts': list(self.contexts),
+            'theme_history': dict(self.theme_history),
+            'intent_history': dict(self.intent_history),
+        }
+
 
 class ContextMemory:
     """Maintain conversation context and memory"""
-    
+
     MEMORY_DIR = Path("data/memory")
     MEMORY_DIR.mkdir(exist_ok=True)
-    
+    ARCHIVE_DIR = MEMORY_DIR / "archive"
+
+    _hot = OrderedDict()
+    _hot_lock = threading.Lock()
+
     @staticmethod
-    def store_context(user_id, theme, intent, keywords, emotion):
-        """Store conversation context for future reference"""
+    def _load(user_id) -> UserContext:
+        """Warm tier -> hot: snapshot, then replay the log written after it"""
         memory_file = ContextMemory.MEMORY_DIR / f"{user_id}_context.json"
-        
-        context_entry = {
-            "timestamp": datetime.now().isoformat(),
-            "theme": theme,
-            "intent": intent,
-            "keywords": keywords,
-            "emotion": emotion
-        }
-        
+        log_file = ContextMemory.MEMORY_DIR / f"{user_id}_context.log"
+
+        if not memory_file.exists() and not log_file.exists():
+            return None
+
+        user = UserContext(user_id)
+        last_ts = 0.0
         if memory_file.exists():
-            with open(memory_file, 'r') as f:
-                memory_data = json.load(f)
-        else:
-            memory_data = {
-                "user_id": user_id,
-                "created_at": datetime.now().isoformat(),
-                "contexts": [],
-                "theme_history": defaultdict(int),
-                "intent_history": defaultdict(int)
-            }
-        
-        memory_data['contexts'].append(context_entry)
-        
-        # Keep only last 100 contexts
-        if len(memory_data['contexts']) > 100:
-            memory_data['contexts'] = memory_data['contexts'][-100:]
-        
-        # Update theme and intent history
-        if theme not in memory_data['theme_history']:
-            memory_data['theme_history'][theme] = 0
-        memory_data['theme_history'][theme] += 1
-        
-        if intent not in memory_data['intent_history']:
-            memory_data['intent_history'][intent] = 0
-        memory_data['intent_history'][intent] += 1
-        
-        with open(memory_file, 'w') as f:
-            json.dump(memory_data, f, indent=2)
-        
-        return context_entry
-    
+            data = read_json(memory_file)
+            user.created_at = data.get('created_at', user.created_at)
+            user.theme_history.update(data.get('theme_history', {}))
+            user.intent_history.update(data.get('intent_history', {}))
+            # Legacy files have no total; their all-time counters still know it
+            user.total = data.get('total_interactions', sum(user.theme_history.values()))
+            for item in data.get('contexts', []):
+                user.push(_context_row(item), count=False)
+            user.pending_cold.clear()
+            last_ts = data.get('last_ts', 0.0)
+
+        if log_file.exists():
+            for line in log_file.read_bytes().splitlines():
+                row = loads(line) if line else None
+                # Rows at or before last_ts are already in a snapshot that was written just before a crash
+                if row and row[0] > last_ts:
+                    user.push(row)
+                    user.log_rows += 1
+        return user
+
+    @staticmethod
+    def _user(user_id, create=False) -> UserContext:
+        with ContextMemory._hot_lock:
+            user = ContextMemory._hot.get(user_id)
+            if user is not None:
+                ContextMemory._hot.move_to_end(user_id)
+                return user
+
+        user = ContextMemory._load(user_id)
+        if user is None:
+            if not create:
+                return None
+            user = UserContext(user_id)
+
+        with ContextMemory._hot_lock:
+            # Another thread may have loaded it meanwhile; keep the first
+            user = ContextMemory._hot.setdefault(user_id, user)
+            ContextMemory._hot.move_to_end(user_id)
+            # Everything is on disk (snapshot + log), so evicting loses nothing
+            while len(ContextMemory._hot) > MAX_HOT_USERS:
+                ContextMemory._hot.popitem(last=False)
+        return user
+
+    @staticmethod
+    def _flush(user: UserContext):
+        """Move evicted entries to the cold archive, rewrite the snapshot, reset the log"""
+        memory_file = ContextMemory.MEMORY_DIR / f"{user.user_id}_context.json"
+        with locked(memory_file):
+            # The log may hold other processes' entries this hot tier never saw;
+            # rebuild from disk (ours are there too) so the snapshot has them all
+            merged = ContextMemory._load(user.user_id)
+            if merged is not None:
+                for slot in UserContext.__slots__:
+                    if slot not in ('user_id', 'lock'):
+                        setattr(user, slot, getattr(merged, slot))
+            if user.pending_cold:
+                ContextMemory.ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
+                with gzip.open(ContextMemory.ARCHIVE_DIR / f"{user.user_id}_context.jsonl.gz", 'ab') as f:
+                    f.writelines(dumps(row) + b'\n' for row in user.pending_cold)
+                user.pending_cold.clear()
+
+            write_json(memory_file, user.snapshot())
+            (ContextMemory.MEMORY_DIR / f"{user.user_id}_context.log").unlink(missing_ok=True)
+        user.log_rows = 0
+
+    @staticmethod
+    def store_context(user_id, theme, intent, keywords, emotion):
+        """Store conversation context for future reference"""
+        row = [time.time(), theme, intent, list(keywords), emotion]
+        user = ContextMemory._user(user_id, create=True)
+
+        with user.lock:
+            user.push(row)
+            # One appended line per message; the snapshot is rewritten every SNAPSHOT_EVERY
+            with locked(ContextMemory.MEMORY_DIR / f"{user_id}_context.json"):
+                with open(ContextMemory.MEMORY_DIR / f"{user_id}_context.log", 'ab') as f:
+                    f.write(dumps(row) + b'\n')
+            user.log_rows += 1
+            if user.log_rows >= SNAPSHOT_EVERY:
+                ContextMemory._flush(user)
+
+        return _context_dict(row)
+
+    @staticmethod
+    def flush_all():
+        """Snapshot every hot user (e.g. before shutdown, to keep logs short)"""
+        with ContextMemory._hot_lock:
+            users = list(ContextMemory._hot.values())
+        for user in users:
+            with user.lock:
+                if user.log_rows:
+                    ContextMemory._flush(user)
+
     @staticmethod
     def get_user_context(user_id):
         """Get user's conversation context and memory"""
-        memory_file = ContextMemory.MEMORY_DIR / f"{user_id}_context.json"
-        
-        if not memory_file.exists():
+        user = ContextMemory._user(user_id)
+
+        if not user:
             return None
-        
-        with open(memory_file, 'r') as f:
-            return json.load(f)
-    
+
+        with user.lock:
+            return {
+                "user_id": user.user_id,
+                "created_at": user.created_at,
+                "total_interactions": user.total,
+                "contexts": [_context_dict(row) for row in user.contexts],
+                "theme_history": dict(user.theme_history),
+                "intent_history": dict(user.intent_history)
+            }
+
+    @staticmethod
+    def get_archived_contexts(user_id):
+        """Cold tier: every entry that has left the in-memory window, oldest first"""
+        archive_file = ContextMemory.ARCHIVE_DIR / f"{user_id}_context.jsonl.gz"
+        if not archive_file.exists():
+            return []
+        with gzip.open(archive_file, 'rb') as f:
+            return [_context_dict(loads(line)) for line in f if line.strip()]
+
     @staticmethod
     def get_primary_themes(user_id):
         """Get top themes for user"""
-        context = ContextMemory.get_user_context(user_id)
-        
-        if not context:
+        user = ContextMemory._user(user_id)
+
+        if not user:
             return []
-        
-        themes = sorted(
-            context['theme_history'].items(),
-            key=lambda x: x[1],
-            reverse=True
-        )
-        return [theme[0] for theme in themes[:3]]
-    
+
+        with user.lock:
+            return [theme for theme, _ in user.theme_history.most_common(3)]
+
     @staticmethod
     def get_conversation_summary(user_id):
-        """Generate summary of user's conversation patterns"""
-        context = ContextMemory.get_user_context(user_id)
-        
-        if not context or not context['contexts']:
+        """Summary of user's conversation patterns, straight from the maintained counters"""
+        user = ContextMemory._user(user_id)
+
+        if not user or not user.contexts:
             return None
-        
-        recent_contexts = context['contexts'][-10:]
-        
-        emotions = [c['emotion'] for c in recent_contexts]
-        themes = [c['theme'] for c in recent_contexts]
-        intents = [c['intent'] for c in recent_contexts]
-        
-        return {
-            "total_interactions": len(context['contexts']),
-            "recent_emotion": emotions[-1] if emotions else None,
-            "primary_theme": max(set(themes), key=themes.count) if themes else None,
-            "primary_intent": max(set(intents), key=intents.count) if intents else None,
-            "emotion_distribution": dict(defaultdict(int, {e: emotions.count(e) for e in set(emotions)})),
-            "theme_history": dict(context['theme_history']),
-            "intent_history": dict(context['intent_history'])
-        }
+
+        with user.lock:
+            return {
+                "total_interactions": user.total,
+                "recent_emotion": user.contexts[-1][4],
+                "primary_theme": max(user.recent_themes, key=user.recent_themes.get) if user.recent_themes else None,
+                "primary_intent": max(user.recent_intents, key=user.recent_intents.get) if user.recent_intents else None,
+                "emotion_distribution": dict(user.recent_emotions),
+                "theme_history": dict(user.theme_history),
+                "intent_history": dict(user.intent_history)
+            }
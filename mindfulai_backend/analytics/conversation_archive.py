@@ -0,0 +1,271 @@
+# mindfulai_backend/analytics/conversation_archive.py
+# Columnar, memory-mapped archive of cold conversation messages for cross-user analytics
+# Author: VINAYAK TIWARI | ARQONX-AI TECHNOLOGY
+#
+# Layout (one directory per archival run, never modified after it is written):
+#   data/archive/manifest.json          segments + per-user watermark (last archived message id)
+#   data/archive/<segment>/meta.json    row count, time range, user/emotion/model/theme dictionaries
+#   data/archive/<segment>/*.npy        fixed-width columns sorted by ts, loaded with mmap_mode='r'
+#   data/archive/<segment>/<text>.bin   UTF-8 text, sliced by <text>_offsets.npy
+#
+# Usage:
+#   python -m mindfulai_backend.analytics.conversation_archive --cold-days 30
+#   python -m mindfulai_backend.analytics.conversation_archive --report
+
+import argparse
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from mindfulai_backend.core.records import message_row, MESSAGE_FIELDS
+from mindfulai_backend.core.serialization import read_json, write_json
+from mindfulai_backend.core.storage import locked
+
+ARCHIVE_DIR = Path("data/archive")
+CONVERSATIONS_DIR = Path("data/conversations")
+MANIFEST = 'manifest.json'
+TEXT_COLUMNS = ('user_message', 'ai_response')
+# Low-cardinality string fields stored as int16 codes + a per-segment dictionary
+CODED_COLUMNS = ('emotion', 'model', 'theme')
+UNKNOWN = 'unknown'
+
+_ID = MESSAGE_FIELDS.index('id')
+_RESPONSE_TIME = MESSAGE_FIELDS.index('response_time')
+_IS_CRISIS = MESSAGE_FIELDS.index('is_crisis')
+
+SECONDS_PER_DAY = 86400
+
+
+def _day_label(day: int) -> str:
+    return datetime.fromtimestamp(int(day) * SECONDS_PER_DAY, tz=timezone.utc).date().isoformat()
+
+
+class ArchiveSegment:
+    """One immutable archival run; every column is a read-only memory map"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        meta = read_json(self.path / 'meta.json')
+        self.rows = meta['rows']
+        self.users = meta['users']
+        self.dictionaries = meta.get('dictionaries', {'emotion': meta.get('emotions', [])})
+        self.emotions = self.dictionaries['emotion']
+        self.ts_min = meta.get('ts_min')
+        self.ts_max = meta.get('ts_max')
+        self._columns = {}
+
+    def column(self, name):
+        """Fixed-width column (ts, user, crisis, response_time or a coded one), mapped on first use"""
+        if name not in self._columns:
+            self._columns[name] = np.load(self.path / f'{name}.npy', mmap_mode='r')
+        return self._columns[name]
+
+    def has_column(self, name) -> bool:
+        return name in self._columns or (self.path / f'{name}.npy').exists()
+
+    def text(self, column: str, index: int) -> str:
+        """Decode a single message's text; scans never touch the text files"""
+        offsets = self.column(f'{column}_offsets')
+        start, end = int(offsets[index]), int(offsets[index + 1])
+        if start == end:
+            return ''
+        data = np.memmap(self.path / f'{column}.bin', dtype=np.uint8, mode='r')
+        return bytes(data[start:end]).decode('utf-8')
+
+    def days(self):
+        return (np.asarray(self.column('ts')) // SECONDS_PER_DAY).astype(np.int64)
+
+
+def _write_text_column(path: Path, name: str, values):
+    encoded = [value.encode('utf-8') for value in values]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(e) for e in encoded], out=offsets[1:])
+    with open(path / f'{name}.bin', 'wb') as f:
+        f.write(b''.join(encoded))
+    np.save(path / f'{name}_offsets.npy', offsets)
+
+
+def write_segment(archive_dir, rows_by_user: dict) -> str:
+    """Write one segment from {user_id: [message rows]}; returns its name
+
+    The segment is built in a temporary directory and renamed into place,
+    so readers never see a half-written segment.
+    """
+    archive_dir = Path(archive_dir)
+    name = f"segment-{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    tmp = archive_dir / f'.{name}.tmp'
+    tmp.mkdir(parents=True)
+
+    users = sorted(rows_by_user)
+    # Sorted by time, so a time range is a searchsorted() slice of every column
+    rows = sorted(((code, message_row(row)) for code, user in enumerate(users) for row in rows_by_user[user]),
+                  key=lambda item: item[1][_ID])
+    ts = np.array([row[_ID] for _, row in rows], dtype=np.float64)
+
+    np.save(tmp / 'ts.npy', ts)
+    np.save(tmp / 'user.npy', np.array([code for code, _ in rows], dtype=np.int32))
+    dictionaries = {}
+    for column in CODED_COLUMNS:
+        index = MESSAGE_FIELDS.index(column)
+        values = [row[index] or UNKNOWN for _, row in rows]
+        dictionaries[column] = sorted(set(values))
+        codes = {value: code for code, value in enumerate(dictionaries[column])}
+        np.save(tmp / f'{column}.npy', np.array([codes[v] for v in values], dtype=np.int16))
+    np.save(tmp / 'crisis.npy', np.array([bool(row[_IS_CRISIS]) for _, row in rows], dtype=np.bool_))
+    np.save(tmp / 'response_time.npy', np.array([row[_RESPONSE_TIME] or 0.0 for _, row in rows], dtype=np.float32))
+    for column in TEXT_COLUMNS:
+        index = MESSAGE_FIELDS.index(column)
+        _write_text_column(tmp, column, (row[index] for _, row in rows))
+    write_json(tmp / 'meta.json', {
+        'rows': len(rows), 'users': users, 'dictionaries': dictionaries,
+        'ts_min': float(ts[0]) if len(ts) else None, 'ts_max': float(ts[-1]) if len(ts) else None,
+        'created_at': datetime.now().isoformat(),
+    })
+
+    tmp.rename(archive_dir / name)
+    return name
+
+
+def archive_cold_conversations(conversations_dir=CONVERSATIONS_DIR, archive_dir=ARCHIVE_DIR,
+                               cold_days: float = 30, now: float = None) -> dict:
+    """Append every message older than cold_days and not yet archived to a new segment
+
+    Source files are left alone; the manifest keeps a per-user watermark
+    (the newest archived message id) so reruns only pick up new cold rows.
+    """
+    archive_dir = Path(archive_dir)
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = archive_dir / MANIFEST
+    # One archival run at a time, across processes too
+    with locked(manifest_path):
+        manifest = read_json(manifest_path) if manifest_path.exists() else {'segments': [], 'watermarks': {}}
+        cutoff = (now or time.time()) - cold_days * SECONDS_PER_DAY
+
+        rows_by_user = {}
+        for conv_file in sorted(Path(conversations_dir).glob('*.json')):
+            data = read_json(conv_file)
+            user_id = data.get('user_id', conv_file.stem)
+            watermark = manifest['watermarks'].get(user_id, 0.0)
+            rows = [row for row in map(message_row, data.get('messages', [])) if watermark < row[_ID] < cutoff]
+            if rows:
+                rows_by_user[user_id] = rows
+
+        if not rows_by_user:
+            return {'segment': None, 'rows': 0, 'users': 0}
+
+        segment = write_segment(archive_dir, rows_by_user)
+        manifest['segments'].append(segment)
+        for user_id, rows in rows_by_user.items():
+            manifest['watermarks'][user_id] = max(row[_ID] for row in rows)
+        write_json(manifest_path, manifest)
+
+        return {'segment': segment, 'rows': sum(len(r) for r in rows_by_user.values()), 'users': len(rows_by_user)}
+
+
+class ConversationArchive:
+    """Vectorized scans over every archived segment
+
+    Aggregations read only the mapped fixed-width columns; message text is
+    never decoded. Days are UTC calendar days.
+    """
+
+    def __init__(self, archive_dir=ARCHIVE_DIR):
+        self.archive_dir = Path(archive_dir)
+        manifest_path = self.archive_dir / MANIFEST
+        names = read_json(manifest_path)['segments'] if manifest_path.exists() else []
+        self.segments = [ArchiveSegment(self.archive_dir / name) for name in names]
+
+    @property
+    def rows(self) -> int:
+        return sum(segment.rows for segment in self.segments)
+
+    def _window(self, segment, start: float, end: float):
+        ts = segment.column('ts')
+        mask = np.ones(segment.rows, dtype=bool)
+        if start is not None:
+            mask &= ts >= start
+        if end is not None:
+            mask &= ts < end
+        return mask
+
+    def emotion_counts_per_day(self, start: float = None, end: float = None) -> dict:
+        """{day: {emotion: count}} across all users"""
+        result = {}
+        for segment in self.segments:
+            if not segment.rows:
+                continue
+            mask = self._window(segment, start, end)
+            days = segment.days()[mask]
+            emotions = np.asarray(segment.column('emotion'))[mask].astype(np.int64)
+            if not len(days):
+                continue
+            first = days.min()
+            width = len(segment.emotions)
+            counts = np.bincount((days - first) * width + emotions,
+                                 minlength=(int(days.max() - first) + 1) * width).reshape(-1, width)
+            for offset in np.flatnonzero(counts.sum(axis=1)):
+                bucket = result.setdefault(_day_label(first + offset), {})
+                for code in np.flatnonzero(counts[offset]):
+                    emotion = segment.emotions[code]
+                    bucket[emotion] = bucket.get(emotion, 0) + int(counts[offset, code])
+        return dict(sorted(result.items()))
+
+    def crisis_rate_per_day(self, start: float = None, end: float = None) -> dict:
+        """{day: {'messages', 'crises', 'rate'}} across all users"""
+        totals = {}
+        for segment in self.segments:
+            if not segment.rows:
+                continue
+            mask = self._window(segment, start, end)
+            days = segment.days()[mask]
+            if not len(days):
+                continue
+            crisis = np.asarray(segment.column('crisis'))[mask]
+            first = days.min()
+            messages = np.bincount(days - first)
+            crises = np.bincount(days - first, weights=crisis, minlength=len(messages))
+            for offset in np.flatnonzero(messages):
+                day = totals.setdefault(_day_label(first + offset), [0, 0])
+                day[0] += int(messages[offset])
+                day[1] += int(crises[offset])
+        return {day: {'messages': m, 'crises': c, 'rate': round(c / m, 4)}
+                for day, (m, c) in sorted(totals.items())}
+
+    def summary(self) -> dict:
+        """Totals across the archive"""
+        messages = self.rows
+        crises = sum(int(np.count_nonzero(s.column('crisis'))) for s in self.segments if s.rows)
+        response = sum(float(np.sum(s.column('response_time'), dtype=np.float64)) for s in self.segments if s.rows)
+        users = set()
+        for segment in self.segments:
+            users.update(segment.users)
+        return {
+            'segments': len(self.segments),
+            'messages': messages,
+            'users': len(users),
+            'crisis_rate': round(crises / messages, 4) if messages else 0.0,
+            'avg_response_time': round(response / messages, 3) if messages else 0.0,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Archive cold conversation messages into columnar segments')
+    parser.add_argument('--conversations', default=str(CONVERSATIONS_DIR))
+    parser.add_argument('--archive', default=str(ARCHIVE_DIR))
+    parser.add_argument('--cold-days', type=float, default=30)
+    parser.add_argument('--report', action='store_true', help='print archive stats instead of archiving')
+    args = parser.parse_args()
+
+    if not args.report:
+        result = archive_cold_conversations(args.conversations, args.archive, args.cold_days)
+        print(f"Archived {result['rows']} messages from {result['users']} users -> {result['segment']}")
+
+    archive = ConversationArchive(args.archive)
+    print(archive.summary())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,313 @@
+# mindfulai_backend/analytics/query_engine.py
+# Cross-user aggregate queries over the columnar conversation archive
+# Author: VINAYAK TIWARI | ARQONX-AI TECHNOLOGY
+#
+# A query is: metrics, grouped by time bucket and/or coded dimensions, over a
+# time range, with equality filters. Execution is fully vectorized:
+#   1. skip segments whose [ts_min, ts_max] zone map misses the range, or whose
+#      dictionary has none of the filtered values
+#   2. slice the time range out of the sorted ts column with searchsorted()
+#   3. remap per-segment codes to global codes and pack every group-by column
+#      into one int64 key (mixed radix)
+#   4. group keys (bincount when the key space is dense, else a sort), then
+#      bincount per group for counts/sums; percentiles from one
+#      O(n) stable sort by group, then a partition per group
+# Message text is never read.
+#
+# Usage:
+#   engine = QueryEngine()
+#   engine.query(metrics=('count', 'crisis_rate'), group_by=('model',), bucket='hour')
+
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from .conversation_archive import ARCHIVE_DIR, CODED_COLUMNS, MANIFEST, ConversationArchive
+from .query_params import QueryError
+
+BUCKETS = {'hour': 3600, 'day': 86400}
+DIMENSIONS = CODED_COLUMNS
+PERCENTILES = {'p50': 50, 'p90': 90, 'p95': 95, 'p99': 99}
+METRICS = ('count', 'crisis_count', 'crisis_rate', 'avg_response_time') + tuple(PERCENTILES)
+MAX_LIMIT = 10000
+
+
+def _bucket_label(bucket: str, start: int) -> str:
+    moment = datetime.fromtimestamp(start, tz=timezone.utc)
+    if bucket == 'day':
+        return moment.date().isoformat()
+    return moment.strftime('%Y-%m-%dT%H:00Z')
+
+
+# bincount allocates two arrays the size of the key space, so it is only used while
+# that stays within a few times the rows (or trivially small); otherwise np.unique sorts
+DENSE_KEYS_PER_ROW = 4
+DENSE_KEY_SPACE = 1 << 16
+
+
+def _group(keys, space: int):
+    """(distinct keys, group index per row), without sorting when the key space is small"""
+    if space <= max(DENSE_KEY_SPACE, DENSE_KEYS_PER_ROW * len(keys)):
+        present = np.flatnonzero(np.bincount(keys, minlength=space))
+        lookup = np.empty(space, dtype=np.int64)
+        lookup[present] = np.arange(len(present))
+        return present, lookup[keys]
+    return np.unique(keys, return_inverse=True)
+
+
+def _grouped_percentiles(groups, values, counts, percentiles) -> dict:
+    """Linear-interpolated percentiles of values per group
+
+    A stable argsort on small ints is a radix sort, so bringing each group's
+    values together is O(n); each group is then a separate partition.
+    """
+    dtype = np.int16 if len(counts) <= np.iinfo(np.int16).max else np.int32
+    grouped = values[np.argsort(groups.astype(dtype), kind='stable')]
+    bounds = np.concatenate(([0], np.cumsum(counts)))
+    qs = list(percentiles.values())
+    table = np.array([np.percentile(grouped[bounds[g]:bounds[g + 1]], qs) for g in range(len(counts))])
+    return {name: table[:, i] for i, name in enumerate(percentiles)}
+
+
+class QueryMetrics:
+    """Thread-safe query timings for the admin endpoint"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.queries = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows_scanned = 0
+
+    def record(self, elapsed_ms, rows_scanned):
+        with self._lock:
+            self.queries += 1
+            self.total_ms += elapsed_ms
+            self.max_ms = max(self.max_ms, elapsed_ms)
+            self.rows_scanned += rows_scanned
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                'queries': self.queries,
+                'avg_ms': round(self.total_ms / self.queries, 2) if self.queries else 0.0,
+                'max_ms': round(self.max_ms, 2),
+                'rows_scanned': self.rows_scanned,
+            }
+
+
+class QueryEngine:
+    """Grouped aggregations across every user's archived messages
+
+    The archive is reopened whenever the manifest changes, so new archival
+    runs show up without a restart. Only archived (cold) messages are
+    visible; run the archiver with a small --cold-days to keep it recent.
+    """
+
+    def __init__(self, archive_dir=ARCHIVE_DIR):
+        self.archive_dir = Path(archive_dir)
+        self.metrics = QueryMetrics()
+        self._lock = threading.Lock()
+        self._version = None
+        self._archive = None
+        self._dictionaries = {}
+        self._remaps = []
+
+    def _load(self):
+        """(archive, global dictionaries, per-segment code remaps), refreshed on manifest change"""
+        manifest = self.archive_dir / MANIFEST
+        version = manifest.stat().st_mtime_ns if manifest.exists() else None
+        with self._lock:
+            if self._archive is None or version != self._version:
+                archive = ConversationArchive(self.archive_dir)
+                dictionaries = {dim: sorted({value for segment in archive.segments
+                                             for value in segment.dictionaries.get(dim, ())})
+                                for dim in DIMENSIONS}
+                indexes = {dim: {value: code for code, value in enumerate(values)}
+                           for dim, values in dictionaries.items()}
+                remaps = [{dim: np.array([indexes[dim][v] for v in segment.dictionaries.get(dim, ())], dtype=np.int64)
+                           for dim in DIMENSIONS}
+                          for segment in archive.segments]
+                self._archive, self._dictionaries, self._remaps, self._version = archive, dictionaries, remaps, version
+            return self._archive, self._dictionaries, self._remaps
+
+    @staticmethod
+    def _validate(metrics, group_by, bucket, filters, order_by, limit):
+        unknown = [m for m in metrics if m not in METRICS]
+        if not metrics or unknown:
+            raise QueryError(f"metrics must be drawn from {', '.join(METRICS)}")
+        unknown = [d for d in group_by if d not in DIMENSIONS]
+        if unknown or len(set(group_by)) != len(group_by):
+            raise QueryError(f"group_by must be distinct values from {', '.join(DIMENSIONS)}")
+        if bucket is not None and bucket not in BUCKETS:
+            raise QueryError(f"bucket must be one of {', '.join(BUCKETS)}")
+        unknown = [f for f in filters if f not in DIMENSIONS and f != 'crisis']
+        if unknown:
+            raise QueryError(f"unknown filter: {unknown[0]}")
+        if order_by is not None and order_by not in metrics:
+            raise QueryError("order_by must be one of the requested metrics")
+        if limit is not None and not 0 < limit <= MAX_LIMIT:
+            raise QueryError(f"limit must be between 1 and {MAX_LIMIT}")
+
+    def query(self, metrics=('count',), group_by=(), bucket=None, filters=None,
+              start: float = None, end: float = None, order_by: str = None, limit: int = None) -> dict:
+        """Run one aggregate query
+
+        filters maps a dimension to a value or list of values, or 'crisis' to
+        a bool. start/end are POSIX timestamps (end exclusive). With limit,
+        the top groups by order_by (default: the first metric) are returned.
+        """
+        started = time.perf_counter()
+        metrics, group_by, filters = tuple(metrics), tuple(group_by), dict(filters or {})
+        self._validate(metrics, group_by, bucket, filters, order_by, limit)
+        archive, dictionaries, remaps = self._load()
+
+        wanted = {dim: {values} if isinstance(values, str) else set(values)
+                  for dim, values in filters.items() if dim != 'crisis'}
+        need_crisis = 'crisis' in filters or any(m in ('crisis_count', 'crisis_rate') for m in metrics)
+        need_response = any(m == 'avg_response_time' or m in PERCENTILES for m in metrics)
+
+        parts = {dim: [] for dim in group_by}
+        bucket_parts, crisis_parts, response_parts = [], [], []
+        matched = []
+        scanned = skipped = rows_scanned = 0
+
+        for segment, remap in zip(archive.segments, remaps):
+            if not segment.rows or (start is not None and segment.ts_max is not None and segment.ts_max < start) \
+                    or (end is not None and segment.ts_min is not None and segment.ts_min >= end):
+                skipped += 1
+                continue
+            local = {dim: [code for code, value in enumerate(segment.dictionaries.get(dim, ())) if value in values]
+                     for dim, values in wanted.items()}
+            if any(not codes for codes in local.values()):
+                skipped += 1
+                continue
+            scanned += 1
+
+            ts = segment.column('ts')
+            if segment.ts_min is not None:
+                # Sorted segment: the time range is a contiguous slice
+                lo = int(np.searchsorted(ts, start, 'left')) if start is not None else 0
+                hi = int(np.searchsorted(ts, end, 'left')) if end is not None else segment.rows
+                window = slice(lo, hi)
+                mask = np.ones(hi - lo, dtype=bool)
+            else:
+                window = slice(0, segment.rows)
+                mask = np.ones(segment.rows, dtype=bool)
+                if start is not None:
+                    mask &= ts >= start
+                if end is not None:
+                    mask &= ts < end
+            rows_scanned += len(mask)
+
+            for dim, codes in local.items():
+                mask &= np.isin(segment.column(dim)[window], codes)
+            if 'crisis' in filters:
+                mask &= segment.column('crisis')[window] == bool(filters['crisis'])
+            hits = int(np.count_nonzero(mask))
+            if not hits:
+                continue
+            matched.append(hits)
+            # An unfiltered time slice is used as-is, no boolean-index copy
+            take = (lambda column: np.asarray(column[window])) if hits == len(mask) \
+                else (lambda column: np.asarray(column[window])[mask])
+
+            if bucket is not None:
+                # Truncating division is floor for positive timestamps, and much cheaper than //
+                bucket_parts.append((take(ts) / BUCKETS[bucket]).astype(np.int64))
+            for dim in group_by:
+                parts[dim].append(remap[dim][take(segment.column(dim))])
+            if need_crisis:
+                crisis_parts.append(take(segment.column('crisis')))
+            if need_response:
+                response_parts.append(take(segment.column('response_time')))
+
+        rows = self._aggregate(metrics, group_by, bucket, dictionaries, parts, bucket_parts,
+                               crisis_parts, response_parts, matched, order_by or metrics[0], limit)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.metrics.record(elapsed_ms, rows_scanned)
+        return {
+            'rows': rows,
+            'stats': {
+                'elapsed_ms': round(elapsed_ms, 2),
+                'rows_scanned': rows_scanned,
+                'rows_matched': sum(matched),
+                'groups': len(rows),
+                'segments_scanned': scanned,
+                'segments_skipped': skipped,
+            },
+        }
+
+    @staticmethod
+    def _aggregate(metrics, group_by, bucket, dictionaries, parts, bucket_parts, crisis_parts, response_parts,
+                   matched, order_by, limit) -> list:
+        total = sum(matched)
+        if not total:
+            return []
+
+        # Pack bucket + dimension codes into one int64 key; bucket is the most significant digit
+        keys = np.zeros(total, dtype=np.int64)
+        space = 1
+        if bucket is not None:
+            buckets = np.concatenate(bucket_parts)
+            first_bucket = int(buckets.min())
+            keys += buckets - first_bucket
+            space = int(buckets.max()) - first_bucket + 1
+        for dim in group_by:
+            size = max(len(dictionaries[dim]), 1)
+            keys *= size
+            keys += np.concatenate(parts[dim])
+            space *= size
+
+        unique, inverse = _group(keys, space)
+        counts = np.bincount(inverse, minlength=len(unique))
+        values = {'count': counts}
+        if crisis_parts and any(m in ('crisis_count', 'crisis_rate') for m in metrics):
+            crises = np.bincount(inverse, weights=np.concatenate(crisis_parts), minlength=len(unique))
+            values['crisis_count'] = crises.astype(np.int64)
+            values['crisis_rate'] = crises / counts
+        if response_parts:
+            response = np.concatenate(response_parts)
+            values['avg_response_time'] = np.bincount(inverse, weights=response, minlength=len(unique)) / counts
+            wanted = {name: q for name, q in PERCENTILES.items() if name in metrics}
+            if wanted:
+                values.update(_grouped_percentiles(inverse, response, counts, wanted))
+
+        # Unpack keys back into labels, least significant digit first
+        labels = {}
+        remaining = unique.copy()
+        for dim in reversed(group_by):
+            size = max(len(dictionaries[dim]), 1)
+            labels[dim] = remaining % size
+            remaining //= size
+        if bucket is not None:
+            labels['bucket'] = (remaining + first_bucket) * BUCKETS[bucket]
+
+        order = np.arange(len(unique))
+        if limit is not None:
+            order = np.argsort(-values[order_by], kind='stable')[:limit]
+
+        rows = []
+        for i in order:
+            row = {}
+            if bucket is not None:
+                row['bucket'] = _bucket_label(bucket, int(labels['bucket'][i]))
+            for dim in group_by:
+                row[dim] = dictionaries[dim][labels[dim][i]]
+            for name in metrics:
+                value = values[name][i]
+                row[name] = int(value) if name in ('count', 'crisis_count') else round(float(value), 4)
+            rows.append(row)
+        return rows
+
+    def snapshot(self) -> dict:
+        archive, dictionaries, _ = self._load()
+        return {
+            'segments': len(archive.segments),
+            'messages': archive.rows,
+            'dictionaries': dictionaries,
+            'queries': self.metrics.snapshot(),
+        }
@@ -0,0 +1,26 @@
+# mindfulai_backend/analytics/query_params.py
+# Parsing shared by the analytics routes; no numpy, so every route can import it
+# Author: VINAYAK TIWARI | ARQONX-AI TECHNOLOGY
+
+from datetime import datetime, timezone
+
+
+class QueryError(ValueError):
+    """A query asked for an unknown metric, dimension, bucket or filter"""
+
+
+def parse_timestamp(value):
+    """POSIX seconds or an ISO date/datetime (UTC unless it says otherwise)"""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        moment = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        raise QueryError(f"invalid time: {value}") from None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
@@ -0,0 +1,252 @@
+# mindfulai_backend/analytics/search_index.py
+# Per-user full-text search over conversation history (SQLite FTS5)
+# Author: VINAYAK TIWARI | ARQONX-AI TECHNOLOGY
+#
+# Each user gets data/search/<user_id>.sqlite3 holding a plain `messages`
+# table (ts indexed for date filters) and an external-content FTS5 index
+# over it. A message is keyed by its position in the user's conversation
+# file (append-only), not its timestamp, which two turns can share.
+# ConversationDatabase.save_message() adds every new turn; a user whose index
+# is missing or on an older schema is backfilled from data/conversations on
+# first search.
+#
+# Usage:
+#   python -m mindfulai_backend.analytics.search_index --rebuild
+#   python -m mindfulai_backend.analytics.search_index --user alice "my job"
+
+import argparse
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from mindfulai_backend.core.conversation_store import upgrade
+from mindfulai_backend.core.records import MESSAGE_FIELDS, message_row
+from mindfulai_backend.core.serialization import read_json
+
+SEARCH_DIR = Path("data/search")
+CONVERSATIONS_DIR = Path("data/conversations")
+MAX_OPEN_INDEXES = 64
+MAX_RESULTS = 100
+
+_ID = MESSAGE_FIELDS.index('id')
+_USER_MESSAGE = MESSAGE_FIELDS.index('user_message')
+_AI_RESPONSE = MESSAGE_FIELDS.index('ai_response')
+_EMOTION = MESSAGE_FIELDS.index('emotion')
+
+SCHEMA_VERSION = 2
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    user_message TEXT NOT NULL,
+    ai_response TEXT NOT NULL,
+    emotion TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+    user_message, ai_response,
+    content='messages', content_rowid='id',
+    tokenize='porter unicode61 remove_diacritics 2'
+);
+CREATE INDEX IF NOT EXISTS messages_ts ON messages (ts);
+"""
+
+SEARCH_SQL = """
+SELECT m.ts, m.emotion,
+       snippet(messages_fts, 0, :open, :close, '…', :words),
+       snippet(messages_fts, 1, :open, :close, '…', :words),
+       bm25(messages_fts, 2.0, 1.0)
+FROM messages_fts JOIN messages m ON m.id = messages_fts.rowid
+WHERE messages_fts MATCH :match AND m.ts >= :start AND m.ts < :end
+ORDER BY bm25(messages_fts, 2.0, 1.0)
+LIMIT :limit
+"""
+
+# Question words users type ("when did I talk about my job?") that only dilute ranking
+STOPWORDS = frozenset("""
+a about am an and are as at be been did do does for from had has have how i i'm im in is it me my
+of on or so that the this to was we were what when where which who why with you your
+""".split())
+
+_WORD = re.compile(r"\w+(?:'\w+)?")
+
+
+class SearchError(ValueError):
+    """A search query had no searchable words"""
+
+
+def build_match(query: str, match_all: bool = False) -> str:
+    """Free text -> FTS5 MATCH expression
+
+    Every word is quoted (so user punctuation is never FTS5 syntax), stop
+    words are dropped unless nothing else is left, and the last word
+    matches as a prefix so results show up while typing.
+    """
+    words = [w.lower() for w in _WORD.findall(query)]
+    terms = [w for w in words if w not in STOPWORDS] or words
+    if not terms:
+        raise SearchError("query has no searchable words")
+    quoted = ['"' + term.replace('"', '""') + '"' for term in dict.fromkeys(terms)]
+    quoted[-1] += '*'
+    return (' AND ' if match_all else ' OR ').join(quoted)
+
+
+class UserIndex:
+    """One user's index file behind one connection; calls are serialized by a lock
+
+    ``refs`` and ``evicted`` belong to the owning ConversationSearchIndex
+    (guarded by its lock): an evicted index is closed once nobody uses it.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.refs = 0
+        self.evicted = False
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        # Older files keyed messages on ts; start those over and let the caller backfill
+        self.stale = self.conn.execute('PRAGMA user_version').fetchone()[0] < SCHEMA_VERSION
+        if self.stale:
+            self.conn.executescript('DROP TABLE IF EXISTS messages_fts; DROP TABLE IF EXISTS messages;')
+        self.conn.executescript(SCHEMA)
+        self.conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+
+    def add_rows(self, rows, first_seq: int):
+        """Index stored message rows, the first at position first_seq; known positions are skipped"""
+        with self.lock:
+            self.conn.execute('BEGIN')
+            try:
+                for seq, row in enumerate(rows, first_seq):
+                    cursor = self.conn.execute(
+                        'INSERT OR IGNORE INTO messages (id, ts, user_message, ai_response, emotion)'
+                        ' VALUES (?, ?, ?, ?, ?)',
+                        (seq, row[_ID], row[_USER_MESSAGE], row[_AI_RESPONSE], row[_EMOTION]))
+                    if cursor.rowcount:
+                        self.conn.execute(
+                            'INSERT INTO messages_fts (rowid, user_message, ai_response) VALUES (?, ?, ?)',
+                            (seq, row[_USER_MESSAGE], row[_AI_RESPONSE]))
+                self.conn.execute('COMMIT')
+            except Exception:
+                self.conn.execute('ROLLBACK')
+                raise
+
+    def search(self, match: str, start, end, limit: int, highlight, words: int):
+        with self.lock:
+            return self.conn.execute(SEARCH_SQL, {
+                'match': match, 'open': highlight[0], 'close': highlight[1], 'words': words,
+                'start': start if start is not None else float('-inf'),
+                'end': end if end is not None else float('inf'),
+                'limit': limit,
+            }).fetchall()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class ConversationSearchIndex:
+    """Ranked, highlighted search over each user's own messages"""
+
+    def __init__(self, search_dir=SEARCH_DIR, conversations_dir=CONVERSATIONS_DIR):
+        self.search_dir = Path(search_dir)
+        self.conversations_dir = Path(conversations_dir)
+        self._open = OrderedDict()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _index(self, user_id: str):
+        """Use a user's index (opened, created and backfilled as needed), keeping the most recent few open"""
+        with self._lock:
+            index = self._open.get(user_id)
+            backfill = False
+            if index is not None:
+                self._open.move_to_end(user_id)
+            else:
+                self.search_dir.mkdir(parents=True, exist_ok=True)
+                path = self.search_dir / f"{user_id}.sqlite3"
+                is_new = not path.exists()
+                index = UserIndex(path)
+                backfill = is_new or index.stale
+                self._open[user_id] = index
+                while len(self._open) > MAX_OPEN_INDEXES:
+                    evicted = self._open.popitem(last=False)[1]
+                    evicted.evicted = True
+                    if not evicted.refs:
+                        evicted.close()
+            index.refs += 1
+        try:
+            if backfill:
+                self._backfill(user_id, index)
+            yield index
+        finally:
+            with self._lock:
+                index.refs -= 1
+                # Evicted while in use: the last user closes it
+                if index.evicted and not index.refs:
+                    index.close()
+
+    def _backfill(self, user_id: str, index: UserIndex) -> int:
+        conv_file = self.conversations_dir / f"{user_id}.json"
+        if not conv_file.exists():
+            return 0
+        # upgrade() gives the stored order, which is what positions refer to
+        rows = upgrade(read_json(conv_file))['messages']
+        index.add_rows(rows, 0)
+        return len(rows)
+
+    def rebuild(self, user_id: str) -> int:
+        """Index every stored message of a user from their conversation file"""
+        with self._index(user_id) as index:
+            return self._backfill(user_id, index)
+
+    def add(self, user_id: str, row, seq: int):
+        """Index one newly saved message row, stored at position seq of the user's file"""
+        with self._index(user_id) as index:
+            index.add_rows([message_row(row)], seq)
+
+    def search(self, user_id: str, query: str, start: float = None, end: float = None, limit: int = 20,
+               match_all: bool = False, highlight=('<mark>', '</mark>'), words: int = 12) -> list:
+        """Best matches first; start/end are POSIX timestamps (end exclusive)
+
+        Each hit carries both sides of the turn as snippets with matches
+        wrapped in `highlight`. Lower score is better (FTS5 bm25).
+        """
+        match = build_match(query, match_all)
+        with self._index(user_id) as index:
+            rows = index.search(match, start, end, max(1, min(limit, MAX_RESULTS)), highlight, words)
+        return [{
+            'id': ts,
+            'timestamp': datetime.fromtimestamp(ts).isoformat(),
+            'emotion': emotion,
+            'user_message': user_snippet,
+            'ai_response': ai_snippet,
+            'score': round(score, 4),
+        } for ts, emotion, user_snippet, ai_snippet, score in rows]
+
+
+search_index = ConversationSearchIndex()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Full-text search over conversation history')
+    parser.add_argument('query', nargs='?')
+    parser.add_argument('--user', help='search this user (or rebuild only this user)')
+    parser.add_argument('--rebuild', action='store_true', help='index every stored message')
+    args = parser.parse_args()
+
+    if args.rebuild:
+        users = [args.user] if args.user else [f.stem for f in sorted(CONVERSATIONS_DIR.glob('*.json'))]
+        for user_id in users:
+            print(f"{user_id}: {search_index.rebuild(user_id)} messages")
+    if args.query and args.user:
+        for hit in search_index.search(args.user, args.query, highlight=('[', ']')):
+            print(f"{hit['timestamp']}  {hit['user_message']}")
+
+
+if __name__ == '__main__':
+    main()
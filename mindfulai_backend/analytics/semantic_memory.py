@@ -0,0 +1,369 @@
+# mindfulai_backend/analytics/semantic_memory.py
+# Per-user semantic memory: local embeddings + an IVF nearest-neighbour index over NumPy
+# Author: VINAYAK TIWARI | ARQONX-AI TECHNOLOGY
+#
+# Every user message worth remembering is embedded and appended to
+#   data/semantic/<user_id>/vectors.f32   float32 rows, append-only
+#   data/semantic/<user_id>/turns.jsonl   [ts, text] per row, append-only
+#   data/semantic/<user_id>/meta.json     embedder name and dim
+#   data/semantic/<user_id>/centroids.npy IVF centroids, once trained
+# Small histories are searched exactly; past IVF_MIN_VECTORS the vectors are
+# clustered (spherical k-means) and a query only scores the nprobe nearest
+# clusters. Centroids are retrained whenever the history has doubled.
+#
+# Embedders: 'hashing' (default, no model, lexical: words + char 4-grams) or
+# 'local' (NAINA_EMBEDDING_MODEL from the local Hugging Face cache, mean
+# pooled; falls back to hashing if it cannot be loaded).
+
+import functools
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+from mindfulai_backend.core.records import MESSAGE_FIELDS, message_row
+from mindfulai_backend.core.serialization import dumps, loads, read_json, write_json
+
+SEMANTIC_DIR = Path("data/semantic")
+CONVERSATIONS_DIR = Path("data/conversations")
+HASHING_DIM = 384
+IVF_MIN_VECTORS = int(os.getenv('NAINA_IVF_MIN_VECTORS', 4096))
+IVF_NPROBE = int(os.getenv('NAINA_IVF_NPROBE', 16))
+MAX_OPEN_USERS = 256
+MIN_WORDS = 3
+
+_ID = MESSAGE_FIELDS.index('id')
+_USER_MESSAGE = MESSAGE_FIELDS.index('user_message')
+
+_WORD = re.compile(r"[a-z0-9']+")
+STOPWORDS = frozenset("""
+a about am an and are as at be been but by can could did do does for from had has have he her him his
+how i i'm im in is it it's its just like me my of on or so that the their them they this to too
+was we were what when where which who why will with would you your
+""".split())
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class HashingEmbedder:
+    """Signed feature hashing of words and in-word char 4-grams, L2-normalized
+
+    No model and no training; similarity is lexical but tolerant of word
+    forms ("hospital" / "hospitalised") because the 4-grams overlap.
+    """
+
+    name = 'hashing'
+
+    def __init__(self, dim: int = HASHING_DIM):
+        self.dim = dim
+
+    def _features(self, text: str):
+        for word in _WORD.findall(text.lower()):
+            if word in STOPWORDS:
+                continue
+            yield 'w:' + word, 1.0
+            padded = f'<{word}>'
+            for i in range(len(padded) - 3):
+                yield 'c:' + padded[i:i + 4], 0.5
+
+    def embed(self, texts) -> np.ndarray:
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, weight in self._features(text):
+                digest = _feature_hash(feature)
+                out[row, digest % self.dim] += weight if digest >> 63 else -weight
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        return out / np.maximum(norms, 1e-9)
+
+
+class TransformerEmbedder:
+    """Mean-pooled sentence embeddings from a locally cached model (CPU)"""
+
+    name = 'local'
+
+    def __init__(self, model_name: str = None):
+        import torch
+        from transformers import AutoModel, AutoTokenizer
+        self.model_name = model_name or os.getenv('NAINA_EMBEDDING_MODEL', 'sentence-transformers/all-MiniLM-L6-v2')
+        self.tokenizer = AutoTokenizer.from_pretrained(self.model_name, local_files_only=True)
+        self.model = AutoModel.from_pretrained(self.model_name, local_files_only=True).eval()
+        self.torch = torch
+        self.dim = self.model.config.hidden_size
+        self.name = f'local:{self.model_name}'
+
+    def embed(self, texts) -> np.ndarray:
+        with self.torch.inference_mode():
+            batch = self.tokenizer(list(texts), padding=True, truncation=True, max_length=128, return_tensors='pt')
+            hidden = self.model(**batch).last_hidden_state
+            mask = batch['attention_mask'].unsqueeze(-1).to(hidden.dtype)
+            pooled = (hidden * mask).sum(1) / mask.sum(1).clamp(min=1)
+            pooled = self.torch.nn.functional.normalize(pooled, dim=1)
+        return pooled.numpy().astype(np.float32)
+
+
+def get_embedder(kind: str = None):
+    """kind (or NAINA_EMBEDDER) is 'hashing' (default) or 'local'"""
+    kind = (kind or os.getenv('NAINA_EMBEDDER', 'hashing')).lower()
+    if kind == 'local':
+        try:
+            embedder = TransformerEmbedder()
+            print(f"✅ Semantic memory embedder: {embedder.model_name}")
+            return embedder
+        except Exception as e:
+            print(f"⚠️ Embedding model unavailable ({e}), using hashing embedder")
+    return HashingEmbedder()
+
+
+def kmeans(vectors: np.ndarray, k: int, iterations: int = 10, seed: int = 0) -> np.ndarray:
+    """Spherical k-means on unit vectors; returns unit-norm centroids"""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), k, replace=False)].copy()
+    for _ in range(iterations):
+        assign = np.argmax(vectors @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, vectors)
+        empty = ~sums.any(axis=1)
+        sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()), replace=False)]
+        centroids = sums / np.maximum(np.linalg.norm(sums, axis=1, keepdims=True), 1e-9)
+    return centroids.astype(np.float32)
+
+
+class VectorIndex:
+    """Growable vector store with exact search, switching to IVF once it is large"""
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self.size = 0
+        self._vectors = np.zeros((64, dim), dtype=np.float32)
+        self.centroids = None
+        self.assign = np.zeros(64, dtype=np.int32)
+        self.trained_size = 0
+
+    @property
+    def vectors(self) -> np.ndarray:
+        return self._vectors[:self.size]
+
+    def add(self, vectors: np.ndarray):
+        needed = self.size + len(vectors)
+        if needed > len(self._vectors):
+            capacity = max(needed, 2 * len(self._vectors))
+            self._vectors = np.resize(self._vectors, (capacity, self.dim))
+            self.assign = np.resize(self.assign, capacity)
+        self._vectors[self.size:needed] = vectors
+        if self.centroids is not None:
+            self.assign[self.size:needed] = np.argmax(vectors @ self.centroids.T, axis=1)
+        self.size = needed
+        if self.size >= IVF_MIN_VECTORS and self.size >= 2 * self.trained_size:
+            self.train()
+
+    def train(self, centroids: np.ndarray = None):
+        """Cluster the vectors (or adopt saved centroids) and assign every row to a list"""
+        if centroids is None:
+            k = int(min(1024, max(16, np.sqrt(self.size))))
+            sample = self.vectors
+            if len(sample) > 50 * k:
+                sample = sample[np.random.default_rng(0).choice(len(sample), 50 * k, replace=False)]
+            centroids = kmeans(sample, k)
+        self.centroids = centroids
+        self.assign[:self.size] = np.argmax(self.vectors @ centroids.T, axis=1)
+        self.trained_size = self.size
+
+    def search(self, query: np.ndarray, k: int, nprobe: int = IVF_NPROBE):
+        """(row indices, cosine scores) of the k best rows, best first"""
+        if not self.size:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        if self.centroids is None:
+            candidates = None
+            scores = self.vectors @ query
+        else:
+            probes = np.argpartition(-(self.centroids @ query), min(nprobe, len(self.centroids) - 1))[:nprobe]
+            candidates = np.flatnonzero(np.isin(self.assign[:self.size], probes))
+            scores = self.vectors[candidates] @ query
+        k = min(k, len(scores))
+        if not k:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        rows = top if candidates is None else candidates[top]
+        return rows, scores[top]
+
+
+class UserMemory:
+    """One user's persisted turns and their vector index"""
+
+    def __init__(self, path: Path, embedder):
+        self.path = path
+        self.embedder = embedder
+        self.lock = threading.Lock()
+        self.turns = []
+        self.index = VectorIndex(embedder.dim)
+        self._load()
+
+    def _load(self):
+        meta_file = self.path / 'meta.json'
+        if not meta_file.exists():
+            return
+        meta = read_json(meta_file)
+        turns_file = self.path / 'turns.jsonl'
+        turn_bytes = turns_file.read_bytes() if turns_file.exists() else b''
+        # Complete lines only: a crash mid-append can leave a partial last one
+        lines = turn_bytes.split(b'\n')[:-1]
+        self.turns = [loads(line) for line in lines]
+        if meta.get('embedder') != self.embedder.name or meta.get('dim') != self.embedder.dim:
+            # Different embedder than the one that wrote the vectors: re-embed the stored texts
+            self._rewrite(self.embedder.embed([text for _, text in self.turns]) if self.turns else None)
+            return
+        vectors_file = self.path / 'vectors.f32'
+        row_bytes = self.embedder.dim * 4
+        vector_bytes = vectors_file.stat().st_size if vectors_file.exists() else 0
+        # A crash between the two appends leaves one file ahead. Cut both back to
+        # the rows they share, or later appends pair vectors with the wrong turns
+        count = min(vector_bytes // row_bytes, len(self.turns))
+        if vector_bytes != count * row_bytes:
+            os.truncate(vectors_file, count * row_bytes)
+        kept_turn_bytes = sum(len(line) + 1 for line in lines[:count])
+        if len(turn_bytes) != kept_turn_bytes:
+            os.truncate(turns_file, kept_turn_bytes)
+        self.turns = self.turns[:count]
+        vectors = np.fromfile(vectors_file, dtype=np.float32, count=count * self.embedder.dim).reshape(
+            -1, self.embedder.dim)
+        if count < IVF_MIN_VECTORS:
+            self.index.add(vectors[:count])
+            return
+        self.index.trained_size = count  # keep add() from retraining; saved centroids are reused
+        self.index.add(vectors[:count])
+        centroids_file = self.path / 'centroids.npy'
+        self.index.train(np.load(centroids_file) if centroids_file.exists() else None)
+
+    def _rewrite(self, vectors):
+        self.path.mkdir(parents=True, exist_ok=True)
+        with open(self.path / 'turns.jsonl', 'wb') as f:
+            f.writelines(dumps(turn) + b'\n' for turn in self.turns)
+        (vectors if vectors is not None else np.zeros((0, self.embedder.dim), np.float32)).tofile(
+            self.path / 'vectors.f32')
+        self.index = VectorIndex(self.embedder.dim)
+        if vectors is not None:
+            self.index.add(vectors)
+        self._write_meta()
+
+    def _write_meta(self):
+        if self.index.centroids is not None:
+            np.save(self.path / 'centroids.npy', self.index.centroids)
+        write_json(self.path / 'meta.json', {'embedder': self.embedder.name, 'dim': self.embedder.dim})
+
+    @property
+    def last_ts(self) -> float:
+        return self.turns[-1][0] if self.turns else 0.0
+
+    def add(self, turns):
+        """Append [ts, text] turns newer than anything stored (older ones are already in)"""
+        with self.lock:
+            return self._append(turns)
+
+    def _append(self, turns):
+        """add() for a caller already holding self.lock"""
+        turns = [turn for turn in turns if turn[0] > self.last_ts]
+        if not turns:
+            return 0
+        vectors = self.embedder.embed([text for _, text in turns])
+        self.path.mkdir(parents=True, exist_ok=True)
+        with open(self.path / 'vectors.f32', 'ab') as f:
+            vectors.tofile(f)
+        with open(self.path / 'turns.jsonl', 'ab') as f:
+            f.writelines(dumps(turn) + b'\n' for turn in turns)
+        trained = self.index.trained_size
+        self.turns.extend(turns)
+        self.index.add(vectors)
+        if self.index.trained_size != trained or not (self.path / 'meta.json').exists():
+            self._write_meta()
+        return len(turns)
+
+    def search(self, text: str, k: int, min_score: float):
+        with self.lock:
+            rows, scores = self.index.search(self.embedder.embed([text])[0], k)
+            return [(self.turns[row], float(score)) for row, score in zip(rows, scores) if score >= min_score]
+
+
+def _worth_remembering(text: str) -> bool:
+    return bool(text) and len([w for w in _WORD.findall(text.lower()) if w not in STOPWORDS]) >= MIN_WORDS
+
+
+class SemanticMemory:
+    """Recall earlier turns relevant to the current message, per user"""
+
+    def __init__(self, semantic_dir=SEMANTIC_DIR, conversations_dir=CONVERSATIONS_DIR, embedder=None):
+        self.semantic_dir = Path(semantic_dir)
+        self.conversations_dir = Path(conversations_dir)
+        self._embedder = embedder
+        self._users = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def embedder(self):
+        if self._embedder is None:
+            self._embedder = get_embedder()
+        return self._embedder
+
+    def _memory(self, user_id: str) -> UserMemory:
+        """Open (or create and backfill) a user's memory, keeping the most recent few loaded"""
+        with self._lock:
+            memory = self._users.get(user_id)
+            if memory is not None:
+                self._users.move_to_end(user_id)
+                return memory
+            path = self.semantic_dir / user_id
+            is_new = not path.exists()
+            memory = UserMemory(path, self.embedder)
+            if is_new:
+                # Held through the backfill: an add() of a newer turn landing first
+                # would make every older turn fail the "newer than stored" filter
+                memory.lock.acquire()
+            self._users[user_id] = memory
+            while len(self._users) > MAX_OPEN_USERS:
+                self._users.popitem(last=False)
+        if is_new:
+            try:
+                memory._append(self._history(user_id))
+            finally:
+                memory.lock.release()
+        return memory
+
+    def _history(self, user_id: str) -> list:
+        """[ts, text] of every stored user message worth remembering, oldest first"""
+        conv_file = self.conversations_dir / f"{user_id}.json"
+        if not conv_file.exists():
+            return []
+        rows = map(message_row, read_json(conv_file).get('messages', []))
+        return sorted([row[_ID], row[_USER_MESSAGE]] for row in rows if _worth_remembering(row[_USER_MESSAGE]))
+
+    def rebuild(self, user_id: str) -> int:
+        """Embed every stored user message from the user's conversation file"""
+        return self._memory(user_id).add(self._history(user_id))
+
+    def add(self, user_id: str, row):
+        """Remember one newly saved message row"""
+        row = message_row(row)
+        if _worth_remembering(row[_USER_MESSAGE]):
+            self._memory(user_id).add([[row[_ID], row[_USER_MESSAGE]]])
+
+    def recall(self, user_id: str, text: str, k: int = 3, min_score: float = 0.3, exclude=()) -> list:
+        """Up to k earlier turns most similar to text, as {'id', 'text', 'score'}, best first
+
+        Turns whose text is in `exclude` (e.g. already in the prompt) are skipped.
+        """
+        if not user_id or not _worth_remembering(text):
+            return []
+        exclude = set(exclude)
+        hits = self._memory(user_id).search(text, k + len(exclude), min_score)
+        return [{'id': ts, 'text': turn, 'score': round(score, 4)}
+                for (ts, turn), score in hits if turn not in exclude][:k]
+
+
+semantic_memory = SemanticMemory()
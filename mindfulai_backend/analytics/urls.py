@@ -0,0 +1,14 @@
+# analytics/urls.py
+# Author: VINAYAK TIWARI | ARQONX-AI TECHNOLOGY
+from django.urls import path
+from . import admin_views
+
+urlpatterns = [
+    # Cross-user aggregates (admin only)
+    path('query/', admin_views.aggregate_query, name='analytics-query'),
+    path('archive/', admin_views.archive_status, name='analytics-archive'),
+    path('cache/', admin_views.cache_status, name='analytics-cache'),
+    
+    # Per-user conversation search (admin only)
+    path('search/', admin_views.search_user_conversations, name='analytics-search'),
+]
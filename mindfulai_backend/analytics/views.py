@@ -2,6 +2,7 @@
 from .models import UserProfile
 from .nlp_engine import AdvancedNLPEngine
 from .context_memory import ContextMemory
+from .query_params import parse_timestamp
 
 def handle_analytics_api(path, query_params):
     """Route analytics API requests"""
@@ -13,6 +14,19 @@ def handle_analytics_api(path, query_params):
         history = ConversationDatabase.get_conversation_history(user_id, limit)
         return {'messages': history}, 200
     
+    elif path == '/api/analytics/search/':
+        query = query_params.get('q', [''])[0]
+        try:
+            results = ConversationDatabase.search_conversations(
+                user_id, query,
+                start=parse_timestamp(query_params.get('start', [None])[0]),
+                end=parse_timestamp(query_params.get('end', [None])[0]),
+                limit=int(query_params.get('limit', ['20'])[0]),
+            )
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return {'query': query, 'results': results}, 200
+    
     elif path == '/api/analytics/stats/':
         stats = ConversationDatabase.get_conversation_analytics(user_id)
         return stats, 200
@@ -34,11 +48,8 @@ def handle_analytics_api(path, query_params):
     
     # NEW: Insights endpoint
     elif path == '/api/analytics/insights/':
-        conv_file = ConversationDatabase.CONVERSATIONS_DIR / f"{user_id}.json"
-        if conv_file.exists():
-            import json
-            with open(conv_file, 'r') as f:
-                data = json.load(f)
+        data = ConversationDatabase.export_conversation(user_id)
+        if data:
             insights = AdvancedNLPEngine.generate_conversation_insights(data)
             if insights:
                 return insights, 200
@@ -0,0 +1,130 @@
+# mindfulai_backend/chatbot/ai_engine/batching.py
+# Micro-batching for local model inference
+# Author: VINAYAK TIWARI | ARQONX-AI TECHNOLOGY
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List
+
+
+class MicroBatcher:
+    """Collect concurrent requests for a few milliseconds and run them as one batch.
+
+    Callers submit single items and get back a Future. A background worker
+    pulls items off the queue until either ``max_batch_size`` items are
+    collected or ``max_wait_ms`` has passed since the first one arrived,
+    then calls ``batch_fn(items)`` once and scatters the results back.
+
+    ``max_batch_size=1`` or ``max_wait_ms=0`` degrades to one-at-a-time
+    serving, which is what the benchmark compares against.
+    """
+
+    def __init__(self, batch_fn: Callable[[List], List], max_batch_size: int = 16,
+                 max_wait_ms: float = 5.0, name: str = 'batcher'):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.name = name
+
+        self._queue = queue.Queue()
+        self._stopped = False
+        self._stats_lock = threading.Lock()
+        self._stats = {'batches': 0, 'items': 0, 'max_batch': 0, 'busy_seconds': 0.0, 'queue_wait_seconds': 0.0}
+        self._worker = threading.Thread(target=self._run, name=f"{name}-worker", daemon=True)
+        self._worker.start()
+
+    def submit(self, item) -> Future:
+        """Queue one item for the next batch"""
+        future = Future()
+        if self._stopped:
+            future.set_exception(RuntimeError(f"{self.name} is stopped"))
+            return future
+        self._queue.put((item, future, time.monotonic()))
+        return future
+
+    def run(self, item, timeout: float = None):
+        """Submit and block until this item's result is ready"""
+        return self.submit(item).result(timeout=timeout)
+
+    def pending(self) -> int:
+        """Number of items waiting for a batch slot"""
+        return self._queue.qsize()
+
+    def stats(self) -> dict:
+        """Batch counters for health endpoints and benchmarks"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        batches = stats['batches'] or 1
+        stats['avg_batch_size'] = round(stats['items'] / batches, 2)
+        stats['avg_queue_wait_ms'] = round(stats['queue_wait_seconds'] / (stats['items'] or 1) * 1000, 3)
+        stats['pending'] = self.pending()
+        return stats
+
+    def stop(self):
+        """Stop the worker after the current batch"""
+        self._stopped = True
+        self._queue.put(None)
+
+    def _collect(self):
+        first = self._queue.get()
+        if first is None:
+            return None
+
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                entry = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if entry is None:
+                self._stopped = True
+                break
+            batch.append(entry)
+
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+
+            # Skip requests whose callers already gave up
+            live = [entry for entry in batch if entry[1].set_running_or_notify_cancel()]
+            if live:
+                self._dispatch(live)
+
+            if self._stopped and self._queue.empty():
+                return
+
+    def _dispatch(self, live):
+        items = [item for item, _, _ in live]
+        started = time.monotonic()
+        try:
+            results = self.batch_fn(items)
+            if len(results) != len(items):
+                raise RuntimeError(f"{self.name}: batch_fn returned {len(results)} results for {len(items)} items")
+        except Exception as e:
+            for _, future, _ in live:
+                future.set_exception(e)
+            return
+        finally:
+            self._record(live, started)
+
+        for (_, future, _), result in zip(live, results):
+            future.set_result(result)
+
+    def _record(self, live, started):
+        with self._stats_lock:
+            self._stats['batches'] += 1
+            self._stats['items'] += len(live)
+            self._stats['max_batch'] = max(self._stats['max_batch'], len(live))
+            self._stats['busy_seconds'] += time.monotonic() - started
+            self._stats['queue_wait_seconds'] += sum(started - queued for _, _, queued in live)
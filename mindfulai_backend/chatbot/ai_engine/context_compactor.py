@@ -0,0 +1,158 @@
+# mindfulai_backend/chatbot/ai_engine/context_compactor.py
+# Prompt-context compaction: rolling summary of older turns + token budget
+# Author: VINAYAK TIWARI | ARQONX-AI TECHNOLOGY
+
+import os
+import re
+import threading
+from collections import OrderedDict
+
+DEFAULT_TOKEN_BUDGET = int(os.getenv('NAINA_PROMPT_TOKEN_BUDGET', 1200))
+MAX_MESSAGE_CHARS = 2000
+ALLOWED_ROLES = ('user', 'assistant')
+
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough BPE token count: words and punctuation, long words split every 4 chars"""
+    return sum(1 + len(piece) // 5 for piece in _TOKEN_PATTERN.findall(text or ''))
+
+
+def sanitize_history(history, max_messages: int = 50) -> list:
+    """Keep only well-formed {'role', 'content'} turns from an untrusted client payload"""
+    if not isinstance(history, list):
+        return []
+    clean = []
+    for item in history[-max_messages:]:
+        if not isinstance(item, dict):
+            continue
+        role, content = item.get('role'), item.get('content')
+        if role in ALLOWED_ROLES and isinstance(content, str) and content.strip():
+            clean.append({'role': role, 'content': content[:MAX_MESSAGE_CHARS]})
+    return clean
+
+
+def _top(counts: dict, n: int) -> list:
+    return [name for name, _ in sorted(counts.items(), key=lambda x: x[1], reverse=True)[:n]]
+
+
+def summarize_context(summary: dict) -> str:
+    """One short sentence from ContextMemory counters; stable while the counters are"""
+    if not summary:
+        return ''
+    parts = []
+    themes = [t for t in _top(summary.get('theme_history', {}), 3) if t not in ('general', 'crisis')]
+    if themes:
+        parts.append(f"they have mostly talked about {', '.join(themes)}")
+    intents = [i for i in _top(summary.get('intent_history', {}), 2) if i != 'conversation']
+    if intents:
+        parts.append(f"usually looking to {' or '.join(intents)}")
+    emotions = _top(summary.get('emotion_distribution', {}), 2)
+    if emotions:
+        parts.append(f"recent mood: {', '.join(emotions)}")
+    if not parts:
+        return ''
+    return f"Earlier conversation summary ({summary.get('total_interactions', 0)} messages): " + '; '.join(parts) + '.'
+
+
+class ContextCompactor:
+    """Bound every prompt: system prompt + rolling summary + newest turns that fit
+
+    Older turns are not sent verbatim; they are represented by a summary
+    derived from the themes, intents and emotions ContextMemory already
+    stores. Summaries are cached per user and only rebuilt when the
+    interaction count moves, so the system + summary prefix stays
+    byte-identical across requests (and cacheable upstream).
+    """
+
+    def __init__(self, token_budget: int = DEFAULT_TOKEN_BUDGET, count_tokens=estimate_tokens,
+                 max_cached_users: int = 10000):
+        self.token_budget = token_budget
+        self.count_tokens = count_tokens
+        self.max_cached_users = max_cached_users
+        self._summaries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def summary_for(self, user_id):
+        """(summary text, interactions it covers) for a user, cached per version"""
+        if not user_id:
+            return '', 0
+        from mindfulai_backend.analytics.context_memory import ContextMemory
+        summary = ContextMemory.get_conversation_summary(user_id)
+        if not summary:
+            return '', 0
+        total = summary.get('total_interactions', 0)
+        # Rebuild every 5 interactions so the prompt prefix stays stable in between
+        version = total // 5
+
+        with self._lock:
+            cached = self._summaries.get(user_id)
+            if cached and cached[0] == version:
+                self._summaries.move_to_end(user_id)
+                return cached[1], total
+
+        text = summarize_context(summary)
+        with self._lock:
+            self._summaries[user_id] = (version, text)
+            if len(self._summaries) > self.max_cached_users:
+                self._summaries.popitem(last=False)
+        return text, total
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Longest prefix of text (at most MAX_MESSAGE_CHARS) that counts as max_tokens or fewer"""
+        text = text[:MAX_MESSAGE_CHARS]
+        low, high = 0, len(text)
+        while low < high:
+            mid = (low + high + 1) // 2
+            if self.count_tokens(text[:mid]) <= max_tokens:
+                low = mid
+            else:
+                high = mid - 1
+        return text[:low]
+
+    def compact(self, system_prompt: str, history: list, user_id=None, token_budget: int = None) -> list:
+        """Messages for the LLM: system, summary, then as many recent turns as fit"""
+        messages, _ = self.compact_with_prefix(
+            system_prompt, self.count_tokens(system_prompt), history, user_id, token_budget
+        )
+        return messages
+
+    def compact_with_prefix(self, system_prompt: str, system_tokens: int, history: list,
+                            user_id=None, token_budget: int = None):
+        """compact() for a prefix whose token count is already known; returns (messages, tokens used)"""
+        budget = token_budget or self.token_budget
+        summary, covered = self.summary_for(user_id)
+        summary_tokens = self.count_tokens(summary) if summary else 0
+
+        # Room for the summary is reserved up front so the total stays in budget
+        recent = []
+        used = system_tokens + summary_tokens
+        for message in reversed(history):
+            cost = self.count_tokens(message['content']) + 4
+            if used + cost > budget:
+                if recent:
+                    break
+                # The newest message always goes in, cut to what is left of the budget
+                message = {'role': message['role'],
+                           'content': self.truncate(message['content'], max(budget - used - 4, 0))}
+                cost = self.count_tokens(message['content']) + 4
+            recent.append(message)
+            used += cost
+        recent.reverse()
+
+        messages = [{"role": "system", "content": system_prompt}]
+
+        # Summarize when turns were dropped or the user has older sessions on record.
+        # It goes in its own message so the system prefix stays byte-identical.
+        user_turns = sum(1 for m in history if m['role'] == 'user')
+        if summary and (len(recent) < len(history) or covered > user_turns):
+            messages.append({"role": "system", "content": summary})
+        else:
+            used -= summary_tokens
+
+        # ChatTurn records (or client dicts) become plain message dicts for the LLM
+        return messages + [{"role": m['role'], "content": m['content']} for m in recent], used
+
+
+compactor = ContextCompactor()
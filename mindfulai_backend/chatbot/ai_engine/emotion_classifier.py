@@ -2,13 +2,46 @@
 # WEEK 2 - FIXED EMOTION DETECTION
 # Author: VINAYAK TIWARI | ARQONX-AI TECHNOLOGY
 
-class EmotionClassifier:
-    """Detect emotions in user messages"""
+import os
+
+NEUTRAL_RESULT = {
+    'emotion': 'neutral',
+    'confidence': 0.5,
+    'color': '#95A5A6'
+}
+
+EMOTION_COLORS = {
+    'sadness': '#FF6B6B',
+    'joy': '#FFD93D',
+    'anger': '#FF4757',
+    'fear': '#A29BFE',
+}
+
+
+class EmotionEngine:
+    """Interface every emotion backend implements
+    
+    classify() returns {'emotion', 'confidence', 'color'} using the
+    sadness/joy/anger/fear/neutral label set.
+    """
+    
+    name = 'base'
+    
+    def classify(self, text: str) -> dict:
+        raise NotImplementedError
+    
+    def classify_batch(self, texts: list) -> list:
+        """Classify several messages at once"""
+        return [self.classify(text) for text in texts]
+
+
+class EmotionClassifier(EmotionEngine):
+    """Detect emotions in user messages - keyword engine"""
+    
+    name = 'keyword'
     
     def __init__(self):
         """Initialize emotion detection"""
-        self.device = "cpu"
-        
         # Comprehensive emotion keywords
         self.emotion_patterns = {
             'sadness': [
@@ -44,11 +77,7 @@ class EmotionClassifier:
         """Classify emotion in text"""
         
         if not text or not text.strip():
-            return {
-                'emotion': 'neutral',
-                'confidence': 0.5,
-                'color': '#95A5A6'
-            }
+            return dict(NEUTRAL_RESULT)
         
         text_lower = text.lower().strip()
         
@@ -70,21 +99,25 @@ class EmotionClassifier:
             score_value = emotion_scores[top_emotion]
             confidence = min(0.9, 0.5 + (score_value * 0.15))
             
-            color_map = {
-                'sadness': '#FF6B6B',
-                'joy': '#FFD93D',
-                'anger': '#FF4757',
-                'fear': '#A29BFE',
-            }
-            
             return {
                 'emotion': top_emotion,
                 'confidence': confidence,
-                'color': color_map.get(top_emotion, '#95A5A6')
+                'color': EMOTION_COLORS.get(top_emotion, '#95A5A6')
             }
         
-        return {
-            'emotion': 'neutral',
-            'confidence': 0.5,
-            'color': '#95A5A6'
-        }
+        return dict(NEUTRAL_RESULT)
+
+
+def get_emotion_engine(kind: str = None) -> EmotionEngine:
+    """Build the configured emotion engine
+    
+    kind (or NAINA_EMOTION_ENGINE) is 'keyword' (default) or 'local'.
+    The local model falls back to keywords if it cannot be loaded.
+    """
+    kind = (kind or os.getenv('NAINA_EMOTION_ENGINE', 'keyword')).lower()
+    
+    if kind == 'local':
+        from .local_emotion_model import LocalEmotionModel
+        return LocalEmotionModel(fallback=EmotionClassifier())
+    
+    return EmotionClassifier()
@@ -0,0 +1,203 @@
+# mindfulai_backend/chatbot/ai_engine/fallback_engine.py
+# Fast deterministic template responses (used whenever the LLM is unavailable)
+# Author: VINAYAK TIWARI | ARQONX-AI TECHNOLOGY
+#
+# Everything here is built once at import time: templates are frozen tuples
+# indexed by (emotion, context), context keywords are compiled into
+# word-boundary regexes, and picking a response is a dict lookup plus a
+# per-session counter - no allocation of template data per call.
+
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from types import MappingProxyType
+
+# ResponseGenerator templates (classifier labels: sadness/joy/anger/fear/neutral)
+RESPONSE_TEMPLATES = MappingProxyType({
+    ('sadness', 'breakup'): (
+        "Breakups are painful. It's okay to feel sad. Healing takes time, and I'm here with you through it.",
+        "I'm sorry you're going through this. Ending a relationship is one of life's hardest experiences.",
+        "Your pain is valid. Allow yourself to grieve. Better days will come.",
+        "That sounds really difficult. Breaking up with someone you care about changes you.",
+        "It takes courage to move on. How long have you been carrying this pain?",
+        "Relationships teach us about ourselves. Even when they end, that growth stays.",
+        "I hear your heartbreak. The fact that you care deeply shows your capacity for love.",
+        "Deleting someone from your life is a boundary you're setting. That takes strength.",
+        "Wanting them back is human. What you're feeling right now is grief - and that's okay.",
+    ),
+    ('sadness', 'general'): (
+        "I hear you. That sounds incredibly difficult. I'm here to listen.",
+        "Your pain is valid. You deserve compassion right now.",
+        "It sounds like things are really hard for you right now. I'm here.",
+        "What you're feeling matters. Tell me more about it.",
+        "That's a lot to carry. Would you like to talk about it?",
+        "I can sense the heaviness in what you're sharing. I'm listening.",
+        "It's okay to not be okay. I'm here with you.",
+    ),
+    ('joy', 'achievement'): (
+        "That's amazing! You should be incredibly proud of yourself!",
+        "Congratulations! Your hard work paid off!",
+        "I'm so happy for you! That's fantastic news!",
+        "You did it! That's a real accomplishment to celebrate!",
+        "This is huge! How does it feel to achieve this?",
+        "Well done! You absolutely deserve this success!",
+    ),
+    ('joy', 'general'): (
+        "Your happiness is contagious! Tell me more about what's making you smile!",
+        "I love your positive energy! What's going well?",
+        "You sound great! What's the good news?",
+        "I can feel the joy in your words. That's wonderful!",
+        "That's so great to hear! How are you feeling?",
+    ),
+    ('anger', 'general'): (
+        "I can feel your frustration. What happened?",
+        "You have every right to be angry. Tell me about it.",
+        "That sounds infuriating. I'm listening.",
+        "Your anger is valid. What's making you feel this way?",
+        "I understand your frustration. Let's talk through it.",
+    ),
+    ('fear', 'general'): (
+        "Anxiety is exhausting. You're braver than you believe.",
+        "What specifically are you worried about? Let's break it down.",
+        "It's okay to feel anxious. That's your mind trying to protect you.",
+        "Tell me what's scaring you. I'm here to listen.",
+        "Fear is natural. What can help you feel more in control?",
+    ),
+    ('neutral', 'greeting'): (
+        "Hi! It's nice to see you. How are you feeling right now?",
+        "Hello! I'm here to listen and support you. What's on your mind?",
+        "Hey! Thanks for reaching out. What can I help with?",
+        "Good to see you! How are things going?",
+        "Hi! I'm here for you. What would you like to talk about?",
+    ),
+    ('neutral', 'question'): (
+        "That's a great question. Tell me more about what you're thinking.",
+        "I'm curious. Help me understand better.",
+        "That's interesting. What made you think of that?",
+        "I'd like to hear more. What's your thought?",
+        "Can you tell me more about that?",
+    ),
+    ('neutral', 'general'): (
+        "I'm here to listen and support you. What would help?",
+        "Tell me what's going on. I'm here for you.",
+        "I'm listening. What's important to you right now?",
+        "You have my attention. What's on your mind?",
+    ),
+})
+
+# Conversational fallbacks for the NAINA server (NLP engine labels: sad/anxious/...)
+CONVERSATIONAL_TEMPLATES = MappingProxyType({
+    ('sad', 'general'): (
+        "I can hear the sadness in what you're saying. What's been weighing on you?",
+        "That sounds really tough. How long have you been feeling this way?",
+        "I'm here with you. Tell me more about what's making you feel sad.",
+    ),
+    ('anxious', 'general'): (
+        "Anxiety can feel so overwhelming. What's triggering these feelings right now?",
+        "I understand how unsettling anxiety can be. What's been on your mind?",
+        "Let's work through this together. What specifically is making you anxious?",
+    ),
+    ('stressed', 'general'): (
+        "Stress can be exhausting. What's causing the most pressure right now?",
+        "I hear you. What's been the biggest source of stress lately?",
+        "That sounds like a lot to handle. Want to talk about what's stressing you most?",
+    ),
+    ('angry', 'general'): (
+        "It's okay to feel angry. What happened that's making you feel this way?",
+        "Anger is a valid emotion. Tell me what's frustrating you.",
+        "I can sense your frustration. What's been building up?",
+    ),
+    ('neutral', 'general'): (
+        "I'm listening. Tell me more about what's on your mind.",
+        "How have things been going for you lately?",
+        "What would you like to talk about today?",
+    ),
+    ('happy', 'general'): (
+        "It's wonderful to hear some positivity! What's been going well?",
+        "I'm glad things are looking up. Tell me more!",
+        "That's great to hear. What's been making you feel good?",
+    ),
+})
+
+# Context keywords, checked in order; matched on word boundaries so that
+# 'hi' does not fire inside 'this' and 'won' not inside 'wonderful'
+CONTEXT_KEYWORDS = (
+    ('greeting', ('hi', 'hello', 'hey', 'good morning', 'good afternoon', 'howdy')),
+    ('question', ('what', 'why', 'how', 'when', 'where')),
+    ('achievement', ('got a job', 'got job', 'promoted', 'passed', 'achieved', 'won')),
+    ('breakup', ('breakup', 'broke up', 'break up', 'ended', 'deleted')),
+)
+
+CONTEXT_PATTERNS = tuple(
+    (context, re.compile(r"\b(?:" + "|".join(re.escape(w) for w in words) + r")\b"))
+    for context, words in CONTEXT_KEYWORDS
+)
+
+MAX_SESSIONS = 10000
+
+
+def detect_context(text: str) -> str:
+    """Message context: greeting, question, achievement, breakup or general"""
+    text_lower = text.lower()
+    for context, pattern in CONTEXT_PATTERNS:
+        if context == 'question' and '?' in text_lower:
+            return context
+        if pattern.search(text_lower):
+            return context
+    return 'general'
+
+
+class TemplateEngine:
+    """Pick templates by (emotion, context) with a seeded per-session rotation
+
+    Each session starts at an offset derived from a CRC of the session id
+    and key, then walks the tuple one step per call, so a user sees every
+    template before any repeats and never the same one twice in a row.
+    """
+
+    def __init__(self, templates, default_emotion: str = 'neutral', use_context: bool = True,
+                 max_sessions: int = MAX_SESSIONS):
+        self.templates = templates
+        self.default_emotion = default_emotion
+        self.use_context = use_context
+        self.max_sessions = max_sessions
+        self._counters = OrderedDict()
+        self._lock = threading.Lock()
+
+    def options(self, emotion: str, context: str = 'general') -> tuple:
+        """Templates for (emotion, context), falling back to general then default emotion"""
+        options = self.templates.get((emotion, context)) or self.templates.get((emotion, 'general'))
+        if options is None:
+            options = self.templates.get((self.default_emotion, context)) or self.templates[(self.default_emotion, 'general')]
+        return options
+
+    def _next_index(self, session_id: str, key: tuple, size: int) -> int:
+        with self._lock:
+            session = self._counters.get(session_id)
+            if session is None:
+                session = self._counters[session_id] = {}
+                if len(self._counters) > self.max_sessions:
+                    self._counters.popitem(last=False)
+            else:
+                self._counters.move_to_end(session_id)
+            count = session.get(key)
+            if count is None:
+                count = zlib.crc32(f"{session_id}|{key[0]}|{key[1]}".encode())
+            session[key] = count + 1
+        return count % size
+
+    def respond(self, message: str, emotion: str = 'neutral', session_id: str = 'default',
+                context: str = None) -> str:
+        if context is None:
+            context = detect_context(message) if self.use_context else 'general'
+        options = self.options(emotion, context)
+        return options[self._next_index(session_id, (emotion, context), len(options))]
+
+    def forget(self, session_id: str):
+        with self._lock:
+            self._counters.pop(session_id, None)
+
+
+response_engine = TemplateEngine(RESPONSE_TEMPLATES)
+conversational_engine = TemplateEngine(CONVERSATIONAL_TEMPLATES, use_context=False)
@@ -0,0 +1,198 @@
+# mindfulai_backend/chatbot/ai_engine/generation_cache.py
+# KV-cache-aware incremental generation for multi-turn local model conversations
+# Author: VINAYAK TIWARI | ARQONX-AI TECHNOLOGY
+
+import threading
+from collections import OrderedDict
+
+MAX_SESSIONS = 10000
+
+
+def cache_nbytes(past) -> int:
+    """Memory held by a past_key_values object (legacy tuples or Cache classes)"""
+    if past is None:
+        return 0
+    if hasattr(past, 'layers'):
+        tensors = [t for layer in past.layers for t in (layer.keys, layer.values)]
+    elif hasattr(past, 'key_cache'):
+        tensors = list(past.key_cache) + list(past.value_cache)
+    else:
+        tensors = [t for layer in past for t in layer]
+    return sum(t.numel() * t.element_size() for t in tensors if hasattr(t, 'numel'))
+
+
+class SessionEntry:
+    """Cached state for one conversation: token ids fed so far and their KV tensors"""
+
+    __slots__ = ('token_ids', 'past', 'nbytes')
+
+    def __init__(self, token_ids, past):
+        self.token_ids = token_ids
+        self.past = past
+        self.nbytes = cache_nbytes(past)
+
+
+class SessionKVCache:
+    """LRU store of past_key_values per session, bounded by total bytes
+
+    take() hands the entry to the caller (removing it), so two requests for
+    the same session never extend the same tensors concurrently; put()
+    returns it and evicts least recently used sessions over the budget.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def take(self, session_id):
+        with self._lock:
+            entry = self._entries.pop(session_id, None)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            self._bytes -= entry.nbytes
+            self.stats['hits'] += 1
+            return entry
+
+    def put(self, session_id, token_ids, past):
+        entry = SessionEntry(token_ids, past)
+        if entry.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(session_id, None)
+            if old is not None:
+                self._bytes -= old.nbytes
+            self._entries[session_id] = entry
+            self._bytes += entry.nbytes
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+                self.stats['evictions'] += 1
+
+    def evict(self, session_id):
+        """Drop a session, e.g. when the session store forgets it"""
+        with self._lock:
+            entry = self._entries.pop(session_id, None)
+            if entry is not None:
+                self._bytes -= entry.nbytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    @property
+    def total_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class IncrementalGenerator:
+    """Generate replies while only encoding the new turn of a conversation
+
+    The prompt for a session is preamble + every turn so far. Token ids of
+    the turns are kept per session; the KV tensors for them live in the
+    byte-bounded SessionKVCache. On a cache hit only the new user turn runs
+    through the model, on a miss (first turn, LRU eviction) the whole
+    prompt is re-encoded. When the context window would overflow, the
+    session restarts from the preamble plus the newest turn. Token ids are
+    kept for the max_sessions most recently used sessions; older ones are
+    forgotten along with their KV tensors.
+    """
+
+    def __init__(self, model, tokenizer, cache: SessionKVCache = None, preamble: str = '',
+                 max_new_tokens: int = 60, temperature: float = 0.7, top_p: float = 0.9,
+                 max_sessions: int = MAX_SESSIONS):
+        self.model = model
+        self.tokenizer = tokenizer
+        self.cache = cache or SessionKVCache()
+        self.preamble_ids = tokenizer.encode(preamble) if preamble else []
+        self.max_new_tokens = max_new_tokens
+        self.temperature = temperature
+        self.top_p = top_p
+        self.max_positions = getattr(model.config, 'n_positions', None) or getattr(model.config, 'max_position_embeddings', 1024)
+        self.device = next(model.parameters()).device
+        self.max_sessions = max_sessions
+        self._history = OrderedDict()
+        self._history_lock = threading.Lock()
+
+    def format_turn(self, user_message: str) -> str:
+        return f"\nUser: {user_message}\nNAINA:"
+
+    def end_session(self, session_id: str):
+        """Forget a session's tokens and KV tensors"""
+        with self._history_lock:
+            self._history.pop(session_id, None)
+        self.cache.evict(session_id)
+
+    def _remember(self, session_id: str, token_ids):
+        with self._history_lock:
+            self._history[session_id] = token_ids
+            self._history.move_to_end(session_id)
+            evicted = []
+            while len(self._history) > self.max_sessions:
+                evicted.append(self._history.popitem(last=False)[0])
+        for old in evicted:
+            self.cache.evict(old)
+
+    def _sample(self, logits):
+        import torch
+        if self.temperature <= 0:
+            return int(logits.argmax())
+        probs = torch.softmax(logits / self.temperature, dim=-1)
+        sorted_probs, sorted_ids = probs.sort(descending=True)
+        keep = sorted_probs.cumsum(dim=-1) - sorted_probs < self.top_p
+        sorted_probs = sorted_probs * keep
+        choice = torch.multinomial(sorted_probs / sorted_probs.sum(), 1)
+        return int(sorted_ids[choice])
+
+    def generate(self, session_id: str, user_message: str, use_cache: bool = True) -> str:
+        """Reply to one user turn; use_cache=False re-encodes the whole prompt (baseline)"""
+        import torch
+
+        with self._history_lock:
+            history = self._history.get(session_id, [])
+        new_ids = self.tokenizer.encode(self.format_turn(user_message))
+        prompt_ids = self.preamble_ids + history + new_ids
+
+        if len(prompt_ids) + self.max_new_tokens >= self.max_positions:
+            prompt_ids = self.preamble_ids + new_ids
+            self.cache.evict(session_id)
+
+        entry = self.cache.take(session_id) if use_cache else None
+        if entry is not None and len(entry.token_ids) == len(prompt_ids) - len(new_ids):
+            past, feed = entry.past, new_ids
+        else:
+            past, feed = None, prompt_ids
+
+        reply_ids = []
+        eos = self.tokenizer.eos_token_id
+        stop = False
+        with torch.inference_mode():
+            while True:
+                out = self.model(input_ids=torch.tensor([feed], device=self.device),
+                                 past_key_values=past, use_cache=True)
+                past = out.past_key_values
+                if stop or len(reply_ids) == self.max_new_tokens:
+                    break
+                next_id = self._sample(out.logits[0, -1])
+                if next_id == eos:
+                    break
+                reply_ids.append(next_id)
+                feed = [next_id]
+                # Stop once the model starts inventing the next user turn
+                stop = self.tokenizer.decode(reply_ids[-4:]).endswith('User:')
+
+        # past now covers prompt_ids + reply_ids
+        token_ids = prompt_ids + reply_ids
+        self._remember(session_id, token_ids[len(self.preamble_ids):])
+        if use_cache:
+            self.cache.put(session_id, token_ids, past)
+
+        reply = self.tokenizer.decode(reply_ids, skip_special_tokens=True)
+        return reply.split('\nUser:')[0].strip()
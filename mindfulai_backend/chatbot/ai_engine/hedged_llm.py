@@ -0,0 +1,184 @@
+# mindfulai_backend/chatbot/ai_engine/hedged_llm.py
+# Speculative fallback racing with LLM request hedging
+# Author: VINAYAK TIWARI | ARQONX-AI TECHNOLOGY
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+PATHS = ('primary', 'hedge', 'fallback')
+
+
+def parse_llm_output(result):
+    """Pull the reply text out of a Bytez result, or None if there is none"""
+    if result is None or getattr(result, 'error', None):
+        return None
+    output = getattr(result, 'output', None)
+    if isinstance(output, str) and output.strip():
+        response = output.strip()
+        # Keep responses conversational and not too long
+        if len(response) > 500:
+            response = response[:497] + "..."
+        return response
+    if isinstance(output, dict) and output.get('content'):
+        return output['content'].strip()
+    return None
+
+
+class HedgeMetrics:
+    """Thread-safe counters: which path won, how long it took, what was abandoned"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.wins = {path: 0 for path in PATHS}
+        self.latency = {path: 0.0 for path in PATHS}
+        self.hedges_sent = 0
+        self.errors = 0
+        self.abandoned = 0
+        self.queue_timeouts = 0
+
+    def record_win(self, path, seconds):
+        with self._lock:
+            self.wins[path] += 1
+            self.latency[path] += seconds
+
+    def increment(self, name, amount=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            total = sum(self.wins.values()) or 1
+            return {
+                'requests': sum(self.wins.values()),
+                'wins': dict(self.wins),
+                'win_rate': {path: round(self.wins[path] / total, 3) for path in PATHS},
+                'avg_latency': {path: round(self.latency[path] / self.wins[path], 3) if self.wins[path] else 0
+                                for path in PATHS},
+                'hedges_sent': self.hedges_sent,
+                'errors': self.errors,
+                'abandoned': self.abandoned,
+                'queue_timeouts': self.queue_timeouts,
+            }
+
+
+class HedgedResponder:
+    """Race the LLM against a deadline instead of waiting out a serial timeout
+
+    The fallback reply is only built when it is used, so it does not
+    advance the fallback engine's per-session rotation for replies the LLM
+    answered. The primary LLM request gets
+    until ``soft_deadline``; after that, mode 'hedge' fires a second
+    identical request and takes whichever answers first, while mode
+    'fallback' returns the prepared fallback immediately. Nothing waits
+    past ``hard_deadline``. Requests that lose are cancelled if they have
+    not started, otherwise their results are discarded.
+
+    With a FairScheduler, each request first waits for one of its LLM
+    slots (the hedge shares the slot); a client still queued at the soft
+    deadline gets the fallback. The slot is held until every request sent
+    for it has finished, including ones abandoned at the hard deadline, so
+    upstream concurrency stays at the scheduler's slot count.
+    """
+
+    def __init__(self, call_llm, soft_deadline: float = None, hard_deadline: float = None,
+                 mode: str = None, max_workers: int = None, scheduler=None):
+        self.call_llm = call_llm
+        self.scheduler = scheduler
+        self.soft_deadline = soft_deadline if soft_deadline is not None else float(os.getenv('NAINA_SOFT_DEADLINE', 3.0))
+        self.hard_deadline = hard_deadline if hard_deadline is not None else float(os.getenv('NAINA_HARD_DEADLINE', 10.0))
+        self.mode = (mode or os.getenv('NAINA_HEDGE_MODE', 'hedge')).lower()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers or int(os.getenv('NAINA_LLM_WORKERS', 16)),
+                                           thread_name_prefix='llm')
+        self.metrics = HedgeMetrics()
+
+    def _attempt(self, messages, cancelled):
+        if cancelled.is_set():
+            return None
+        try:
+            return parse_llm_output(self.call_llm(messages))
+        except Exception as e:
+            print(f"[LLM] Request failed: {e}")
+            self.metrics.increment('errors')
+            return None
+
+    def respond(self, messages, fallback_fn, client=None):
+        """Return (response_text, winning_path); client is the fair-scheduling key"""
+        started = time.monotonic()
+
+        if self.scheduler is None:
+            return self._race(messages, fallback_fn, started, lambda: None)
+        if not self.scheduler.acquire(client, timeout=self.soft_deadline):
+            print(f"[HEDGE] No LLM slot for {client} after {self.soft_deadline:.1f}s, using fallback")
+            self.metrics.increment('queue_timeouts')
+            self.metrics.record_win('fallback', time.monotonic() - started)
+            return fallback_fn(), 'fallback'
+        return self._race(messages, fallback_fn, started, self.scheduler.release)
+
+    def _race(self, messages, fallback_fn, started, release):
+        """Run the race; release() is called once no request sent for it is still running"""
+        cancelled = threading.Event()
+        pending = {self.executor.submit(self._attempt, messages, cancelled): 'primary'}
+        hedged = False
+
+        try:
+            while pending:
+                elapsed = time.monotonic() - started
+                if not hedged and elapsed < self.soft_deadline:
+                    timeout = self.soft_deadline - elapsed
+                else:
+                    timeout = self.hard_deadline - elapsed
+                if timeout <= 0:
+                    break
+
+                done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    path = pending.pop(future)
+                    response = future.result()
+                    if response:
+                        self.metrics.record_win(path, time.monotonic() - started)
+                        return response, path
+
+                if done:
+                    # A request failed before the deadline; hedge right away if we still can
+                    if self.mode == 'hedge' and not hedged:
+                        hedged = True
+                        self.metrics.increment('hedges_sent')
+                        pending[self.executor.submit(self._attempt, messages, cancelled)] = 'hedge'
+                    continue
+
+                if not hedged and time.monotonic() - started >= self.soft_deadline:
+                    hedged = True
+                    if self.mode != 'hedge':
+                        break
+                    print(f"[HEDGE] No reply after {self.soft_deadline:.1f}s, sending hedge request")
+                    self.metrics.increment('hedges_sent')
+                    pending[self.executor.submit(self._attempt, messages, cancelled)] = 'hedge'
+
+            self.metrics.record_win('fallback', time.monotonic() - started)
+            return fallback_fn(), 'fallback'
+        finally:
+            cancelled.set()
+            running = [future for future in pending if not future.cancel()]
+            self.metrics.increment('abandoned', len(running))
+            self._release_after(running, release)
+
+    @staticmethod
+    def _release_after(futures, release):
+        if not futures:
+            release()
+            return
+        remaining = [len(futures)]
+        lock = threading.Lock()
+
+        def finished(_):
+            with lock:
+                remaining[0] -= 1
+                last = not remaining[0]
+            if last:
+                release()
+
+        for future in futures:
+            future.add_done_callback(finished)
@@ -0,0 +1,187 @@
+# mindfulai_backend/chatbot/ai_engine/local_emotion_model.py
+# CPU-optimized local emotion model (ONNX Runtime or int8 DistilBERT)
+# Author: VINAYAK TIWARI | ARQONX-AI TECHNOLOGY
+
+import os
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeout
+from pathlib import Path
+
+from .batching import MicroBatcher
+from .emotion_classifier import EmotionEngine, EmotionClassifier, EMOTION_COLORS, NEUTRAL_RESULT
+
+DEFAULT_MODEL = "distilbert-base-uncased-finetuned-sst-2-english"
+
+# Model labels -> NAINA emotion labels.
+# SST-2 only knows POSITIVE/NEGATIVE, emotion models use their own names.
+LABEL_MAP = {
+    'positive': 'joy',
+    'negative': 'sadness',
+    'joy': 'joy',
+    'love': 'joy',
+    'sadness': 'sadness',
+    'anger': 'anger',
+    'disgust': 'anger',
+    'fear': 'fear',
+    'surprise': 'neutral',
+    'neutral': 'neutral',
+}
+
+NEGATIVE_EMOTIONS = ('sadness', 'anger', 'fear')
+
+
+class LocalEmotionModel(EmotionEngine):
+    """Local transformer emotion engine with micro-batching and a latency budget
+
+    Concurrent classify() calls are batched into one forward pass. If a
+    result does not arrive within the latency budget (or the model failed
+    to load) the keyword engine answers instead.
+    """
+
+    name = 'local'
+
+    def __init__(self, model_path: str = None, fallback: EmotionEngine = None,
+                 max_batch_size: int = None, max_wait_ms: float = None,
+                 latency_budget_ms: float = None, min_confidence: float = 0.6):
+        self.model_path = model_path or os.getenv('NAINA_EMOTION_MODEL', DEFAULT_MODEL)
+        self.fallback = fallback or EmotionClassifier()
+        self.latency_budget = (latency_budget_ms or float(os.getenv('NAINA_EMOTION_BUDGET_MS', 150))) / 1000.0
+        self.min_confidence = min_confidence
+
+        self.backend = None
+        self.tokenizer = None
+        self.session = None
+        self.model = None
+        self.id2label = {}
+        self.batcher = None
+
+        self.stats = {'model': 0, 'fallback_budget': 0, 'fallback_error': 0, 'fallback_unloaded': 0}
+        self._stats_lock = threading.Lock()
+
+        try:
+            self._load()
+            self.batcher = MicroBatcher(
+                self._predict_batch,
+                max_batch_size=max_batch_size or int(os.getenv('NAINA_EMOTION_BATCH', 16)),
+                max_wait_ms=max_wait_ms if max_wait_ms is not None else float(os.getenv('NAINA_EMOTION_WAIT_MS', 5)),
+                name='emotion',
+            )
+            print(f"✅ Local emotion model loaded ({self.backend}): {self.model_path}")
+        except Exception as e:
+            print(f"⚠️ Local emotion model unavailable, using keywords: {e}")
+
+    @property
+    def ready(self) -> bool:
+        return self.batcher is not None
+
+    def _load(self):
+        """Prefer an exported ONNX graph, else int8 dynamic-quantized PyTorch"""
+        from transformers import AutoTokenizer, AutoConfig
+
+        self.tokenizer = AutoTokenizer.from_pretrained(self.model_path)
+        config = AutoConfig.from_pretrained(self.model_path)
+        self.id2label = {int(k): v for k, v in config.id2label.items()}
+
+        onnx_file = Path(self.model_path) / 'model.onnx'
+        if onnx_file.exists():
+            try:
+                import onnxruntime as ort
+                options = ort.SessionOptions()
+                options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+                options.intra_op_num_threads = int(os.getenv('NAINA_ONNX_THREADS', os.cpu_count() or 1))
+                self.session = ort.InferenceSession(str(onnx_file), options, providers=['CPUExecutionProvider'])
+                self.backend = 'onnx'
+                return
+            except ImportError:
+                pass
+
+        import torch
+        from transformers import AutoModelForSequenceClassification
+
+        model = AutoModelForSequenceClassification.from_pretrained(self.model_path)
+        model.eval()
+        self.model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        self.backend = 'torch-int8'
+
+    def _predict_batch(self, texts):
+        """One padded forward pass for the whole batch -> [(label, score)]"""
+        if self.backend == 'onnx':
+            import numpy as np
+            encoded = self.tokenizer(texts, padding=True, truncation=True, max_length=128, return_tensors='np')
+            feed = {i.name: encoded[i.name].astype(np.int64) for i in self.session.get_inputs() if i.name in encoded}
+            logits = self.session.run(None, feed)[0]
+            logits = logits - logits.max(axis=1, keepdims=True)
+            probs = np.exp(logits)
+            probs = probs / probs.sum(axis=1, keepdims=True)
+            best = probs.argmax(axis=1)
+            return [(self.id2label[int(b)], float(probs[i, b])) for i, b in enumerate(best)]
+
+        import torch
+        encoded = self.tokenizer(texts, padding=True, truncation=True, max_length=128, return_tensors='pt')
+        with torch.inference_mode():
+            probs = torch.softmax(self.model(**encoded).logits, dim=-1)
+        scores, best = probs.max(dim=-1)
+        return [(self.id2label[int(b)], float(s)) for b, s in zip(best, scores)]
+
+    def _to_result(self, text, label, score):
+        emotion = LABEL_MAP.get(label.lower(), 'neutral')
+
+        if score < self.min_confidence:
+            return dict(NEUTRAL_RESULT)
+
+        # Binary sentiment models can't tell sad from angry or scared;
+        # let the keyword engine refine a NEGATIVE prediction.
+        if label.lower() == 'negative':
+            keyword_emotion = self.fallback.classify(text)['emotion']
+            if keyword_emotion in NEGATIVE_EMOTIONS:
+                emotion = keyword_emotion
+
+        if emotion == 'neutral':
+            return {'emotion': 'neutral', 'confidence': score, 'color': NEUTRAL_RESULT['color']}
+
+        return {
+            'emotion': emotion,
+            'confidence': score,
+            'color': EMOTION_COLORS.get(emotion, NEUTRAL_RESULT['color'])
+        }
+
+    def _count(self, key):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def classify(self, text: str) -> dict:
+        """Classify emotion, within the latency budget"""
+        return self.classify_batch([text])[0]
+
+    def classify_batch(self, texts: list) -> list:
+        """Submit all texts to the batcher and wait on one shared deadline"""
+        results = [None] * len(texts)
+        pending = []
+
+        for i, text in enumerate(texts):
+            if not text or not text.strip():
+                results[i] = dict(NEUTRAL_RESULT)
+            elif not self.ready:
+                self._count('fallback_unloaded')
+                results[i] = self.fallback.classify(text)
+            else:
+                pending.append((i, text, self.batcher.submit(text[:512])))
+
+        # The whole call shares one budget, later futures get no extra time
+        deadline = time.monotonic() + self.latency_budget
+        for i, text, future in pending:
+            try:
+                label, score = future.result(timeout=max(0.0, deadline - time.monotonic()))
+                results[i] = self._to_result(text, label, score)
+                self._count('model')
+            except FutureTimeout:
+                future.cancel()
+                self._count('fallback_budget')
+                results[i] = self.fallback.classify(text)
+            except Exception as e:
+                print(f"[EMOTION] Local model error: {e}")
+                self._count('fallback_error')
+                results[i] = self.fallback.classify(text)
+
+        return results
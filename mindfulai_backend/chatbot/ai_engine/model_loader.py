@@ -0,0 +1,218 @@
+# mindfulai_backend/chatbot/ai_engine/model_loader.py
+# Shared, memory-mapped and int8 loaders for exported NAINA model artifacts
+# Author: VINAYAK TIWARI | ARQONX-AI TECHNOLOGY
+#
+# Artifacts are produced by training/export_quantized_model.py:
+#   <dir>/model.safetensors   fp32 weights, mapped read-only (one physical copy for all workers)
+#   <dir>/model.int8.safetensors  int8 dynamic-quantized weights (4x smaller private copy)
+
+import json
+import os
+import struct
+import time
+from pathlib import Path
+
+SAFETENSORS_FILE = 'model.safetensors'
+INT8_FILE = 'model.int8.safetensors'
+
+SAFETENSORS_DTYPES = {
+    'F64': 'float64', 'F32': 'float32', 'F16': 'float16', 'BF16': 'bfloat16',
+    'I64': 'int64', 'I32': 'int32', 'I16': 'int16', 'I8': 'int8', 'U8': 'uint8', 'BOOL': 'bool',
+}
+
+
+def mmap_safetensors(path) -> dict:
+    """Map a .safetensors file and return tensors that view the mapping (no copy)
+
+    The file is mapped copy-on-write, so pages stay in the shared page cache
+    for as long as nobody writes to the weights - which inference never does.
+    """
+    import torch
+
+    path = Path(path)
+    with open(path, 'rb') as f:
+        header_len = struct.unpack('<Q', f.read(8))[0]
+        header = json.loads(f.read(header_len))
+    header.pop('__metadata__', None)
+
+    storage = torch.UntypedStorage.from_file(str(path), shared=False, nbytes=path.stat().st_size)
+    data_start = 8 + header_len
+
+    tensors = {}
+    for name, info in header.items():
+        dtype = getattr(torch, SAFETENSORS_DTYPES[info['dtype']])
+        begin, end = info['data_offsets']
+        raw = torch.empty(0, dtype=torch.uint8).set_(storage, data_start + begin, (end - begin,))
+        tensors[name] = raw.view(dtype).view(info['shape'])
+    return tensors
+
+
+def linearize_conv1d(model):
+    """Swap GPT-2 Conv1D layers for nn.Linear so dynamic quantization applies to them"""
+    import torch
+    try:
+        from transformers.pytorch_utils import Conv1D
+    except ImportError:
+        return model
+
+    for parent in list(model.modules()):
+        for child_name, child in list(parent.named_children()):
+            if isinstance(child, Conv1D):
+                in_features, out_features = child.weight.shape
+                linear = torch.nn.Linear(in_features, out_features, device=child.weight.device)
+                linear.weight = torch.nn.Parameter(child.weight.detach().t().contiguous())
+                linear.bias = torch.nn.Parameter(child.bias.detach())
+                setattr(parent, child_name, linear)
+    return model
+
+
+def quantize_int8(model):
+    """int8 dynamic quantization of every Linear layer (CPU inference)"""
+    import torch
+    from torch.ao.quantization import quantize_dynamic
+    return quantize_dynamic(linearize_conv1d(model), {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def _quantized_linears(model):
+    import torch
+    return [(name, module) for name, module in model.named_modules()
+            if isinstance(module, torch.ao.nn.quantized.dynamic.Linear)]
+
+
+def save_int8_artifact(model, model_dir):
+    """Quantize a model and store it as plain safetensors
+
+    Quantized weights are stored as int8 values + per-tensor scale and zero
+    point, so the artifact needs no pickle and loads with weights_only safety.
+    """
+    import torch
+    from safetensors.torch import save_file
+
+    quantized = quantize_int8(model)
+    # Quantized layers hold packed params, not parameters; named_parameters()
+    # also skips tied duplicates (lm_head shares the embedding)
+    tensors = {name: value.detach().contiguous() for name, value in quantized.named_parameters()}
+
+    for name, module in _quantized_linears(quantized):
+        weight, bias = module.weight(), module.bias()
+        tensors[f'{name}.qweight'] = weight.int_repr().contiguous()
+        tensors[f'{name}.qscale'] = torch.tensor([weight.q_scale()], dtype=torch.float64)
+        tensors[f'{name}.qzero_point'] = torch.tensor([weight.q_zero_point()], dtype=torch.int64)
+        if bias is not None:
+            tensors[f'{name}.qbias'] = bias.contiguous()
+
+    path = Path(model_dir) / INT8_FILE
+    save_file(tensors, str(path))
+    return path
+
+
+def _empty_model(model_dir):
+    """Build the architecture without allocating weights"""
+    import torch
+    from transformers import AutoConfig, AutoModelForCausalLM
+
+    config = AutoConfig.from_pretrained(model_dir)
+    with torch.device('meta'):
+        return AutoModelForCausalLM.from_config(config)
+
+
+def _check_materialized(model, path):
+    """Fail loudly if any parameter or buffer was left on the meta device"""
+    missing = [name for name, tensor in list(model.named_parameters()) + list(model.named_buffers())
+               if tensor.is_meta]
+    if missing:
+        raise RuntimeError(f"{path} is missing {len(missing)} tensor(s): {', '.join(missing[:10])}")
+
+
+def load_mmap_model(model_dir):
+    """fp32 model whose parameters point straight into the mapped safetensors file"""
+    model = _empty_model(model_dir)
+    path = Path(model_dir) / SAFETENSORS_FILE
+    state = mmap_safetensors(path)
+    # strict=False because tied weights (lm_head) are not stored; anything else
+    # missing would stay on the meta device, which the check below catches
+    model.load_state_dict(state, strict=False, assign=True)
+    model.tie_weights()
+    _check_materialized(model, path)
+    return model.eval()
+
+
+def load_int8_model(model_dir):
+    """int8 dynamic-quantized model rebuilt from save_int8_artifact() output
+
+    The architecture is built on the meta device, quantized layers are
+    created directly from the stored int8 values and every other tensor
+    views the mapped file, so no fp32 copy of the model is ever allocated.
+    """
+    import torch
+    from torch.ao.nn.quantized.dynamic import Linear as QuantizedLinear
+
+    model = linearize_conv1d(_empty_model(model_dir))
+    state = mmap_safetensors(Path(model_dir) / INT8_FILE)
+
+    for name, module in list(model.named_modules()):
+        if not isinstance(module, torch.nn.Linear) or f'{name}.qweight' not in state:
+            continue
+        qweight = torch._make_per_tensor_quantized_tensor(
+            state.pop(f'{name}.qweight'),
+            float(state.pop(f'{name}.qscale')),
+            int(state.pop(f'{name}.qzero_point'))
+        )
+        quantized = QuantizedLinear(module.in_features, module.out_features, dtype=torch.qint8)
+        quantized.set_weight_bias(qweight, state.pop(f'{name}.qbias', None))
+        parent_name, _, child_name = name.rpartition('.')
+        setattr(model.get_submodule(parent_name), child_name, quantized)
+
+    for name, value in state.items():
+        parent_name, _, attr = name.rpartition('.')
+        setattr(model.get_submodule(parent_name), attr, torch.nn.Parameter(value, requires_grad=False))
+
+    # lm_head is quantized separately, so it is no longer tied to the embedding
+    _check_materialized(model, Path(model_dir) / INT8_FILE)
+    return model.eval()
+
+
+def load_model(model_dir, mode: str = None):
+    """Load a causal LM in the configured mode
+
+    mode (or NAINA_MODEL_MODE): 'mmap', 'int8', 'pretrained' or 'auto'.
+    'auto' prefers the shared mmap artifact when the export step has run.
+    Returns (model, load_seconds).
+    """
+    mode = (mode or os.getenv('NAINA_MODEL_MODE', 'auto')).lower()
+    model_dir = str(model_dir)
+    started = time.perf_counter()
+
+    if mode == 'auto':
+        if (Path(model_dir) / SAFETENSORS_FILE).exists():
+            mode = 'mmap'
+        else:
+            mode = 'pretrained'
+
+    if mode == 'mmap':
+        model = load_mmap_model(model_dir)
+    elif mode == 'int8':
+        model = load_int8_model(model_dir)
+    else:
+        from transformers import AutoModelForCausalLM
+        model = AutoModelForCausalLM.from_pretrained(model_dir).eval()
+
+    return model, time.perf_counter() - started
+
+
+def process_memory() -> dict:
+    """Resident memory of this process in MB: total, anonymous (private) and file-backed"""
+    memory = {}
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                if key in ('VmRSS', 'RssAnon', 'RssFile'):
+                    memory[key] = int(value.split()[0]) / 1024
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                if line.startswith('Pss:'):
+                    memory['Pss'] = int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return memory
@@ -0,0 +1,134 @@
+# mindfulai_backend/chatbot/ai_engine/priority_lanes.py
+# Priority lanes: crisis-tier requests run on reserved workers, never behind normal traffic
+# Author: VINAYAK TIWARI | ARQONX-AI TECHNOLOGY
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+CRISIS_LANE = 'crisis'
+NORMAL_LANE = 'normal'
+
+
+def lane_for(crisis_result: dict) -> str:
+    """Lane for a CrisisDetector.detect() result; decided before any queueing
+
+    Routed on is_crisis, not severity: a single severe keyword ("give up",
+    "burden") comes back as severity 'severe' with is_crisis False and is
+    ordinary chat.
+    """
+    if crisis_result and crisis_result.get('is_crisis'):
+        return CRISIS_LANE
+    return NORMAL_LANE
+
+
+class Outcome:
+    """First settle() wins: the lane worker's reply or the caller's deadline fallback
+
+    Lets a worker that overran its deadline find out before it records a
+    reply other than the one the user was sent.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = None
+        self.settled = False
+
+    def settle(self, value) -> bool:
+        with self._lock:
+            if self.settled:
+                return False
+            self.value, self.settled = value, True
+            return True
+
+
+class Lane:
+    """One worker pool plus queue-wait statistics"""
+
+    def __init__(self, name: str, workers: int, window: int = 1000):
+        self.name = name
+        self.workers = workers
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"lane-{name}")
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=window)
+        self._queued = 0
+        self.stats = {'submitted': 0, 'completed': 0, 'timeouts': 0, 'max_wait_ms': 0.0}
+
+    def submit(self, fn, *args, **kwargs):
+        queued_at = time.monotonic()
+        with self._lock:
+            self.stats['submitted'] += 1
+            self._queued += 1
+
+        def task():
+            wait_ms = (time.monotonic() - queued_at) * 1000
+            with self._lock:
+                self._queued -= 1
+                self._waits.append(wait_ms)
+                self.stats['max_wait_ms'] = max(self.stats['max_wait_ms'], wait_ms)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.stats['completed'] += 1
+
+        return self.executor.submit(task)
+
+    def record_timeout(self):
+        with self._lock:
+            self.stats['timeouts'] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            waits = sorted(self._waits)
+            stats = dict(self.stats, workers=self.workers, queued=self._queued)
+
+        def pct(p):
+            return round(waits[min(len(waits) - 1, int(len(waits) * p))], 3) if waits else 0.0
+
+        stats.update(wait_p50_ms=pct(0.50), wait_p95_ms=pct(0.95), wait_p99_ms=pct(0.99))
+        stats['max_wait_ms'] = round(stats['max_wait_ms'], 3)
+        return stats
+
+
+class PriorityLanes:
+    """Reserved workers for crisis replies, which never queue behind chat
+
+    Only the crisis lane has a pool. Normal messages run on the request's
+    own thread and are ordered where the contention actually is, at the
+    FairScheduler's LLM slots; a FIFO pool in front of it would let one
+    heavy client fill every worker and undo the round-robin.
+    """
+
+    def __init__(self, crisis_workers: int = None):
+        self.lanes = {
+            CRISIS_LANE: Lane(CRISIS_LANE, crisis_workers or int(os.getenv('NAINA_CRISIS_WORKERS', 4))),
+        }
+
+    def submit(self, lane: str, fn, *args, **kwargs):
+        return self.lanes[lane].submit(fn, *args, **kwargs)
+
+    def run(self, lane: str, fn, *args, timeout: float, fallback, **kwargs):
+        """Run fn(outcome, *args) on the lane; returns (reply, met_deadline)
+
+        fn must settle the Outcome with its reply before any side effect and
+        stop if settle() returns False. If the deadline passes first,
+        fallback() settles it and (fallback reply, False) is returned; the
+        caller then owns recording that reply. A worker that settled just
+        before the deadline keeps its reply and finishes in the background.
+        """
+        outcome = Outcome()
+        future = self.submit(lane, fn, outcome, *args, **kwargs)
+        try:
+            return future.result(timeout=timeout), True
+        except TimeoutError:
+            future.cancel()
+            self.lanes[lane].record_timeout()
+            if outcome.settle(fallback()):
+                return outcome.value, False
+            return outcome.value, True
+
+    def snapshot(self) -> dict:
+        return {name: lane.snapshot() for name, lane in self.lanes.items()}
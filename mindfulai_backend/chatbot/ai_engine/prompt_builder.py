@@ -0,0 +1,165 @@
+# mindfulai_backend/chatbot/ai_engine/prompt_builder.py
+# Token-budget-aware prompt builder with cached, pre-tokenized persona prefixes
+# Author: VINAYAK TIWARI | ARQONX-AI TECHNOLOGY
+
+import hashlib
+import os
+from datetime import datetime
+from types import MappingProxyType
+
+from .context_compactor import ContextCompactor, estimate_tokens, DEFAULT_TOKEN_BUDGET
+
+TOKENIZER_NAME = os.getenv('NAINA_TOKENIZER', 'Qwen/Qwen2.5-3B-Instruct')
+# Earlier turns recalled by similarity to the newest message (0 turns recall off)
+RECALL_K = int(os.getenv('NAINA_RECALL_K', 3))
+RECALL_HEADER = "Things they shared earlier that may matter now:"
+
+# Persona system prompts, written once here instead of per request
+PERSONA_PROMPTS = MappingProxyType({
+    # NAINA server (data/crisis_api_server.py)
+    'naina_server': """You are NAINA, a warm and empathetic mental health AI companion. 
+
+YOUR PERSONALITY:
+- Be conversational, not clinical
+- Use active listening techniques
+- Ask follow-up questions
+- Validate emotions before suggesting solutions
+- Be present and engaged, not detached
+
+CONVERSATION RULES:
+1. ALWAYS respond conversationally first
+2. Ask about their feelings/thoughts
+3. Only suggest professional help if they're in real danger (suicidal)
+4. For sadness, stress, anxiety → listen, validate, help them process
+5. Keep responses under 100 words
+6. Use empathetic phrases: "I hear you", "That sounds tough", "Tell me more"
+
+DO NOT:
+- Jump to "talk to a friend" immediately
+- Give generic advice without understanding context
+- Be dismissive of their feelings
+- Suggest professional help unless truly critical
+
+REMEMBER: You're a supportive listener first, advisor second.""",
+    # Django chat API (chatbot/views.py)
+    'naina_django': """You are NAINA, a compassionate AI mental wellness companion created by Vinayak Tiwari from ArqonX AI Technology.
+
+Be:
+- Warm and empathetic
+- Brief (2-3 sentences max)
+- Supportive without being medical
+- Ask follow-up questions
+
+Never diagnose. Always encourage professional help for serious issues.""",
+})
+
+
+def _load_tokenizer():
+    """Local tokenizer for exact counts; never downloads at request time"""
+    try:
+        from transformers import AutoTokenizer
+        tokenizer = AutoTokenizer.from_pretrained(TOKENIZER_NAME, local_files_only=True)
+        print(f"✅ Prompt tokenizer: {TOKENIZER_NAME}")
+        return tokenizer
+    except Exception:
+        print("⚠️ Prompt tokenizer not cached locally, estimating token counts")
+        return None
+
+
+_tokenizer = _load_tokenizer()
+
+
+def count_tokens(text: str) -> int:
+    """Token count with the local tokenizer, or the regex estimate without one"""
+    if _tokenizer is not None:
+        return len(_tokenizer.encode(text or '', add_special_tokens=False))
+    return estimate_tokens(text)
+
+
+class PromptPrefix:
+    """Immutable system prefix for one persona, tokenized once at import"""
+
+    __slots__ = ('persona', 'text', 'token_ids', 'token_count', 'prefix_hash', 'message')
+
+    def __init__(self, persona: str, text: str):
+        self.persona = persona
+        self.text = text
+        self.token_ids = tuple(_tokenizer.encode(text, add_special_tokens=False)) if _tokenizer else ()
+        self.token_count = len(self.token_ids) if _tokenizer else estimate_tokens(text)
+        # Stable key for provider-side or local prefix caches
+        self.prefix_hash = hashlib.sha256(f"{persona}\0{text}".encode('utf-8')).hexdigest()[:16]
+        self.message = MappingProxyType({"role": "system", "content": text})
+
+    def __setattr__(self, name, value):
+        if hasattr(self, 'message'):
+            raise AttributeError("PromptPrefix is immutable")
+        object.__setattr__(self, name, value)
+
+
+PREFIXES = MappingProxyType({persona: PromptPrefix(persona, text) for persona, text in PERSONA_PROMPTS.items()})
+
+
+class PromptBuilder:
+    """Assemble [persona prefix, summary, recalled turns, history...] within a token budget
+
+    History is truncated by tokens rather than message count, newest first.
+    The persona prefix is always the first message and never changes, so
+    its prefix_hash identifies a reusable cache entry; the per-user summary
+    and recalled turns go in separate messages after it.
+    """
+
+    def __init__(self, token_budget: int = DEFAULT_TOKEN_BUDGET, recall_k: int = RECALL_K):
+        self.token_budget = token_budget
+        self.recall_k = recall_k
+        self.compactor = ContextCompactor(token_budget, count_tokens=count_tokens)
+
+    def recall(self, user_id, history: list, messages: list, room: int):
+        """System message with earlier turns similar to the newest one, or None; (message, tokens)"""
+        query = next((m['content'] for m in reversed(history) if m['role'] == 'user'), None)
+        if not self.recall_k or not user_id or not query or room <= 0:
+            return None, 0
+        try:
+            from mindfulai_backend.analytics.semantic_memory import semantic_memory
+            hits = semantic_memory.recall(user_id, query, self.recall_k,
+                                          exclude=[m['content'] for m in messages if m['role'] == 'user'])
+        except Exception as e:
+            print(f"⚠️ Semantic recall failed for {user_id}: {e}")
+            return None, 0
+
+        lines, used = [RECALL_HEADER], count_tokens(RECALL_HEADER) + 4
+        for hit in hits:
+            line = f"- ({datetime.fromtimestamp(hit['id']).date().isoformat()}) {hit['text']}"
+            cost = count_tokens(line)
+            if used + cost > room:
+                break
+            lines.append(line)
+            used += cost
+        if len(lines) == 1:
+            return None, 0
+        return {"role": "system", "content": '\n'.join(lines)}, used
+
+    def build(self, persona: str, history: list, user_id=None, token_budget: int = None):
+        """Return (messages, info) where info has prefix_hash and prompt_tokens"""
+        prefix = PREFIXES[persona]
+        budget = token_budget or self.token_budget
+        messages, used = self.compactor.compact_with_prefix(
+            prefix.text, prefix.token_count, history, user_id, budget
+        )
+        messages[0] = dict(prefix.message)
+
+        recalled, recall_tokens = self.recall(user_id, history, messages, budget - used)
+        if recalled:
+            # After the persona/summary system messages, before the turns
+            position = next((i for i, m in enumerate(messages) if m['role'] != 'system'), len(messages))
+            messages.insert(position, recalled)
+            used += recall_tokens
+        return messages, {
+            'persona': persona,
+            'prefix_hash': prefix.prefix_hash,
+            'prefix_tokens': prefix.token_count,
+            'prompt_tokens': used,
+            'recalled_turns': recalled['content'].count('\n') if recalled else 0,
+        }
+
+
+prompt_builder = PromptBuilder()
@@ -0,0 +1,180 @@
+# mindfulai_backend/chatbot/ai_engine/rate_limiter.py
+# Per-user / per-IP rate limiting and fair scheduling of LLM slots
+# Author: VINAYAK TIWARI | ARQONX-AI TECHNOLOGY
+
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+
+
+class MemoryBackend:
+    """Token buckets held in this process, LRU-bounded by key count"""
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, key: str, rate: float, burst: int) -> float:
+        """Take one token; returns 0 if allowed, else seconds until a token is free"""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.pop(key, None)
+            if bucket is None:
+                tokens = float(burst)
+            else:
+                tokens = min(float(burst), bucket[0] + (now - bucket[1]) * rate)
+
+            allowed = tokens >= 1.0
+            self._buckets[key] = (tokens - 1.0 if allowed else tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+
+        return 0.0 if allowed else (1.0 - tokens) / rate
+
+
+class CacheBackend:
+    """Sliding-window counters in a shared Django cache, for several workers
+
+    Same limit as the token bucket (``burst`` requests per ``burst / rate``
+    seconds), counted as the current fixed window plus the weighted
+    remainder of the previous one.
+    """
+
+    def __init__(self, cache=None, prefix: str = 'naina:rl'):
+        if cache is None:
+            from django.core.cache import cache
+        self.cache = cache
+        self.prefix = prefix
+
+    def consume(self, key: str, rate: float, burst: int) -> float:
+        window = burst / rate
+        now = time.time()
+        slot = int(now // window)
+        elapsed = (now - slot * window) / window
+
+        current_key = f"{self.prefix}:{key}:{slot}"
+        counts = self.cache.get_many([current_key, f"{self.prefix}:{key}:{slot - 1}"])
+        current = counts.get(current_key, 0)
+        previous = counts.get(f"{self.prefix}:{key}:{slot - 1}", 0)
+
+        if previous * (1.0 - elapsed) + current >= burst:
+            return max(window * (1.0 - elapsed), 1.0 / rate)
+
+        self.cache.add(current_key, 0, timeout=int(window * 2) + 1)
+        try:
+            self.cache.incr(current_key)
+        except ValueError:
+            # Expired between add() and incr()
+            self.cache.set(current_key, 1, timeout=int(window * 2) + 1)
+        return 0.0
+
+
+class RateLimiter:
+    """Token-bucket limits keyed on user id and client IP
+
+    A request must pass both buckets. The IP bucket is looser because
+    several users can share one address. Callers check crisis messages
+    before calling this and skip it for them, so those are never limited.
+    """
+
+    def __init__(self, per_minute: float = None, burst: int = None,
+                 ip_per_minute: float = None, ip_burst: int = None, backend=None):
+        self.rate = (per_minute or float(os.getenv('NAINA_RATE_PER_MIN', 20))) / 60.0
+        self.burst = burst or int(os.getenv('NAINA_RATE_BURST', 8))
+        self.ip_rate = (ip_per_minute or float(os.getenv('NAINA_IP_RATE_PER_MIN', 60))) / 60.0
+        self.ip_burst = ip_burst or int(os.getenv('NAINA_IP_RATE_BURST', 20))
+        self.backend = backend or MemoryBackend()
+        self._lock = threading.Lock()
+        self.stats = {'allowed': 0, 'limited': 0}
+
+    def check(self, user_id=None, ip=None) -> float:
+        """0 if the request may proceed, else the Retry-After in seconds"""
+        retry_after = 0.0
+        if ip:
+            retry_after = self.backend.consume(f"ip:{ip}", self.ip_rate, self.ip_burst)
+        if not retry_after and user_id:
+            retry_after = self.backend.consume(f"user:{user_id}", self.rate, self.burst)
+
+        with self._lock:
+            self.stats['limited' if retry_after else 'allowed'] += 1
+        return retry_after
+
+
+def get_rate_limiter(kind: str = None, prefix: str = 'naina:rl', **limits) -> RateLimiter:
+    """RateLimiter with the backend named by kind or NAINA_RATE_LIMIT_BACKEND ('memory' or 'cache')
+
+    Limiters that count something else need their own ``prefix`` so they
+    don't share counters in the cache backend; ``limits`` go to RateLimiter.
+    """
+    kind = (kind or os.getenv('NAINA_RATE_LIMIT_BACKEND', 'memory')).lower()
+    return RateLimiter(backend=CacheBackend(prefix=prefix) if kind == 'cache' else MemoryBackend(), **limits)
+
+
+class FairScheduler:
+    """A fixed number of LLM slots, handed out round-robin across clients
+
+    Waiters queue per client key. When a slot frees up it goes to the
+    next client in rotation rather than the oldest waiter, so a client
+    with many requests in flight gets one slot per round like everyone
+    else. priority=True (crisis tier) takes a slot at once, even over
+    the limit.
+    """
+
+    def __init__(self, slots: int = None):
+        self.slots = slots or int(os.getenv('NAINA_LLM_SLOTS', 4))
+        self._active = 0
+        self._queues = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {'granted': 0, 'queued': 0, 'timeouts': 0}
+
+    def acquire(self, key, priority: bool = False, timeout: float = None) -> bool:
+        with self._lock:
+            self.stats['granted'] += 1
+            if priority or (self._active < self.slots and not self._queues):
+                self._active += 1
+                return True
+            waiter = threading.Event()
+            self._queues.setdefault(key, deque()).append(waiter)
+            self.stats['queued'] += 1
+
+        if waiter.wait(timeout):
+            return True
+
+        with self._lock:
+            # The slot may have been handed over while the wait timed out
+            if waiter.is_set():
+                return True
+            queue = self._queues.get(key)
+            if queue is not None:
+                queue.remove(waiter)
+                if not queue:
+                    del self._queues[key]
+            self.stats['granted'] -= 1
+            self.stats['timeouts'] += 1
+            return False
+
+    def release(self):
+        with self._lock:
+            if self._active > self.slots or not self._queues:
+                self._active -= 1
+                return
+            # Hand the slot straight to the next client in rotation
+            key, queue = next(iter(self._queues.items()))
+            waiter = queue.popleft()
+            if queue:
+                self._queues.move_to_end(key)
+            else:
+                del self._queues[key]
+            waiter.set()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                'slots': self.slots,
+                'active': self._active,
+                'waiting': sum(len(q) for q in self._queues.values()),
+                'waiting_clients': len(self._queues),
+                **self.stats,
+            }
@@ -1,12 +1,18 @@
 # chatbot/views.py
 # Author: VINAYAK TIWARI | ARQONX-AI TECHNOLOGY
 
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework import status
 from django.utils import timezone
 from bytez import Bytez
+from mindfulai_backend.core.client_ip import request_ip
+from mindfulai_backend.core.jwt_auth import StatelessJWTAuthentication
+from mindfulai_backend.core.user_cache import user_cache
+from .ai_engine.context_compactor import MAX_MESSAGE_CHARS, sanitize_history
+from .ai_engine.prompt_builder import prompt_builder
+from .ai_engine.rate_limiter import FairScheduler, get_rate_limiter
 
 # Uncomment when you have models set up
 # from mindfulai_backend.analytics.models import Conversation, Message, EmotionLog, CrisisEvent
@@ -17,38 +23,39 @@ BYTEZ_API_KEY = "05bb0c56a16725d749100641b2dceaf2"
 sdk = Bytez(BYTEZ_API_KEY)
 model = sdk.model("Qwen/Qwen2.5-3B-Instruct")
 
+# Per-user/IP limits on the public chat endpoint; set NAINA_RATE_LIMIT_BACKEND=cache
+# to share them across workers through the Django cache
+rate_limiter = get_rate_limiter()
+llm_scheduler = FairScheduler()
+LLM_QUEUE_TIMEOUT = 10.0
+
 # Initialize crisis detector (when ready)
 # crisis_detector = CrisisDetector()
 
 
-def generate_ai_response(user_message, conversation_history=None):
-    """Generate AI response using Bytez Qwen SDK"""
-    
-    system_prompt = """You are NAINA, a compassionate AI mental wellness companion created by Vinayak Tiwari from ArqonX AI Technology.
-
-Be:
-- Warm and empathetic
-- Brief (2-3 sentences max)
-- Supportive without being medical
-- Ask follow-up questions
+def generate_ai_response(user_message, conversation_history=None, user_id=None, client=None):
+    """Generate AI response using Bytez Qwen SDK
 
-Never diagnose. Always encourage professional help for serious issues."""
-    
+    client is the fair-scheduling key for an LLM slot (user id or IP).
+    """
     try:
         print(f"\n🤖 Calling Bytez Qwen2.5-3B...")
         
-        # Build messages
-        messages = [{"role": "system", "content": system_prompt}]
-        
-        # Add conversation history if provided
-        if conversation_history:
-            messages.extend(conversation_history)
+        # Build messages: client history is untrusted, so sanitize and fit it to the token budget
+        history = sanitize_history(conversation_history)
+        history.append({"role": "user", "content": user_message[:MAX_MESSAGE_CHARS]})
+        # No user_id: semantic memory and the ContextMemory summary are keyed by the NAINA
+        # server's client-chosen ids, which a Django primary key could collide with
+        messages, prompt_info = prompt_builder.build('naina_django', history)
         
-        # Add current message
-        messages.append({"role": "user", "content": user_message})
-        
-        # Call Bytez model
-        result = model.run(messages)
+        # Call Bytez model once a fair-share LLM slot is free
+        if not llm_scheduler.acquire(client or user_id, timeout=LLM_QUEUE_TIMEOUT):
+            print("⏳ No LLM slot free, using fallback")
+            return "I'm here to listen. Tell me what's on your mind."
+        try:
+            result = model.run(messages)
+        finally:
+            llm_scheduler.release()
 
         if result.error:
             print(f"❌ Bytez Error: {result.error}")
@@ -118,12 +125,23 @@ def chat(request):
         # Detect crisis
         crisis_detected, crisis_level = detect_crisis(user_message)
         
-        # Generate response
+        # Generate response (crisis replies are a constant string: never rate limited, never queued)
         if crisis_detected:
             ai_response = get_crisis_response(crisis_level)
             print(f"🚨 CRISIS DETECTED: {crisis_level}")
         else:
-            ai_response = generate_ai_response(user_message, conversation_history)
+            user_id = str(request.user.id) if request.user.is_authenticated else None
+            client_ip = request_ip(request)
+            retry_after = rate_limiter.check(user_id, client_ip)
+            if retry_after:
+                print(f"⛔ RATE LIMITED: {user_id or client_ip}")
+                return Response({
+                    'error': 'Too many messages, please slow down',
+                    'retry_after': round(retry_after, 1)
+                }, status=429, headers={'Retry-After': str(max(1, round(retry_after)))})
+            # Runs on this request thread; the FairScheduler orders it at the LLM slots
+            ai_response = generate_ai_response(user_message, conversation_history, user_id,
+                                               client=user_id or client_ip)
         
         return Response({
             'response': ai_response,
@@ -161,12 +179,33 @@ def delete_conversation(request, conversation_id):
 
 
 @api_view(['GET'])
+@authentication_classes([StatelessJWTAuthentication])
 @permission_classes([AllowAny])
 def get_user_stats(request):
-    """Get user stats"""
-    # TODO: Implement when database models are ready
-    return Response({
-        'total_conversations': 0,
-        'total_messages': 0,
+    """Get user stats
+
+    Counters come from the User row, cached per user until the row is saved
+    (users/signals.py). Chat messages don't update the row, so the counts
+    only move when something saves it; writes that bypass save(), such as
+    QuerySet.update(), show up within NAINA_USER_CACHE_TTL seconds. Crisis
+    events are not recorded on this path, so that list is always empty.
+    """
+    if not request.user.is_authenticated:
+        return Response(_user_stats(None))
+    # Aggregates are cached per user and recomputed once per change, however many requests miss
+    from django.contrib.auth import get_user_model
+    try:
+        return Response(user_cache.get(request.user.pk, 'stats', lambda: _user_stats(request.user.pk)))
+    except get_user_model().DoesNotExist:
+        # The token outlived its account
+        return Response({'error': 'User not found'}, status=status.HTTP_401_UNAUTHORIZED)
+
+
+def _user_stats(user_id):
+    from django.contrib.auth import get_user_model
+    user = get_user_model().objects.get(pk=user_id) if user_id else None
+    return {
+        'total_conversations': user.total_conversations if user else 0,
+        'total_messages': user.total_messages if user else 0,
         'recent_crisis_events': []
-    })
+    }
@@ -0,0 +1,37 @@
+# mindfulai_backend/core/client_ip.py
+# Client address for per-IP limits, behind a known number of reverse proxies
+# Author: VINAYAK TIWARI | ARQONX-AI TECHNOLOGY
+#
+# Behind a proxy (Railway, nginx, a load balancer) the TCP peer is the proxy,
+# so every client shares one address. Each proxy appends the address it got
+# the request from to X-Forwarded-For; with NAINA_TRUSTED_PROXIES=N the client
+# is the N-th entry from the right. Entries further left were sent by the
+# client and are never trusted.
+#
+# With no trusted proxies configured, a request that carries X-Forwarded-For
+# came through a proxy we know nothing about: there is no client address to
+# limit on, so client_ip() returns None and callers skip their per-IP bucket
+# (per-user limits still apply).
+#
+# NAINA_TRUSTED_PROXIES  reverse proxies in front of the app (default 0)
+
+import os
+
+TRUSTED_PROXIES = int(os.getenv('NAINA_TRUSTED_PROXIES', 0))
+
+
+def client_ip(peer: str, forwarded_for: str = None, trusted_proxies: int = None):
+    """Client address from the TCP peer and X-Forwarded-For, or None when it can't be known"""
+    trusted = TRUSTED_PROXIES if trusted_proxies is None else trusted_proxies
+    hops = [hop.strip() for hop in (forwarded_for or '').split(',') if hop.strip()]
+    if not trusted:
+        return None if hops else peer
+    if not hops:
+        # Reached us directly, around the proxy
+        return peer
+    return hops[-min(trusted, len(hops))]
+
+
+def request_ip(request):
+    """client_ip() for a Django request"""
+    return client_ip(request.META.get('REMOTE_ADDR'), request.META.get('HTTP_X_FORWARDED_FOR'))
@@ -0,0 +1,214 @@
+# mindfulai_backend/core/conversation_store.py
+# The one place data/conversations/<user>.json is read and written
+# Author: VINAYAK TIWARI | ARQONX-AI TECHNOLOGY
+#
+# File schema (SCHEMA_VERSION 2):
+#   {"schema_version": 2, "user_id", "created_at", "message_fields": [...],
+#    "messages": [[row], ...],
+#    "metadata": {"total_messages", "total_crises", "emotions": {name: n},
+#                 "avg_response_time", "total_conversations", "last_day"}}
+# Metadata is maintained incrementally on every save (total_conversations is
+# the number of distinct local calendar days with messages). Files without
+# schema_version (dict messages or rows) are upgraded on first read.
+#
+# Reads go through a ReadCache (core/read_cache.py) keyed by user and
+# validated by the file's version stamp, so a write by another process
+# invalidates it; this process's own saves update it in place.
+
+import copy
+from datetime import datetime
+from pathlib import Path
+
+from mindfulai_backend.core.records import (
+    MESSAGE_FIELDS, ROW_ID, ROW_RESPONSE_TIME, MessageRecord, message_dicts, message_row
+)
+from mindfulai_backend.core.read_cache import ReadCache
+from mindfulai_backend.core.serialization import read_json, write_json
+from mindfulai_backend.core.storage import locked
+
+SCHEMA_VERSION = 2
+CONVERSATIONS_DIR = Path("data/conversations")
+
+_EMOTION = MESSAGE_FIELDS.index('emotion')
+_IS_CRISIS = MESSAGE_FIELDS.index('is_crisis')
+
+
+def _day(ts: float) -> str:
+    return datetime.fromtimestamp(ts).date().isoformat()
+
+
+def new_conversation(user_id) -> dict:
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "user_id": user_id,
+        "created_at": datetime.now().isoformat(),
+        "message_fields": list(MESSAGE_FIELDS),
+        "messages": [],
+        "metadata": {
+            "total_messages": 0,
+            "total_crises": 0,
+            "emotions": {},
+            "avg_response_time": 0,
+            "total_conversations": 0,
+            "last_day": None
+        }
+    }
+
+
+def _append(data: dict, row: list):
+    """Add one row and bring the metadata along in O(1)"""
+    meta = data['metadata']
+    data['messages'].append(row)
+    count = len(data['messages'])
+    meta['total_messages'] = count
+    meta['avg_response_time'] += (row[ROW_RESPONSE_TIME] - meta['avg_response_time']) / count
+    if row[_IS_CRISIS]:
+        meta['total_crises'] += 1
+    if row[_EMOTION]:
+        meta['emotions'][row[_EMOTION]] = meta['emotions'].get(row[_EMOTION], 0) + 1
+    day = _day(row[ROW_ID])
+    if day != meta['last_day']:
+        meta['total_conversations'] += 1
+        meta['last_day'] = day
+
+
+def upgrade(data: dict) -> dict:
+    """Any older conversation file -> SCHEMA_VERSION, recomputing metadata from the rows"""
+    if data.get('schema_version') == SCHEMA_VERSION:
+        return data
+    fresh = new_conversation(data.get('user_id'))
+    fresh['created_at'] = data.get('created_at', fresh['created_at'])
+    rows = sorted((message_row(item) for item in data.get('messages', [])), key=lambda row: row[ROW_ID])
+    for row in rows:
+        _append(fresh, row)
+    return fresh
+
+
+class ConversationStore:
+    """Conversation persistence: batched saves, cached reads, one schema"""
+
+    def __init__(self, conversations_dir=CONVERSATIONS_DIR, cache: ReadCache = None):
+        self.conversations_dir = Path(conversations_dir)
+        self.conversations_dir.mkdir(parents=True, exist_ok=True)
+        self.cache = cache or ReadCache('conversations')
+        self._listeners = []
+
+    def path(self, user_id) -> Path:
+        return self.conversations_dir / f"{user_id}.json"
+
+    def add_listener(self, callback):
+        """callback(user_id, rows, first_seq) runs after every save, outside the file lock
+
+        first_seq is the position of rows[0] in the user's (append-only)
+        message list, a stable id for each saved row.
+        """
+        self._listeners.append(callback)
+
+    # -- cache ----------------------------------------------------------------
+
+    def _load(self, user_id):
+        """Current file contents (shared, do not mutate outside the lock) or None"""
+        return self.cache.get(user_id, self.path(user_id), lambda conv_file: upgrade(read_json(conv_file)))
+
+    def invalidate(self, user_id=None):
+        """Drop one user (or everyone) from the read cache"""
+        self.cache.invalidate(user_id)
+
+    # -- writes ---------------------------------------------------------------
+
+    def save_messages(self, user_id, records) -> list:
+        """Append several MessageRecords with one read and one write; returns their rows"""
+        rows = [record.to_row() for record in records]
+        if not rows:
+            return rows
+        conv_file = self.path(user_id)
+        with locked(conv_file):
+            cached = self._load(user_id)
+            # Never mutate the cached object: if the write fails, readers keep the old one
+            data = copy.copy(cached) if cached else new_conversation(user_id)
+            data['messages'] = list(data['messages'])
+            data['metadata'] = copy.deepcopy(data['metadata'])
+            first_seq = len(data['messages'])
+            for row in rows:
+                _append(data, row)
+            write_json(conv_file, data)
+            self.cache.put(user_id, conv_file, data)
+
+        for callback in self._listeners:
+            try:
+                callback(user_id, rows, first_seq)
+            except Exception as e:
+                print(f"⚠️ Conversation listener failed for {user_id}: {e}")
+        return rows
+
+    def save_message(self, user_id, user_msg, ai_response, emotion, response_time, is_crisis=False,
+                     model=None, theme=None) -> dict:
+        """Save one turn (model: what produced the reply); returns the 9-key message dict"""
+        record = MessageRecord.create(user_msg, ai_response, emotion, response_time, is_crisis, model, theme)
+        self.save_messages(user_id, [record])
+        return record.to_dict()
+
+    # -- reads ----------------------------------------------------------------
+
+    def rows(self, user_id, limit: int = None) -> list:
+        data = self._load(user_id)
+        if not data:
+            return []
+        return data['messages'][-limit:] if limit else list(data['messages'])
+
+    def get_conversation_history(self, user_id, limit=50) -> list:
+        """Last N messages as 9-key dicts"""
+        return message_dicts(self.rows(user_id, limit))
+
+    def get_conversation_analytics(self, user_id) -> dict:
+        data = self._load(user_id)
+        if not data:
+            return {
+                "total_messages": 0,
+                "total_conversations": 0,
+                "crisis_count": 0,
+                "emotions": {},
+                "avg_response_time": 0,
+                "created_at": datetime.now().isoformat()
+            }
+        meta = data['metadata']
+        return {
+            "total_messages": meta['total_messages'],
+            "total_conversations": meta['total_conversations'],
+            "crisis_count": meta['total_crises'],
+            "emotions": dict(meta['emotions']),
+            "avg_response_time": round(meta['avg_response_time'], 2),
+            "created_at": data['created_at']
+        }
+
+    def export_conversation(self, user_id, format='json'):
+        """The whole conversation as JSON-ready dict or plain text"""
+        data = self._load(user_id)
+        if not data:
+            return None
+
+        export = {key: value for key, value in data.items() if key not in ('message_fields', 'schema_version')}
+        export['metadata'] = copy.deepcopy(data['metadata'])
+        export['messages'] = message_dicts(data['messages'])
+
+        if format == 'json':
+            return export
+
+        elif format == 'txt':
+            text = f"NAINA Conversation Export - {user_id}\n"
+            text += f"Created: {export['created_at']}\n"
+            text += "="*80 + "\n\n"
+
+            for msg in export['messages']:
+                text += f"[{msg['timestamp']}]\n"
+                text += f"You: {msg['user_message']}\n"
+                text += f"NAINA: {msg['ai_response']}\n"
+                text += f"Emotion: {msg['emotion']} | Response Time: {msg['response_time']:.2f}s\n"
+                text += "-"*80 + "\n"
+
+            return text
+
+        return None
+
+
+conversation_store = ConversationStore()
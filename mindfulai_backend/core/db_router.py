@@ -0,0 +1,42 @@
+# mindfulai_backend/core/db_router.py
+# Send analytics reads to a read replica when one is configured
+# Author: VINAYAK TIWARI | ARQONX-AI TECHNOLOGY
+#
+# Reads of the analytics app's models (profiles, conversations, messages,
+# emotion logs, crisis events) go to the 'replica' database alias; every
+# write, and every read of other apps, stays on 'default'. Without a
+# 'replica' entry in settings.DATABASES the router returns None and Django
+# falls back to 'default', so it is safe to install unconditionally.
+#
+# Replica lag means a message written a moment ago may not be in the
+# aggregates yet. Code that must read its own writes can pin the query with
+# .using('default').
+#
+# NAINA_REPLICA_APPS   comma-separated app labels read from the replica (default 'analytics')
+
+import os
+
+from django.conf import settings
+
+REPLICA = 'replica'
+REPLICA_APPS = frozenset(a.strip() for a in os.getenv('NAINA_REPLICA_APPS', 'analytics').split(',') if a.strip())
+
+
+class AnalyticsReplicaRouter:
+    """Read-only analytics queries on the replica, everything else on default"""
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label in REPLICA_APPS and REPLICA in settings.DATABASES:
+            return REPLICA
+        return None
+
+    def db_for_write(self, model, **hints):
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data, so rows may point at each other
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its schema by replication, never by migrate
+        return db != REPLICA
@@ -0,0 +1,160 @@
+# mindfulai_backend/core/json_http.py
+# HTTP/1.1 JSON request handler: keep-alive, framed bodies, cached CORS preflight, compression
+# Author: VINAYAK TIWARI | ARQONX-AI TECHNOLOGY
+
+import gzip
+import re
+from http.server import BaseHTTPRequestHandler
+
+from .client_ip import client_ip
+from .serialization import dumps
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this are sent as-is; compressing them costs more than it saves
+COMPRESS_MIN_BYTES = 1024
+PREFLIGHT_MAX_AGE = 86400
+MAX_BODY_BYTES = 1024 * 1024
+
+_DECIMAL_SIZE = re.compile(r'[0-9]+')
+_HEX_SIZE = re.compile(rb'[0-9A-Fa-f]+')
+
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'POST, GET, OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type, Authorization',
+}
+
+
+class BadBody(ValueError):
+    """Request body that can't be read safely; the connection is marked to close"""
+
+    status = 400
+
+
+class BodyTooLarge(BadBody):
+    """Request body over MAX_BODY_BYTES"""
+
+    status = 413
+
+
+def choose_encoding(accept_encoding: str):
+    """'br', 'gzip' or None from an Accept-Encoding header"""
+    offered = {}
+    for part in (accept_encoding or '').split(','):
+        name, _, params = part.strip().partition(';')
+        quality = 1.0
+        if params.strip().startswith('q='):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        offered[name.strip().lower()] = quality
+    if brotli is not None and offered.get('br', 0) > 0:
+        return 'br'
+    if offered.get('gzip', 0) > 0:
+        return 'gzip'
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6)
+
+
+class JSONRequestHandler(BaseHTTPRequestHandler):
+    """BaseHTTPRequestHandler speaking HTTP/1.1 with persistent connections
+
+    Every response carries Content-Length, so clients can reuse the
+    connection (and pipeline requests on it); request bodies may be sent
+    with Content-Length or chunked. Idle connections close after
+    ``timeout`` seconds. CORS preflights are cached by the browser for
+    PREFLIGHT_MAX_AGE, and large JSON bodies are gzip/brotli compressed
+    when the client accepts it.
+    """
+
+    protocol_version = 'HTTP/1.1'
+    timeout = 30
+    # Headers and body go out as separate writes; without TCP_NODELAY the second
+    # one waits for the client's delayed ACK on a reused connection (~40ms)
+    disable_nagle_algorithm = True
+
+    def remote_ip(self):
+        """Client address for per-IP limits, None behind an untrusted proxy (core/client_ip.py)"""
+        return client_ip(self.client_address[0], ', '.join(self.headers.get_all('X-Forwarded-For') or ()))
+
+    def read_body(self) -> bytes:
+        """Request body, Content-Length or chunked framing
+
+        Raises BodyTooLarge past MAX_BODY_BYTES and BadBody for a malformed
+        Content-Length or chunk size; answer with their ``status``. The rest
+        of the body is left unread, so the connection is closed after the
+        response rather than parsing it as the next request.
+        """
+        if 'chunked' in self.headers.get('Transfer-Encoding', '').lower():
+            chunks, total = [], 0
+            while True:
+                line = self.rfile.readline().split(b';', 1)[0].strip()
+                if not _HEX_SIZE.fullmatch(line):
+                    self.close_connection = True
+                    raise BadBody('Invalid chunk size')
+                size = int(line, 16)
+                if size == 0:
+                    # Skip trailers up to the blank line
+                    while self.rfile.readline() not in (b'\r\n', b'\n', b''):
+                        pass
+                    break
+                total += size
+                if total > MAX_BODY_BYTES:
+                    self.close_connection = True
+                    raise BodyTooLarge('Request body too large')
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+            return b''.join(chunks)
+
+        length = self.headers.get('Content-Length', '0').strip()
+        if not _DECIMAL_SIZE.fullmatch(length):
+            self.close_connection = True
+            raise BadBody('Invalid Content-Length')
+        length = int(length)
+        if length > MAX_BODY_BYTES:
+            self.close_connection = True
+            raise BodyTooLarge('Request body too large')
+        return self.rfile.read(length) if length else b''
+
+    def send_json_response(self, data, status_code, headers=None):
+        body = dumps(data)
+        encoding = None
+        if len(body) >= COMPRESS_MIN_BYTES:
+            encoding = choose_encoding(self.headers.get('Accept-Encoding', ''))
+            if encoding:
+                body = compress(body, encoding)
+
+        self.send_response(status_code)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.send_header('Vary', 'Accept-Encoding')
+        for name, value in CORS_HEADERS.items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        for name, value in CORS_HEADERS.items():
+            self.send_header(name, value)
+        self.send_header('Access-Control-Max-Age', str(PREFLIGHT_MAX_AGE))
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
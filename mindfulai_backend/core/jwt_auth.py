@@ -0,0 +1,158 @@
+# mindfulai_backend/core/jwt_auth.py
+# Stateless JWT authentication for read-mostly endpoints: no User row per request
+# Author: VINAYAK TIWARI | ARQONX-AI TECHNOLOGY
+#
+# JWTAuthentication (the global default) decodes the token and then loads the
+# User row. StatelessJWTAuthentication instead:
+#   - keeps an LRU of already-verified tokens (raw token -> validated token), so
+#     a repeat request skips the signature check and JSON decoding; only
+#     exp and revocation are checked again
+#   - returns a TokenUser built from the claims (id, username, ...) without
+#     touching the database
+#   - rejects tokens whose jti is in a bounded in-memory revocation set, synced
+#     every NAINA_REVOCATION_SYNC seconds from simplejwt's token blacklist
+#     (rest_framework_simplejwt.token_blacklist). revoke() blacklists a token
+#     and takes effect in this worker at once, in the others on their next sync.
+#     The blacklist tables come from that app's migrations, so deploys must run
+#     `python manage.py migrate`; until they exist revoke() still revokes in
+#     this worker and warns, and the sync keeps the in-memory set.
+# A deactivated user keeps a valid access token until it expires or is revoked;
+# use it only where that is acceptable.
+#
+# NAINA_JWT_CACHE_SIZE     verified tokens kept (default 4096)
+# NAINA_REVOCATION_SYNC    seconds between blacklist syncs (default 30)
+# NAINA_REVOCATION_MAX     revoked jtis kept in memory, newest first (default 100000)
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+CACHE_SIZE = int(os.getenv('NAINA_JWT_CACHE_SIZE', 4096))
+SYNC_INTERVAL = float(os.getenv('NAINA_REVOCATION_SYNC', 30))
+MAX_REVOKED = int(os.getenv('NAINA_REVOCATION_MAX', 100000))
+
+
+class RevocationSet:
+    """jti -> exp of revoked, unexpired tokens, bounded and refreshed from the blacklist"""
+
+    def __init__(self, max_size: int = MAX_REVOKED, sync_interval: float = SYNC_INTERVAL):
+        self.max_size = max_size
+        self.sync_interval = sync_interval
+        self._revoked = {}
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._synced_at = 0.0
+        self.syncs = 0
+
+    def __contains__(self, jti) -> bool:
+        self.maybe_sync()
+        return jti in self._revoked
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+    def add(self, jti, exp: float):
+        with self._lock:
+            self._revoked[jti] = exp
+            if len(self._revoked) > self.max_size:
+                # Tokens that expire first stop mattering first
+                for old in sorted(self._revoked, key=self._revoked.get)[:len(self._revoked) - self.max_size]:
+                    del self._revoked[old]
+
+    def maybe_sync(self):
+        """Reload from the blacklist when due; one thread syncs, the rest keep the current set"""
+        if time.monotonic() - self._synced_at < self.sync_interval:
+            return
+        if not self._sync_lock.acquire(blocking=False):
+            return
+        try:
+            self.sync()
+        except Exception as e:
+            print(f"⚠️ Token revocation sync failed: {e}")
+        finally:
+            self._synced_at = time.monotonic()
+            self._sync_lock.release()
+
+    def sync(self):
+        from django.apps import apps
+        if not apps.is_installed('rest_framework_simplejwt.token_blacklist'):
+            return
+        from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+        rows = (BlacklistedToken.objects
+                .filter(token__expires_at__gt=datetime.now(timezone.utc))
+                .order_by('-blacklisted_at')
+                .values_list('token__jti', 'token__expires_at')[:self.max_size])
+        revoked = {jti: expires_at.timestamp() for jti, expires_at in rows}
+        now = time.time()
+        with self._lock:
+            # Keep local revocations the blacklist doesn't have yet (e.g. a failed write)
+            for jti, exp in self._revoked.items():
+                if exp > now:
+                    revoked.setdefault(jti, exp)
+            self._revoked = revoked
+        self.syncs += 1
+
+
+revocations = RevocationSet()
+
+
+class StatelessJWTAuthentication(JWTStatelessUserAuthentication):
+    """JWT auth that verifies each distinct token once and never loads the User row"""
+
+    _verified = OrderedDict()
+    _verified_lock = threading.Lock()
+    stats = {'hits': 0, 'misses': 0, 'revoked': 0}
+
+    def get_validated_token(self, raw_token: bytes):
+        with self._verified_lock:
+            token = self._verified.get(raw_token)
+            if token is not None:
+                self._verified.move_to_end(raw_token)
+                self.stats['hits'] += 1
+
+        if token is None:
+            self.stats['misses'] += 1
+            token = super().get_validated_token(raw_token)
+            with self._verified_lock:
+                self._verified[raw_token] = token
+                while len(self._verified) > CACHE_SIZE:
+                    self._verified.popitem(last=False)
+        elif token['exp'] <= time.time():
+            with self._verified_lock:
+                self._verified.pop(raw_token, None)
+            raise InvalidToken({'detail': 'Token is expired', 'code': 'token_not_valid'})
+
+        if token.get(api_settings.JTI_CLAIM) in revocations:
+            self.stats['revoked'] += 1
+            raise InvalidToken({'detail': 'Token is blacklisted', 'code': 'token_not_valid'})
+        return token
+
+
+def revoke(token):
+    """Blacklist a validated token (access or refresh) by its jti"""
+    jti = token[api_settings.JTI_CLAIM]
+    revocations.add(jti, token['exp'])
+
+    from django.apps import apps
+    if not apps.is_installed('rest_framework_simplejwt.token_blacklist'):
+        return
+    from django.db import DatabaseError
+    from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+
+    try:
+        outstanding, _ = OutstandingToken.objects.get_or_create(jti=jti, defaults={
+            'user_id': token.get(api_settings.USER_ID_CLAIM),
+            'token': str(token),
+            'expires_at': datetime.fromtimestamp(token['exp'], timezone.utc),
+        })
+        BlacklistedToken.objects.get_or_create(token=outstanding)
+    except DatabaseError as e:
+        # Typically the token_blacklist migrations haven't been applied
+        print(f"⚠️ Token blacklist write failed, revoked in this worker only: {e}")
@@ -0,0 +1,118 @@
+# mindfulai_backend/core/read_cache.py
+# Read-through LRU cache for parsed per-user JSON files, bounded by total bytes
+# Author: VINAYAK TIWARI | ARQONX-AI TECHNOLOGY
+#
+# Each entry is tagged with the file's version stamp (inode, mtime_ns, size).
+# Every atomic write replaces the file, so the stamp changes and the next
+# get() re-parses it, also when another worker process did the write; a hit
+# costs one stat() and no read. Writers in this process call put() right after
+# their write so the next read is a hit too.
+#
+# The budget is for memory, not disk: parsed JSON (dicts, str objects, floats)
+# takes several times the bytes of its compact file, about 4x for a
+# conversation file measured with sys.getsizeof over the whole tree. Walking
+# every value to size it would cost more than parsing it, so an entry is
+# charged its file size times NAINA_READ_CACHE_EXPANSION instead.
+#
+# NAINA_READ_CACHE_MB         default budget of a cache, in estimated parsed MB (default 64)
+# NAINA_READ_CACHE_EXPANSION  in-memory bytes charged per file byte (default 4)
+
+import os
+import threading
+from collections import OrderedDict
+
+MAX_BYTES = int(float(os.getenv('NAINA_READ_CACHE_MB', 64)) * 1024 * 1024)
+EXPANSION = float(os.getenv('NAINA_READ_CACHE_EXPANSION', 4))
+
+_caches = []
+
+
+def version_stamp(path):
+    """(inode, mtime_ns, size) of path, or None when it doesn't exist"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+class ReadCache:
+    """key -> parsed file contents; callers must treat returned values as read-only"""
+
+    def __init__(self, name: str, max_bytes: int = None):
+        self.name = name
+        self.max_bytes = max_bytes if max_bytes is not None else MAX_BYTES
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        _caches.append(self)
+
+    def get(self, key, path, load):
+        """Cached value for key if path is unchanged, else load(path) and cache it; None if missing"""
+        stamp = version_stamp(path)
+        if stamp is None:
+            self.invalidate(key)
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        value = load(path)
+        self._store(key, stamp, value)
+        return value
+
+    def put(self, key, path, value):
+        """Record what this process just wrote to path"""
+        stamp = version_stamp(path)
+        if stamp is not None:
+            self._store(key, stamp, value)
+
+    def _store(self, key, stamp, value):
+        size = int(stamp[2] * EXPANSION)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[2]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (stamp, value, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, _, evicted) = self._entries.popitem(last=False)
+                self.bytes -= evicted
+                self.evictions += 1
+
+    def invalidate(self, key=None):
+        """Drop one key (or everything)"""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+                self.bytes = 0
+                return
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.bytes -= old[2]
+
+    def metrics(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+            }
+
+
+def cache_metrics() -> dict:
+    """Metrics of every ReadCache in this process, by name"""
+    return {cache.name: cache.metrics() for cache in _caches}
@@ -0,0 +1,183 @@
+# mindfulai_backend/core/records.py
+# Compact, typed records for conversation turns, with interned emotion/context codes
+# Author: VINAYAK TIWARI | ARQONX-AI TECHNOLOGY
+#
+# In memory a turn is a __slots__ dataclass holding small int codes instead of
+# repeated strings; on disk a stored message is a JSON row (a list in
+# MESSAGE_FIELDS order). Dicts are only built at API boundaries.
+
+import sys
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+
+
+class CodeTable:
+    """Append-only string <-> small int table for a closed-ish vocabulary
+
+    Codes are process-local and never written to disk; rows store the
+    names, so tables can grow without migrating files.
+    """
+
+    def __init__(self, names=()):
+        self._codes = {}
+        self._names = []
+        self._lock = threading.Lock()
+        for name in names:
+            self.code(name)
+
+    def code(self, name) -> int:
+        if name is None:
+            return -1
+        code = self._codes.get(name)
+        if code is None:
+            with self._lock:
+                code = self._codes.get(name)
+                if code is None:
+                    code = len(self._names)
+                    self._names.append(sys.intern(name))
+                    self._codes[self._names[-1]] = code
+        return code
+
+    def name(self, code: int):
+        return self._names[code] if code >= 0 else None
+
+    def __len__(self):
+        return len(self._names)
+
+
+EMOTIONS = CodeTable(('neutral', 'happy', 'sad', 'anxious', 'stressed', 'angry', 'lonely', 'crisis'))
+CONTEXTS = CodeTable(('general', 'work', 'relationship', 'family', 'health', 'school', 'sleep'))
+THEMES = CodeTable(('general', 'crisis'))
+MODELS = CodeTable()
+ROLES = ('user', 'assistant', 'system')
+
+
+@dataclass(slots=True)
+class ChatTurn:
+    """One in-memory chat message; reads like {'role', 'content'} and converts to it"""
+    role: str
+    content: str
+
+    def __getitem__(self, key):
+        return getattr(self, key)
+
+    def as_message(self) -> dict:
+        return {'role': self.role, 'content': self.content}
+
+
+def user_turn(content: str) -> ChatTurn:
+    return ChatTurn(ROLES[0], content)
+
+
+def assistant_turn(content: str) -> ChatTurn:
+    return ChatTurn(ROLES[1], content)
+
+
+@dataclass(slots=True)
+class Exchange:
+    """A user message and the reply to it, as kept in per-user session memory"""
+    user: str
+    assistant: str
+    emotion_code: int = -1
+    context_code: int = -1
+
+    @classmethod
+    def create(cls, user: str, assistant: str, emotion: str = None, context: str = None):
+        return cls(user, assistant, EMOTIONS.code(emotion), CONTEXTS.code(context))
+
+    def to_dict(self) -> dict:
+        data = {'user': self.user, 'assistant': self.assistant, 'emotion': EMOTIONS.name(self.emotion_code)}
+        if self.context_code >= 0:
+            data['context'] = CONTEXTS.name(self.context_code)
+        return data
+
+
+# Row layout of a stored message; the 9-key API dict adds timestamp and lengths.
+# model and theme were added later: older rows stop after is_crisis.
+MESSAGE_FIELDS = ('id', 'user_message', 'ai_response', 'emotion', 'response_time', 'is_crisis', 'model', 'theme')
+
+
+@dataclass(slots=True)
+class MessageRecord:
+    """One persisted turn; `id` is its creation time as a POSIX timestamp"""
+    id: float
+    user_message: str
+    ai_response: str
+    emotion_code: int
+    response_time: float
+    is_crisis: bool
+    model_code: int = -1
+    theme_code: int = -1
+
+    @classmethod
+    def create(cls, user_message, ai_response, emotion, response_time, is_crisis=False, model=None, theme=None):
+        return cls(datetime.now().timestamp(), user_message, ai_response, EMOTIONS.code(emotion),
+                   float(response_time), bool(is_crisis), MODELS.code(model), THEMES.code(theme))
+
+    @property
+    def emotion(self):
+        return EMOTIONS.name(self.emotion_code)
+
+    @property
+    def model(self):
+        """What produced the reply, e.g. the LLM or the fallback templates"""
+        return MODELS.name(self.model_code)
+
+    @property
+    def theme(self):
+        return THEMES.name(self.theme_code)
+
+    @property
+    def timestamp(self) -> str:
+        return datetime.fromtimestamp(self.id).isoformat()
+
+    def to_row(self) -> list:
+        return [self.id, self.user_message, self.ai_response, self.emotion, self.response_time, self.is_crisis,
+                self.model, self.theme]
+
+    @classmethod
+    def from_row(cls, row):
+        extra = len(row) > 6
+        return cls(row[0], row[1], row[2], EMOTIONS.code(row[3]), row[4], row[5],
+                   MODELS.code(row[6] if extra else None), THEMES.code(row[7] if extra else None))
+
+    def to_dict(self) -> dict:
+        """The 9-key message dict the API has always returned"""
+        return {
+            'id': self.id,
+            'timestamp': self.timestamp,
+            'user_message': self.user_message,
+            'ai_response': self.ai_response,
+            'emotion': self.emotion,
+            'response_time': self.response_time,
+            'is_crisis': self.is_crisis,
+            'message_length': len(self.user_message),
+            'response_length': len(self.ai_response),
+        }
+
+
+def message_row(item) -> list:
+    """Full-width stored row from a row (older ones are padded) or a legacy 9-key message dict"""
+    if isinstance(item, list):
+        missing = len(MESSAGE_FIELDS) - len(item)
+        return item + [None] * missing if missing > 0 else item
+    return [item.get('id') or datetime.fromisoformat(item['timestamp']).timestamp(),
+            item['user_message'], item['ai_response'], item.get('emotion'),
+            item.get('response_time', 0.0), item.get('is_crisis', False), item.get('model'), item.get('theme')]
+
+
+def normalize_messages(data: dict) -> dict:
+    """Convert a loaded conversation file's messages to rows in place"""
+    data['messages'] = [message_row(item) for item in data.get('messages', [])]
+    data['message_fields'] = list(MESSAGE_FIELDS)
+    return data
+
+
+def message_dicts(rows) -> list:
+    """API boundary: stored rows -> 9-key message dicts"""
+    return [MessageRecord.from_row(row).to_dict() for row in rows]
+
+
+ROW_ID = MESSAGE_FIELDS.index('id')
+ROW_RESPONSE_TIME = MESSAGE_FIELDS.index('response_time')
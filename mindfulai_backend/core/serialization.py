@@ -0,0 +1,127 @@
+# mindfulai_backend/core/serialization.py
+# JSON encoding/decoding for API bodies and file stores, with an optional fast backend
+# Author: VINAYAK TIWARI | ARQONX-AI TECHNOLOGY
+#
+# orjson is used when installed (pip install orjson), stdlib json otherwise.
+# Output is compact on every hot path; pretty=True is for files people read.
+# File writes are atomic (temp file + fsync + rename, see core/storage.py).
+
+import dataclasses
+import functools
+import json
+import mmap
+import typing
+from datetime import date, datetime
+from mindfulai_backend.core.storage import atomic_write_bytes
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+BACKEND = 'orjson' if orjson is not None else 'json'
+
+# Files at least this big are parsed straight from a memory map instead of a read() copy
+MMAP_MIN_BYTES = 64 * 1024
+
+
+def _default(obj):
+    """Types stdlib json can't encode but orjson can"""
+    if dataclasses.is_dataclass(obj):
+        return dataclasses.asdict(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj, pretty: bool = False) -> bytes:
+    """Encode to UTF-8 JSON bytes, compact unless pretty"""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_default, option=option)
+    if pretty:
+        return json.dumps(obj, indent=2, default=_default, ensure_ascii=False).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':'), default=_default, ensure_ascii=False).encode('utf-8')
+
+
+def loads(data):
+    """Decode JSON from str, bytes, bytearray or memoryview
+
+    orjson parses bytes-like input in place; stdlib json needs a bytes copy.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, (memoryview, mmap.mmap)):
+        data = bytes(data)
+    return json.loads(data)
+
+
+def read_json(path):
+    """Load a JSON file; large files are parsed from a read-only memory map"""
+    with open(path, 'rb') as f:
+        size = f.seek(0, 2)
+        f.seek(0)
+        if orjson is None or size < MMAP_MIN_BYTES:
+            return loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                return orjson.loads(view)
+            finally:
+                view.release()
+
+
+def write_json(path, obj, pretty: bool = False):
+    """Atomically replace a JSON file (compact unless pretty)"""
+    atomic_write_bytes(path, dumps(obj, pretty=pretty))
+
+
+# ---------------------------------------------------------------------------
+# Typed message schemas
+# ---------------------------------------------------------------------------
+
+class SchemaError(ValueError):
+    """A payload did not match its schema"""
+
+
+@functools.lru_cache(maxsize=None)
+def _schema_fields(schema):
+    hints = typing.get_type_hints(schema)
+    return tuple((field.name, hints[field.name]) for field in dataclasses.fields(schema))
+
+
+def decode(data, schema):
+    """Decode JSON into a schema dataclass, checking field types
+
+    Unknown keys are ignored and missing keys take the field default, so
+    old clients keep working; a field with the wrong type raises SchemaError.
+    """
+    payload = loads(data) if isinstance(data, (str, bytes, bytearray, memoryview)) else data
+    if not isinstance(payload, dict):
+        raise SchemaError(f"{schema.__name__} must be a JSON object")
+
+    values = {}
+    for name, expected in _schema_fields(schema):
+        if name not in payload:
+            continue
+        value = payload[name]
+        if expected is float and isinstance(value, int) and not isinstance(value, bool):
+            value = float(value)
+        if not isinstance(value, expected):
+            raise SchemaError(f"{schema.__name__}.{name} must be {expected.__name__}")
+        values[name] = value
+    try:
+        return schema(**values)
+    except TypeError as e:
+        raise SchemaError(str(e)) from None
+
+
+@dataclasses.dataclass(frozen=True)
+class ChatRequest:
+    """POST /api/chat/chat/ body"""
+    message: str = ''
+    user_id: str = 'default'
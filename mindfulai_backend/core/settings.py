@@ -30,6 +30,7 @@ INSTALLED_APPS = [
     # Third-party apps
     'rest_framework',
     'rest_framework_simplejwt',
+    'rest_framework_simplejwt.token_blacklist',
     'corsheaders',
     
     # Your apps
@@ -77,21 +78,71 @@ TEMPLATES = [
 WSGI_APPLICATION = 'mindfulai_backend.core.wsgi.application'
 
 # Database Configuration
+# Connections persist across requests (DB_CONN_MAX_AGE seconds, None = forever)
+# and are health-checked before reuse, so a request no longer pays for a new
+# TCP + auth handshake. DB_POOL=True swaps that for an in-process psycopg pool
+# (needs psycopg 3 with psycopg_pool; Django requires CONN_MAX_AGE 0 with it).
+# DB_REPLICA_HOST adds a 'replica' alias that analytics reads are routed to
+# (core/db_router.py).
+DB_CONN_MAX_AGE = os.environ.get('DB_CONN_MAX_AGE', '600')
+DB_POOL = os.environ.get('DB_POOL', 'False') == 'True'
+DB_POOL_MIN = int(os.environ.get('DB_POOL_MIN', 2))
+DB_POOL_MAX = int(os.environ.get('DB_POOL_MAX', 10))
+DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 10))
+DB_REPLICA_HOST = os.environ.get('DB_REPLICA_HOST')
+DB_REPLICA_PORT = os.environ.get('DB_REPLICA_PORT', DB_PORT)
+
+if DB_POOL:
+    try:
+        import psycopg  # noqa: F401
+        import psycopg_pool  # noqa: F401
+    except ImportError:
+        print("⚠️ DB_POOL=True but psycopg 3 / psycopg_pool is not installed; using persistent connections")
+        DB_POOL = False
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
         'NAME': DB_NAME,
         'USER': DB_USER,
         'PASSWORD': DB_PASSWORD,
-        'HOST': '127.0.0.1',
-        'PORT': '2609',  # ✅ CHANGED
-        'CONN_MAX_AGE': 600,
+        'HOST': DB_HOST,
+        'PORT': DB_PORT,
+        'CONN_MAX_AGE': 0 if DB_POOL else (None if DB_CONN_MAX_AGE == 'None' else int(DB_CONN_MAX_AGE)),
+        'CONN_HEALTH_CHECKS': True,
         'OPTIONS': {
             'connect_timeout': 10,
+            **({'pool': {'min_size': DB_POOL_MIN, 'max_size': DB_POOL_MAX, 'timeout': DB_POOL_TIMEOUT}}
+               if DB_POOL else {}),
         },
     }
 }
 
+if DB_REPLICA_HOST:
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': DB_REPLICA_HOST,
+        'PORT': DB_REPLICA_PORT,
+        'OPTIONS': dict(DATABASES['default']['OPTIONS']),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['mindfulai_backend.core.db_router.AnalyticsReplicaRouter']
+
+# Cache: per-process local memory unless CACHE_URL points at a shared Redis
+# (e.g. redis://127.0.0.1:6379/1), which every worker then sees
+CACHE_URL = os.environ.get('CACHE_URL')
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': CACHE_URL,
+    } if CACHE_URL else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'naina-default',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    }
+}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -0,0 +1,98 @@
+# mindfulai_backend/core/storage.py
+# Crash-safe, concurrency-safe file store primitives: striped locks + atomic writes
+# Author: VINAYAK TIWARI | ARQONX-AI TECHNOLOGY
+#
+# locked(path) serializes read-modify-write cycles on one file:
+#   - within a process, a threading.Lock picked by hashing the path (lock striping)
+#   - across processes, fcntl.flock on <dir>/.locks/<stripe>.lock (POSIX only;
+#     on Windows only the in-process lock applies)
+# atomic_write_bytes(path, data) writes a temp file in the same directory,
+# fsyncs it and renames it over the target, so readers and crashes only
+# ever see the old or the new file, never a truncated one.
+#
+# NAINA_LOCK_STRIPES  number of stripes (default 64)
+# NAINA_FSYNC=0       skip fsync: still atomic on a process crash, not on power loss
+
+import os
+import threading
+import zlib
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+LOCK_STRIPES = int(os.getenv('NAINA_LOCK_STRIPES', 64))
+FSYNC = os.getenv('NAINA_FSYNC', '1') != '0'
+LOCK_DIR = '.locks'
+
+_stripes = [threading.Lock() for _ in range(LOCK_STRIPES)]
+_lock_files = {}
+_lock_files_lock = threading.Lock()
+
+
+def stripe_for(path) -> int:
+    """Stable stripe number for a path (the same in every process)"""
+    return zlib.crc32(os.path.abspath(path).encode('utf-8')) % LOCK_STRIPES
+
+
+def _lock_file(directory: Path, stripe: int) -> int:
+    """Open (once per process) the fd used for cross-process locking of one stripe"""
+    key = (str(directory), stripe)
+    with _lock_files_lock:
+        fd = _lock_files.get(key)
+        if fd is None:
+            lock_dir = directory / LOCK_DIR
+            lock_dir.mkdir(parents=True, exist_ok=True)
+            fd = os.open(lock_dir / f'{stripe}.lock', os.O_RDWR | os.O_CREAT, 0o644)
+            _lock_files[key] = fd
+        return fd
+
+
+@contextmanager
+def locked(path):
+    """Hold the stripe lock for path for a read-modify-write; not reentrant"""
+    path = Path(path)
+    stripe = stripe_for(path)
+    with _stripes[stripe]:
+        if fcntl is None:
+            yield
+            return
+        # flock is per open file description, so the thread lock above must come first
+        fd = _lock_file(path.parent, stripe)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+def _fsync_dir(directory: Path):
+    if os.name != 'posix':
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write_bytes(path, data: bytes):
+    """Replace path with data in one step: temp file, fsync, rename"""
+    path = Path(path)
+    tmp = path.with_name(f'.{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(data)
+            if FSYNC:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    if FSYNC:
+        # Make the rename itself durable
+        _fsync_dir(path.parent)
@@ -13,6 +13,7 @@ def api_root(request):
             'chat': '/api/chat/',
             'history': '/api/chat/history/',
             'stats': '/api/chat/stats/',
+            'analytics': '/api/analytics/query/',
             'admin': '/admin/'
         },
         'status': 'operational'
@@ -23,6 +24,7 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/auth/', include('mindfulai_backend.users.urls')),  # ✅ FIXED: Changed to 'users'
     path('api/chat/', include('mindfulai_backend.chatbot.urls')),
+    path('api/analytics/', include('mindfulai_backend.analytics.urls')),
     path('api/', api_root),  # API root
     path('', api_root),  # Root endpoint
 ]
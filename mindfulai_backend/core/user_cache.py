@@ -0,0 +1,123 @@
+# mindfulai_backend/core/user_cache.py
+# Per-user cached API payloads on Django's cache framework
+# Author: VINAYAK TIWARI | ARQONX-AI TECHNOLOGY
+#
+# Keys are versioned per user:
+#   naina:user:<id>:v              current version (an integer)
+#   naina:user:<id>:<name>:<ver>   cached payload for that version
+# bump(user_id) increments the version when the user's data changes (the User
+# row is saved, see users/signals.py), so every payload cached under the old
+# version stops being read and simply expires. That works the same on locmem
+# and on a shared backend (Redis/Memcached), where a bump in one worker is
+# seen by all.
+#
+# Stampede protection: on a miss only one caller recomputes a key. Within a
+# process the others wait on a per-key lock; across processes the recompute
+# is claimed with cache.add() on a short-lived lock key and the losers poll
+# for the result (and compute it themselves if it doesn't show up in time).
+#
+# NAINA_USER_CACHE_TTL   seconds a payload lives (default 300)
+# NAINA_CACHE_ALIAS      which entry of settings.CACHES to use (default 'default')
+
+import os
+import threading
+import time
+
+TTL = int(os.getenv('NAINA_USER_CACHE_TTL', 300))
+CACHE_ALIAS = os.getenv('NAINA_CACHE_ALIAS', 'default')
+PREFIX = 'naina:user'
+RECOMPUTE_LOCK_TTL = 10
+RECOMPUTE_WAIT = 2.0
+POLL_INTERVAL = 0.01
+
+
+class UserCache:
+    """Read-through, versioned, single-flight cache of per-user payloads"""
+
+    def __init__(self, cache=None, ttl: int = TTL, prefix: str = PREFIX):
+        self._cache = cache
+        self.ttl = ttl
+        self.prefix = prefix
+        self._flights = {}
+        self._flights_lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'recomputes': 0, 'waited': 0, 'bumps': 0}
+
+    @property
+    def cache(self):
+        if self._cache is None:
+            from django.core.cache import caches
+            self._cache = caches[CACHE_ALIAS]
+        return self._cache
+
+    def _version_key(self, user_id) -> str:
+        return f"{self.prefix}:{user_id}:v"
+
+    def version(self, user_id) -> int:
+        key = self._version_key(user_id)
+        version = self.cache.get(key)
+        if version is None:
+            # Versions never expire; add() keeps a concurrent first bump intact
+            self.cache.add(key, 1, timeout=None)
+            version = self.cache.get(key, 1)
+        return version
+
+    def bump(self, user_id):
+        """Invalidate everything cached for user_id"""
+        key = self._version_key(user_id)
+        self.stats['bumps'] += 1
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            # No version yet: anything cached so far was under 1
+            if not self.cache.add(key, 2, timeout=None):
+                self.cache.incr(key)
+
+    def get(self, user_id, name: str, compute, ttl: int = None):
+        """Cached compute() for (user_id, name) at the user's current version"""
+        key = f"{self.prefix}:{user_id}:{name}:{self.version(user_id)}"
+        value = self.cache.get(key)
+        if value is not None:
+            self.stats['hits'] += 1
+            return value
+        self.stats['misses'] += 1
+
+        with self._flights_lock:
+            flight = self._flights.setdefault(key, [threading.Lock(), 0])
+            flight[1] += 1
+        try:
+            with flight[0]:
+                # Whoever held the lock before us may have filled it
+                value = self.cache.get(key)
+                if value is not None:
+                    self.stats['waited'] += 1
+                    return value
+                return self._recompute(key, compute, ttl)
+        finally:
+            with self._flights_lock:
+                flight[1] -= 1
+                if not flight[1]:
+                    del self._flights[key]
+
+    def _recompute(self, key, compute, ttl):
+        lock_key = f"{key}:lock"
+        owner = self.cache.add(lock_key, 1, timeout=RECOMPUTE_LOCK_TTL)
+        if not owner:
+            # Another process is computing it; wait briefly for its result
+            deadline = time.monotonic() + RECOMPUTE_WAIT
+            while time.monotonic() < deadline:
+                time.sleep(POLL_INTERVAL)
+                value = self.cache.get(key)
+                if value is not None:
+                    self.stats['waited'] += 1
+                    return value
+        try:
+            self.stats['recomputes'] += 1
+            value = compute()
+            self.cache.set(key, value, timeout=ttl or self.ttl)
+            return value
+        finally:
+            if owner:
+                self.cache.delete(lock_key)
+
+
+user_cache = UserCache()
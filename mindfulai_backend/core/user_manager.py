@@ -1,8 +1,10 @@
-import json
 import hashlib
 from datetime import datetime
 from pathlib import Path
 
+from mindfulai_backend.core.serialization import read_json, write_json
+from mindfulai_backend.core.storage import locked
+
 # Use existing data directory
 USERS_DIR = Path("data/users")
 USERS_DIR.mkdir(exist_ok=True)
@@ -13,30 +15,30 @@ class UserManager:
         """Create new user profile"""
         user_file = USERS_DIR / f"{user_id}.json"
         
-        if user_file.exists():
-            return json.load(open(user_file))
-        
-        user_data = {
-            "user_id": user_id,
-            "username": username,
-            "email": email,
-            "created_at": datetime.now().isoformat(),
-            "last_login": datetime.now().isoformat(),
-            "preferences": {
-                "theme": "dark",
-                "notifications": True,
-                "language": "en"
-            },
-            "stats": {
-                "total_messages": 0,
-                "total_conversations": 0,
-                "crisis_detections": 0,
-                "average_response_time": 0
+        with locked(user_file):
+            if user_file.exists():
+                return read_json(user_file)
+            
+            user_data = {
+                "user_id": user_id,
+                "username": username,
+                "email": email,
+                "created_at": datetime.now().isoformat(),
+                "last_login": datetime.now().isoformat(),
+                "preferences": {
+                    "theme": "dark",
+                    "notifications": True,
+                    "language": "en"
+                },
+                "stats": {
+                    "total_messages": 0,
+                    "total_conversations": 0,
+                    "crisis_detections": 0,
+                    "average_response_time": 0
+                }
             }
-        }
-        
-        with open(user_file, 'w') as f:
-            json.dump(user_data, f, indent=2)
+            
+            write_json(user_file, user_data)
         
         return user_data
     
@@ -46,33 +48,32 @@ class UserManager:
         user_file = USERS_DIR / f"{user_id}.json"
         
         if user_file.exists():
-            with open(user_file, 'r') as f:
-                return json.load(f)
+            return read_json(user_file)
         return None
     
     @staticmethod
-    def update_user(user_id, updates):
-        """Update user profile"""
+    def _modify(user_id, change):
+        """Apply change(user_data) to a stored profile under its lock"""
         user_file = USERS_DIR / f"{user_id}.json"
         
-        if user_file.exists():
-            with open(user_file, 'r') as f:
-                user_data = json.load(f)
-            user_data.update(updates)
+        with locked(user_file):
+            if not user_file.exists():
+                return None
+            user_data = read_json(user_file)
+            change(user_data)
             user_data['last_login'] = datetime.now().isoformat()
             
-            with open(user_file, 'w') as f:
-                json.dump(user_data, f, indent=2)
-            
-            return user_data
-        return None
+            write_json(user_file, user_data)
+        
+        return user_data
+    
+    @staticmethod
+    def update_user(user_id, updates):
+        """Update user profile"""
+        return UserManager._modify(user_id, lambda user_data: user_data.update(updates))
     
     @staticmethod
     def update_stats(user_id, stats_dict):
         """Update user statistics"""
-        user_data = UserManager.get_user(user_id)
-        if user_data:
-            user_data['stats'].update(stats_dict)
-            UserManager.update_user(user_id, user_data)
-            return user_data
-        return None
+        # Merged inside the lock, so concurrent stat updates don't overwrite each other
+        return UserManager._modify(user_id, lambda user_data: user_data['stats'].update(stats_dict))
@@ -3,3 +3,6 @@
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'mindfulai_backend.users'
+    
+    def ready(self):
+        from . import signals  # noqa: F401
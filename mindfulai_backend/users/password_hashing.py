@@ -0,0 +1,68 @@
+# users/password_hashing.py
+# Bounded concurrency for signup password hashing
+# Author: VINAYAK TIWARI | ARQONX-AI TECHNOLOGY
+#
+# make_password() with Django's default PBKDF2 is deliberately slow (hundreds
+# of ms of CPU). Unbounded, a burst of signups takes every request worker and
+# the chat endpoints queue behind it. A semaphore lets at most
+# NAINA_HASH_WORKERS hashes burn CPU at once; each runs on its own request
+# thread (hashlib releases the GIL while it works). A signup that can't get a
+# slot within NAINA_HASH_WAIT seconds is turned away with Retry-After instead
+# of piling up.
+#
+# The password is hashed before the INSERT that decides whether the username
+# or email is taken, so a duplicate signup costs a full hash before it is
+# rejected; checking first would cost a query on every signup and still race.
+# signup_limiter keeps one address from spending the slots that way: it allows
+# NAINA_SIGNUP_PER_MIN signups per client IP (bursts of NAINA_SIGNUP_BURST).
+# The address is resolved like the chat limiter's (core/client_ip.py): behind
+# a proxy it needs NAINA_TRUSTED_PROXIES, and without it the limit is skipped
+# rather than shared by every client.
+#
+# The cost itself is tuned the Django way, through PASSWORD_HASHERS in settings.
+#
+# NAINA_HASH_WORKERS     concurrent hashes (default 2)
+# NAINA_HASH_WAIT        seconds a signup may wait for a slot (default 5)
+# NAINA_SIGNUP_PER_MIN   signups per client IP per minute (default 5)
+# NAINA_SIGNUP_BURST     signups per client IP allowed back to back (default 5)
+
+import os
+import threading
+
+from django.contrib.auth.hashers import make_password
+
+from mindfulai_backend.chatbot.ai_engine.rate_limiter import get_rate_limiter
+
+HASH_WORKERS = int(os.getenv('NAINA_HASH_WORKERS', 2))
+HASH_WAIT = float(os.getenv('NAINA_HASH_WAIT', 5))
+
+
+class HashingBusy(Exception):
+    """Every hashing slot stayed taken for longer than the caller may wait"""
+
+
+class PasswordHasherPool:
+    """make_password() on the caller's thread, at most `workers` at a time, with a bounded wait for a slot"""
+
+    def __init__(self, workers: int = HASH_WORKERS, wait: float = HASH_WAIT):
+        self.workers = workers
+        self.wait = wait
+        self._slots = threading.BoundedSemaphore(workers)
+        self.stats = {'hashed': 0, 'rejected': 0}
+
+    def hash(self, raw_password: str) -> str:
+        if not self._slots.acquire(timeout=self.wait):
+            self.stats['rejected'] += 1
+            raise HashingBusy()
+        try:
+            encoded = make_password(raw_password)
+        finally:
+            self._slots.release()
+        self.stats['hashed'] += 1
+        return encoded
+
+
+password_hasher = PasswordHasherPool()
+signup_limiter = get_rate_limiter(prefix='naina:rl:signup',
+                                  ip_per_minute=float(os.getenv('NAINA_SIGNUP_PER_MIN', 5)),
+                                  ip_burst=int(os.getenv('NAINA_SIGNUP_BURST', 5)))
@@ -0,0 +1,21 @@
+# users/signals.py
+# Drop a user's cached payloads whenever their data changes
+# Author: VINAYAK TIWARI | ARQONX-AI TECHNOLOGY
+#
+# /me/ and /stats/ are built from the User row alone (the message counters
+# live on it), so saving that row is the one change that has to invalidate.
+# Chat messages ingested by the NAINA server don't touch the row or go
+# through Django; until whatever counts them saves the User, the cached
+# counters are as current as the row itself.
+
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from mindfulai_backend.core.user_cache import user_cache
+from .models import User
+
+
+@receiver(post_save, sender=User)
+def invalidate_user_cache(sender, instance, **kwargs):
+    """Profile or counters saved: /me/ and /stats/ recompute on next read"""
+    user_cache.bump(instance.pk)
@@ -20,4 +20,5 @@ urlpatterns = [
     path('login/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
     path('me/', views.get_current_user, name='current_user'),
+    path('logout/', views.logout_user, name='logout'),
 ]
@@ -207,13 +207,21 @@
         
 #         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from django.contrib.auth import get_user_model
+from django.contrib.auth.base_user import AbstractBaseUser
+from django.db import IntegrityError
+from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework_simplejwt.tokens import RefreshToken
 
+from mindfulai_backend.core.client_ip import request_ip
+from mindfulai_backend.core.jwt_auth import StatelessJWTAuthentication, revoke
+from mindfulai_backend.core.user_cache import user_cache
+from .password_hashing import HashingBusy, password_hasher, signup_limiter
+
 User = get_user_model()
 
 
@@ -232,24 +240,41 @@ def register_user(request):
             status=status.HTTP_400_BAD_REQUEST
         )
     
-    if User.objects.filter(username=username).exists():
+    # Before hashing: a duplicate or scripted signup would otherwise still cost a hash
+    retry_after = signup_limiter.check(ip=request_ip(request))
+    if retry_after:
         return Response(
-            {'error': 'Username already exists'},
-            status=status.HTTP_400_BAD_REQUEST
+            {'error': 'Too many signups from this address, please retry later',
+             'retry_after': round(retry_after, 1)},
+            status=status.HTTP_429_TOO_MANY_REQUESTS,
+            headers={'Retry-After': str(max(1, round(retry_after)))}
         )
     
-    if User.objects.filter(email=email).exists():
+    try:
+        encoded_password = password_hasher.hash(password)
+    except HashingBusy:
         return Response(
-            {'error': 'Email already exists'},
-            status=status.HTTP_400_BAD_REQUEST
+            {'error': 'Too many signups right now, please retry shortly'},
+            status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            headers={'Retry-After': '1'}
         )
     
-    user = User.objects.create_user(
-        username=username,
-        email=email,
-        password=password,
+    # One INSERT; the unique constraints on username and email decide duplicates,
+    # so two concurrent signups can't both pass a check and then both insert.
+    # Views run in autocommit, so a rejected INSERT leaves nothing to roll back.
+    user = User(
+        username=AbstractBaseUser.normalize_username(username),
+        email=User.objects.normalize_email(email),
+        password=encoded_password,
         full_name=full_name
     )
+    try:
+        user.save(force_insert=True)
+    except IntegrityError as e:
+        error = _duplicate_error(e)
+        if error is None:
+            raise
+        return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
     
     refresh = RefreshToken.for_user(user)
     
@@ -268,16 +293,56 @@ def register_user(request):
     }, status=status.HTTP_201_CREATED)
 
 
+def _duplicate_error(error):
+    """The existing message for whichever unique field an IntegrityError hit, if any"""
+    # First line only, which names the constraint (PostgreSQL: users_username_key)
+    # or the column (SQLite: users.username) but not the duplicate value
+    detail = str(error).split('\n', 1)[0].lower()
+    if 'username' in detail:
+        return 'Username already exists'
+    if 'email' in detail:
+        return 'Email already exists'
+    return None
+
+
 @api_view(['GET'])
+@authentication_classes([StatelessJWTAuthentication])
 @permission_classes([IsAuthenticated])
 def get_current_user(request):
     """Get current authenticated user"""
-    user = request.user
-    return Response({
+    # request.user is a TokenUser built from the JWT claims; the row is only
+    # loaded when the cached payload is missing or stale (users/signals.py)
+    try:
+        return Response(user_cache.get(request.user.pk, 'me', lambda: _current_user(request.user.pk)))
+    except User.DoesNotExist:
+        # The token outlived its account
+        return Response({'error': 'User not found'}, status=status.HTTP_401_UNAUTHORIZED)
+
+
+def _current_user(user_id):
+    user = User.objects.get(pk=user_id)
+    return {
         'id': str(user.id),
         'username': user.username,
         'email': user.email,
         'full_name': user.full_name,
         'total_conversations': user.total_conversations,
         'total_messages': user.total_messages,
-    })
+    }
+
+
+@api_view(['POST'])
+@authentication_classes([StatelessJWTAuthentication])
+@permission_classes([IsAuthenticated])
+def logout_user(request):
+    """Revoke the access token used for this request and, if given, the refresh token"""
+    revoke(request.auth)
+    
+    if request.data.get('refresh'):
+        try:
+            refresh = RefreshToken(request.data['refresh'])
+        except TokenError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        revoke(refresh)
+    
+    return Response({'message': 'Logout successful'})
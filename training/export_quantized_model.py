@@ -0,0 +1,60 @@
+# training/export_quantized_model.py - Export serving artifacts for NAINA
+import sys
+import argparse
+from pathlib import Path
+
+import torch
+from transformers import AutoTokenizer, AutoModelForCausalLM
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from mindfulai_backend.chatbot.ai_engine.model_loader import (
+    SAFETENSORS_FILE, INT8_FILE, save_int8_artifact, load_model
+)
+
+parser = argparse.ArgumentParser(description="Export safetensors (mmap) and int8 artifacts")
+parser.add_argument('--model-dir', default='training/naina_final_model')
+parser.add_argument('--output-dir', default='training/naina_serving_model')
+args = parser.parse_args()
+
+model_dir = Path(args.model_dir)
+output_dir = Path(args.output_dir)
+
+print("="*80)
+print("📦 NAINA MODEL EXPORT")
+print("="*80)
+
+if not model_dir.exists():
+    print(f"❌ Model not found: {model_dir}")
+    print("Run: python training/train_overnight.py first")
+    sys.exit(1)
+
+output_dir.mkdir(parents=True, exist_ok=True)
+
+tokenizer = AutoTokenizer.from_pretrained(model_dir)
+model = AutoModelForCausalLM.from_pretrained(model_dir).eval()
+
+# 1. fp32 safetensors - memory-mapped read-only by every worker
+model.save_pretrained(output_dir, safe_serialization=True, max_shard_size="100GB")
+tokenizer.save_pretrained(output_dir)
+print(f"✅ Memory-mappable weights: {output_dir / SAFETENSORS_FILE}")
+
+# 2. int8 dynamic-quantized weights - smallest private copy per worker
+int8_path = save_int8_artifact(model, output_dir)
+print(f"✅ int8 weights: {int8_path}")
+
+# Sanity check: both artifacts load and agree with the original model
+sample = tokenizer("I feel anxious about tomorrow", return_tensors='pt')
+with torch.inference_mode():
+    reference = AutoModelForCausalLM.from_pretrained(model_dir).eval()(**sample).logits
+    for mode in ('mmap', 'int8'):
+        loaded, seconds = load_model(output_dir, mode)
+        drift = (loaded(**sample).logits - reference).abs().max().item()
+        print(f"   {mode:>5}: loaded in {seconds:.2f}s, max logit drift {drift:.4f}")
+
+for name in (SAFETENSORS_FILE, INT8_FILE):
+    size_mb = (output_dir / name).stat().st_size / 1024 / 1024
+    print(f"   {name}: {size_mb:.1f} MB")
+
+print("="*80)
+print(f"🚀 Serve with: NAINA_LOCAL_MODEL={output_dir} NAINA_MODEL_MODE=mmap|int8")
+print("="*80)
@@ -133,6 +133,7 @@ try:
     
     print(f"💾 Model saved: {final_model_dir}")
     print(f"⏰ End: {datetime.datetime.now().strftime('%I:%M %p')}")
+    print("📦 Export serving artifacts: python training/export_quantized_model.py")
     print("\n🎉 NAINA ready for deployment!")
     
 except Exception as e: